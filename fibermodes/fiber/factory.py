@@ -19,12 +19,12 @@
 
 """
 
+import copy
 import json
 import time
 from distutils.version import StrictVersion as Version
 from operator import mul
 from functools import reduce
-from itertools import product, islice
 from .fiber import Fiber
 from fibermodes.slrc import SLRC
 from fibermodes.fiber import material as materialmod
@@ -145,6 +145,7 @@ class FiberFactory(object):
                 self.load(f)
         self._Neff = None
         self._Cutoff = None
+        self._cache = None
 
     @property
     def name(self):
@@ -362,31 +363,26 @@ class FiberFactory(object):
         obj["version"] = __version__
 
     def __iter__(self):
-        self._buildFiberList()
-        g = product(*(range(i) for i in self._nitems))
-        return (self._buildFiber(i) for i in g)
+        return iter(self.space())
 
     def __len__(self):
-        if not self.layers:
-            return 0
-        self._buildFiberList()
-        return reduce(mul, self._nitems)
+        return len(self.space())
 
     def __getitem__(self, key):
-        self._buildFiberList()
-        return self._buildFiber(self._getIndexes(key))
+        return self.space()[key]
 
-    def _buildFiberList(self):
-        self._nitems = []
-        for layer in self._fibers["layers"]:
-            for key in ("tparams", "mparams"):
-                for tp in layer[key]:
-                    self._nitems.append(len(SLRC(tp)))
+    def space(self):
+        """Lazy view of the fibers built from this factory.
+
+        Returns:
+            :py:class:`FiberSpace` object.
+
+        """
+        return FiberSpace(self)
 
     def _getIndexes(self, index):
         """Get list of indexes from a single index."""
-        g = product(*(range(i) for i in self._nitems))
-        return next(islice(g, index, None))
+        return self.space().indexes(index)
 
     def setSolvers(self, Cutoff=None, Neff=None):
         assert Cutoff is None or issubclass(Cutoff, FiberSolver)
@@ -394,6 +390,88 @@ class FiberFactory(object):
         self._Cutoff = Cutoff
         self._Neff = Neff
 
+    def setSolverCache(self, cache):
+        """Set persistent cache used by generated fibers.
+
+        Args:
+            cache(SolverCache): A
+                :py:class:`~fibermodes.fiber.solvercache.SolverCache`
+                object, or None to disable it.
+
+        """
+        self._cache = cache
+
+    def _buildFiber(self, indexes):
+        """Build Fiber object from list of indexes"""
+        return self.space()._buildFiber(indexes)
+
+
+class FiberSpace(object):
+
+    """Lazy sequence of the fibers built from a
+    :py:class:`FiberFactory`.
+
+    Parameters of the factory are copied when the object is created.
+    Fibers are built only when accessed, and are not kept. The index of
+    a fiber is decoded in constant time into the index of each parameter
+    (the last parameter varies fastest, as in :py:func:`itertools.product`).
+    Slicing returns another FiberSpace, without building any fiber.
+    Therefore, huge parameter spaces can be sampled or bisected.
+
+    Args:
+        factory(FiberFactory): Factory defining the fibers.
+
+    """
+
+    def __init__(self, factory):
+        self._layers = copy.deepcopy(factory._fibers["layers"])
+        self._Cutoff = factory._Cutoff
+        self._Neff = factory._Neff
+        self._cache = factory._cache
+
+        self._params = []
+        for layer in self._layers:
+            for key in ("tparams", "mparams"):
+                for p in layer[key]:
+                    slrc = SLRC(p)
+                    slrc.codeParams = ["r", "fp", "mp"]
+                    self._params.append(slrc)
+
+        #: Number of values of each parameter.
+        self.nitems = [len(p) for p in self._params]
+        n = reduce(mul, self.nitems, 1) if self._layers else 0
+        self._range = range(n)
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            space = copy.copy(self)
+            space._range = self._range[key]
+            return space
+        return self._buildFiber(self.indexes(self._range[key]))
+
+    def __iter__(self):
+        for index in self._range:
+            yield self._buildFiber(self.indexes(index))
+
+    def indexes(self, index):
+        """Index of each parameter, for given fiber index.
+
+        Args:
+            index(int): Index of the fiber, in the whole space
+                        (i.e. not relative to a slice).
+
+        Returns:
+            List of indexes, one for each parameter.
+
+        """
+        indexes = [0] * len(self.nitems)
+        for k in range(len(self.nitems) - 1, -1, -1):
+            index, indexes[k] = divmod(index, self.nitems[k])
+        return indexes
+
     def _buildFiber(self, indexes):
         """Build Fiber object from list of indexes"""
 
@@ -406,31 +484,25 @@ class FiberFactory(object):
 
         # Get parameters for selected fiber
         ii = 0
-        for i, layer in enumerate(self._fibers["layers"], 1):
+        for i, layer in enumerate(self._layers, 1):
             name = layer["name"] if layer["name"] else "layer {}".format(i+1)
             names.append(name)
 
-            if i < len(self._fibers["layers"]):
-                rr = SLRC(layer["tparams"][0])
-                rr.codeParams = ["r", "fp", "mp"]
-                r.append(rr[indexes[ii]])
+            if i < len(self._layers):
+                r.append(self._params[ii][indexes[ii]])
             ii += 1  # we count radius of cladding, even if we don't use it
 
             f.append(layer["type"])
             fp_ = []
-            for p in layer["tparams"][1:]:
-                ff = SLRC(p)
-                ff.codeParams = ["r", "fp", "mp"]
-                fp_.append(ff[indexes[ii]])
+            for _ in layer["tparams"][1:]:
+                fp_.append(self._params[ii][indexes[ii]])
                 ii += 1
             fp.append(fp_)
 
             m.append(layer["material"])
             mp_ = []
-            for p in layer["mparams"]:
-                mm = SLRC(p)
-                mm.codeParams = ["r", "fp", "mp"]
-                mp_.append(mm[indexes[ii]])
+            for _ in layer["mparams"]:
+                mp_.append(self._params[ii][indexes[ii]])
                 ii += 1
             mp.append(mp_)
 
@@ -465,4 +537,5 @@ class FiberFactory(object):
                 del names[i]
             i -= 1
 
-        return Fiber(r, f, fp, m, mp, names, self._Cutoff, self._Neff)
+        return Fiber(r, f, fp, m, mp, names, self._Cutoff, self._Neff,
+                     self._cache)
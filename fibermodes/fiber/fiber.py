@@ -29,17 +29,21 @@ you should use a :py:class:`~fibermodes.simulator.simulator.Simulator`.
 
 
 from . import geometry
+from . import material
 from . import solver
 from .solver.solver import FiberSolver
+from .fieldcache import FieldCache
+from .surrogate import NeffSurrogate
+from .solvercache import fiberKey
 from math import sqrt, isnan, isinf
 from fibermodes import Wavelength, Mode, ModeFamily
 from fibermodes import constants
-from fibermodes.functions import derivative
+from fibermodes.functions import stencilDerivative
 from fibermodes.field import Field
 from itertools import count
 import logging
+import numpy
 from scipy.optimize import fixed_point
-from functools import lru_cache
 
 
 class Fiber(object):
@@ -51,7 +55,11 @@ class Fiber(object):
 
     logger = logging.getLogger(__name__)
 
-    def __init__(self, r, f, fp, m, mp, names, Cutoff=None, Neff=None):
+    #: Number of wavelengths in the V0 to wavelength table.
+    WLTABLE = 128
+
+    def __init__(self, r, f, fp, m, mp, names, Cutoff=None, Neff=None,
+                 cache=None):
 
         self._r = r
         self._names = names
@@ -68,6 +76,13 @@ class Fiber(object):
                          Mode("HE_odd", 1, 1): 0,
                          Mode("LP", 0, 1): 0}
         self.ne_cache = {}
+        self.dn_cache = {}
+        self.beta_cache = {}
+        self.surrogates = {}
+        self.solvercache = cache
+        self._wltable = None
+        self._fixedna = None
+        self.field_cache = FieldCache(self._solveField, self._r)
 
         self.setSolvers(Cutoff, Neff)
 
@@ -95,9 +110,10 @@ class Fiber(object):
             f.append(layer.__class__.__name__)
             fp.append(layer._fp)
             m.append("Fixed")
-            mp.append([layer._m.n(wl, *layer._mp)])
+            mp.append([layer._n(wl)])
         return Fiber(self._r, f, fp, m, mp, self._names,
-                     self._cutoff.__class__, self._neff.__class__)
+                     self._cutoff.__class__, self._neff.__class__,
+                     self.solvercache)
 
     def name(self, layer):
         return self._names[layer]
@@ -158,14 +174,44 @@ class Fiber(object):
         if Neff is None:
             Neff = self._findNeffSolver()
         self._neff = Neff(self)
+        self._key = None
+        self.field_cache.clear()
+
+    def set_ne_cache(self, wl, mode, neff, delta=None):
+        """Store neff in cache.
 
-    def set_ne_cache(self, wl, mode, neff):
+        If delta is given, it also is stored in the persistent
+        solver cache.
+
+        """
         try:
             self.ne_cache[wl][mode] = neff
         except KeyError:
             self.ne_cache[wl] = {mode: neff}
+        if delta is not None and self.solvercache is not None:
+            self.solvercache.setNeff(self._solverKey(), wl, mode, delta,
+                                     neff)
+
+    def _loadNeff(self, mode, wl, delta):
+        """neff from the persistent solver cache (None if not found)."""
+        if self.solvercache is None:
+            return None
+        neff = self.solvercache.neff(self._solverKey(), wl, mode, delta)
+        if neff is not None:
+            self.set_ne_cache(wl, mode, neff)
+        return neff
+
+    def _solverKey(self):
+        if self._key is None:
+            self._key = fiberKey(self)
+        return self._key
 
     def NA(self, wl):
+        if numpy.ndim(wl):
+            n1 = numpy.max([layer.maxIndex(wl) for layer in self.layers],
+                           axis=0)
+            n2 = self.minIndex(-1, wl)
+            return numpy.sqrt(n1*n1 - n2*n2)
         n1 = max(layer.maxIndex(wl) for layer in self.layers)
         n2 = self.minIndex(-1, wl)
         return sqrt(n1*n1 - n2*n2)
@@ -177,14 +223,34 @@ class Fiber(object):
         """Convert V0 number to wavelength.
 
         An iterative method is used, since the index can be wavelength
-        dependant.
+        dependant. When the materials define a wavelength range, the
+        starting point is interpolated from a V0 table, and refined
+        using the secant method. Wavelengths longer than that range
+        still use fixed point iterations, since material indexes
+        can have poles in the infrared; the table is extrapolated
+        only when those iterations do not converge.
+
+        If V0 is an array, an array of wavelengths (as float) is
+        returned.
 
         """
+        if numpy.ndim(V0):
+            return self._toWls(numpy.asarray(V0, dtype=float), maxiter, tol)
         if V0 == 0:
             return float("inf")
         if isinf(V0):
             return 0
 
+        na = self._fixedNA()
+        if na is not None:
+            return Wavelength(constants.tpi / V0 * self.innerRadius(-1) * na)
+
+        table = self._wlTable()
+        if table is not None and V0 >= table[0][0]:
+            wl = self._toWlTable(V0, table, tol)
+            if wl is not None:
+                return Wavelength(wl)
+
         def f(x):
             return constants.tpi / V0 * b * self.NA(x)
 
@@ -200,23 +266,247 @@ class Fiber(object):
                     self.logger.info(
                         "toWl: did not converged from {}µm "
                         "for V0 = {} (wl={})".format(w*1e6, V0, wl))
+                    wl = 0  # Try from next starting point
                 if wl > 0:
                     break
 
+        if wl == 0 and table is not None:
+            wl = self._toWlTable(V0, table, tol) or 0
+
         if wl == 0:
             self.logger.error("toWl: did not converged for "
                               "V0 = {} (wl={})".format(V0, wl))
 
         return Wavelength(wl)
 
+    def _toWls(self, V0, maxiter, tol):
+        """Array version of :py:meth:`toWl`."""
+        na = self._fixedNA()
+        if na is not None:
+            with numpy.errstate(divide='ignore'):
+                return constants.tpi / V0 * self.innerRadius(-1) * na
+
+        v0 = V0.ravel()
+        wls = numpy.empty(v0.size)
+        wls.fill(numpy.nan)
+        table = self._wlTable()
+        if table is not None:
+            sel = (v0 >= table[0][0]) & numpy.isfinite(v0)
+            wls[sel] = self._toWlsTable(v0[sel], table, tol)
+        for i in numpy.nonzero(numpy.isnan(wls))[0]:
+            wls[i] = self.toWl(float(v0[i]), maxiter, tol)
+        return wls.reshape(V0.shape)
+
+    def _fixedNA(self):
+        """NA of a fiber made of fixed index materials (None otherwise)."""
+        if self._fixedna is None:
+            self._fixedna = False
+            if all(isinstance(m, material.Fixed)
+                   for layer in self.layers
+                   for m in (layer._m, getattr(layer, '_cm', layer._m))):
+                self._fixedna = self.NA(1.55e-6)
+        return self._fixedna or None
+
+    def _wlTable(self):
+        """(V0, wavelength) arrays, sorted by increasing V0.
+
+        Wavelengths span the range where all materials are defined.
+        None if no material defines a range (non dispersive fiber),
+        or if V0 is not monotonous over that range.
+
+        """
+        if self._wltable is None:
+            self._wltable = False
+            wlmin, wlmax = 0, float("inf")
+            for layer in self.layers:
+                if layer._m.WLRANGE is not None:
+                    wlmin = max(wlmin, layer._m.WLRANGE[0])
+                    wlmax = min(wlmax, layer._m.WLRANGE[1])
+            if 0 < wlmin < wlmax < float("inf"):
+                wls = numpy.geomspace(wlmax, wlmin, self.WLTABLE)
+                v0s = numpy.array([self.V0(wl) for wl in wls])
+                if numpy.all(numpy.diff(v0s) > 0):
+                    self._wltable = (v0s, wls)
+        return self._wltable or None
+
+    def _toWlTable(self, V0, table, tol, maxiter=50):
+        """Wavelength from V0 table (None if it does not converge)."""
+        v0s, wls = table
+        i = min(max(numpy.searchsorted(v0s, V0), 1), len(v0s) - 1)
+        v0a, v0b = v0s[i-1], v0s[i]
+        wla, wlb = wls[i-1], wls[i]
+
+        # V0 * wl is proportional to NA, and varies slowly: it is
+        # interpolated (or extrapolated outside of the table)
+        p = v0a * wla + (v0b * wlb - v0a * wla) * (V0 - v0a) / (v0b - v0a)
+        wl = p / V0
+        slope = (v0b - v0a) / (wlb - wla)
+
+        c = constants.tpi * self.innerRadius(-1)
+        dv = c * self.NA(wl) / wl - V0
+        for _ in range(maxiter):
+            if dv == 0:
+                return wl
+            step = dv / slope
+            nwl = wl - step
+            if not nwl > 0:
+                return None
+            if abs(step) <= tol * nwl:
+                return nwl
+            ndv = c * self.NA(nwl) / nwl - V0
+            if abs(ndv) >= abs(dv) and abs(dv) <= 1e-12 * V0:
+                return wl  # Rounding errors dominate
+            if ndv != dv:
+                slope = (dv - ndv) / step
+            wl, dv = nwl, ndv
+        return None
+
+    def _toWlsTable(self, V0, table, tol, maxiter=50):
+        """Array version of :py:meth:`_toWlTable`.
+
+        Returns nan where it does not converge.
+
+        Args:
+            V0(array): V0 numbers.
+            table(tuple): Table from :py:meth:`_wlTable`.
+            tol(float): Relative tolerance.
+            maxiter(int): Maximum number of secant iterations.
+
+        """
+        v0s, wls = table
+        i = numpy.clip(numpy.searchsorted(v0s, V0), 1, len(v0s) - 1)
+        v0a, v0b = v0s[i-1], v0s[i]
+        wla, wlb = wls[i-1], wls[i]
+
+        # V0 * wl is proportional to NA, and varies slowly: it is
+        # interpolated (or extrapolated outside of the table)
+        p = v0a * wla + (v0b * wlb - v0a * wla) * (V0 - v0a) / (v0b - v0a)
+        wl = p / V0
+        slope = (v0b - v0a) / (wlb - wla)
+
+        c = constants.tpi * self.innerRadius(-1)
+        dv = c * self.NA(wl) / wl - V0
+        result = numpy.empty(V0.size)
+        result.fill(numpy.nan)
+        idx = numpy.arange(V0.size)  # Points not converged yet
+        for _ in range(maxiter):
+            done = dv == 0
+            result[idx[done]] = wl[done]
+            keep = ~done
+            idx, V0, wl, dv, slope = (idx[keep], V0[keep], wl[keep],
+                                      dv[keep], slope[keep])
+            if not idx.size:
+                break
+
+            step = dv / slope
+            nwl = wl - step
+            done = abs(step) <= tol * nwl
+            result[idx[done]] = nwl[done]
+            keep = ~done & (nwl > 0)
+            idx, V0, wl, dv, slope, step, nwl = (
+                idx[keep], V0[keep], wl[keep], dv[keep], slope[keep],
+                step[keep], nwl[keep])
+
+            ndv = c * self.NA(nwl) / nwl - V0
+            # Stop where rounding errors dominate
+            done = (abs(ndv) >= abs(dv)) & (abs(dv) <= 1e-12 * V0)
+            result[idx[done]] = wl[done]
+            keep = ~done
+            moved = keep & (ndv != dv)
+            slope[moved] = (dv[moved] - ndv[moved]) / step[moved]
+            idx, V0, wl, dv, slope = (idx[keep], V0[keep], nwl[keep],
+                                      ndv[keep], slope[keep])
+        return result
+
     def cutoff(self, mode):
         try:
             return self.co_cache[mode]
         except KeyError:
-            co = self._cutoff(mode)
+            pass
+
+        even = {ModeFamily.HE_odd: ModeFamily.HE,
+                ModeFamily.EH_odd: ModeFamily.EH}
+        if mode.family in even:
+            # Odd modes have the same cutoff as even modes
+            co = self.cutoff(Mode(even[mode.family], mode.nu, mode.m))
             self.co_cache[mode] = co
             return co
 
+        co = None
+        if self.solvercache is not None:
+            co = self.solvercache.cutoff(self._solverKey(), mode)
+        if co is None:
+            co = self._cutoff(mode)
+            if self.solvercache is not None:
+                self.solvercache.setCutoff(self._solverKey(), mode, co)
+        self.co_cache[mode] = co
+        return co
+
+    def cutoffMap(self, v0max, families=None, numax=None):
+        """Find the cutoff of all modes of given families, up to v0max.
+
+        When the cutoff solver supports it (three-layer step-index
+        fibers), each characteristic equation is sampled once for all
+        modes (m = 1, 2, ...). Cutoffs are stored in cache.
+
+        Args:
+            v0max(float): Maximum normalized frequency.
+            families(list): Mode families (default: TE, TM, HE, and EH).
+            numax(int): Maximum azimuthal order (default: no limit).
+
+        Returns:
+            Dict {mode: cutoff} of the modes with cutoff below v0max.
+
+        """
+        if families is None:
+            families = (ModeFamily.TE, ModeFamily.TM,
+                        ModeFamily.HE, ModeFamily.EH)
+        if getattr(self._cutoff, 'cutoffMap', None) is not None:
+            # HE and EH cutoffs are found together
+            hybrid = {ModeFamily.EH: ModeFamily.HE}
+        else:
+            hybrid = {}
+        scans = {}
+        modes = {}
+        for fam in families:
+            for nu in count(0):
+                if (fam is ModeFamily.TE or fam is ModeFamily.TM) and nu > 0:
+                    break
+                if fam not in (ModeFamily.LP, ModeFamily.TE,
+                               ModeFamily.TM) and nu == 0:
+                    continue
+                if numax is not None and nu > numax:
+                    break
+
+                key = (hybrid.get(fam, fam), nu)
+                if key not in scans:
+                    scans[key] = self._cutoffMap(fam, nu, v0max)
+                found = {mode: co for mode, co in scans[key].items()
+                         if mode.family is fam}
+                if not found:
+                    break
+                modes.update(found)
+        return modes
+
+    def _cutoffMap(self, fam, nu, v0max):
+        cutoffMap = getattr(self._cutoff, 'cutoffMap', None)
+        if cutoffMap is None:
+            found = {}
+            for m in count(1):
+                mode = Mode(fam, nu, m)
+                co = self.cutoff(mode)
+                if isnan(co) or co > v0max:
+                    return found
+                found[mode] = co
+        found = cutoffMap(fam, nu, v0max)
+
+        for mode, co in found.items():
+            if mode not in self.co_cache:
+                self.co_cache[mode] = co
+                if self.solvercache is not None:
+                    self.solvercache.setCutoff(self._solverKey(), mode, co)
+        return found
+
     def cutoffWl(self, mode):
         return self.toWl(self.cutoff(mode))
 
@@ -224,9 +514,82 @@ class Fiber(object):
         try:
             return self.ne_cache[wl][mode]
         except KeyError:
+            pass
+
+        dn = self._surrogate(mode, wl, 0)
+        if dn is not None:
+            return dn[0]
+        neff = self._loadNeff(mode, wl, delta)
+        if neff is None:
             neff = self._neff(Wavelength(wl), mode, delta, lowbound)
-            self.set_ne_cache(wl, mode, neff)
-            return neff
+            self.set_ne_cache(wl, mode, neff, delta)
+        return neff
+
+    def neffs(self, mode, wavelengths, delta=1e-6):
+        """Effective index of a mode, at many wavelengths.
+
+        Wavelengths not already in cache are solved together, when the
+        solver supports it.
+
+        Args:
+            mode(Mode): Mode
+            wavelengths(list): List of wavelengths
+            delta(float): Step used to find roots.
+
+        Returns:
+            numpy.ndarray of effective indexes.
+
+        """
+        wls = [Wavelength(wl) for wl in wavelengths]
+        todo = [wl for wl in wls if mode not in self.ne_cache.get(wl, {})
+                and self._loadNeff(mode, wl, delta) is None]
+        if todo:
+            batch = getattr(self._neff, 'batch', None)
+            if batch is None:
+                for wl in todo:
+                    self.neff(mode, wl, delta)
+            else:
+                for wl, neff in zip(todo, batch(todo, mode, delta)):
+                    self.set_ne_cache(wl, mode, float(neff), delta)
+        return numpy.array([self.ne_cache[wl][mode] for wl in wls])
+
+    def buildSurrogate(self, mode, wlmin, wlmax, tol=1e-10, delta=1e-6):
+        """Build a surrogate model of neff for a mode, and register it.
+
+        Subsequent neff, ng, D, and S queries inside [wlmin, wlmax] are
+        evaluated from the model.
+
+        Args:
+            mode(Mode): Mode
+            wlmin(Wavelength): Lower wavelength of the interval.
+            wlmax(Wavelength): Upper wavelength of the interval.
+            tol(float): Maximum error on neff.
+            delta(float): Step used to find roots.
+
+        Returns:
+            :py:class:`~fibermodes.fiber.surrogate.NeffSurrogate`
+
+        """
+        surrogate = NeffSurrogate.build(self, mode, wlmin, wlmax, tol,
+                                        delta=delta)
+        self.addSurrogate(surrogate)
+        return surrogate
+
+    def addSurrogate(self, surrogate):
+        """Register a surrogate model (e.g. loaded from a file).
+
+        Models added last have priority.
+
+        """
+        self.surrogates.setdefault(surrogate.mode, []).insert(0, surrogate)
+        self.dn_cache = {}
+
+    def _surrogate(self, mode, wl, order):
+        for surrogate in self.surrogates.get(mode, ()):
+            dn = surrogate.derivatives(wl, order)
+            if dn is not None:
+                return dn
+        return None
 
     def Veff(self, mode, wl):
         n2 = self.minIndex(-1, wl)
@@ -238,18 +601,79 @@ class Fiber(object):
             neff = self.neff(mode, wl, delta, lowbound)
             return neff * wl.k0
 
+        if p <= 3:
+            dn = self._dneff(mode, wl, delta, lowbound)
+            if dn is not None:
+                return (p * dn[p-1] + omega * dn[p]) / constants.c
+
         m = 5
         j = (m - 1) // 2
         h = 1e12  # This value is critical for accurate computation
+        betas = self._betaStencil(omega, mode, m, j, h, delta, lowbound)
+        return stencilDerivative(betas, p, j, h)
+
+    def _betaStencil(self, omega, mode, m, j, h, delta=1e-6, lowbound=None):
+        """beta at omega + (i-j) * h, for i in range(m).
+
+        The stencil is shared by all derivative orders (ng, D, S, ...),
+        and cached by (mode, omega, h).
+
+        """
+        key = (mode, omega, h)
+        try:
+            return self.beta_cache[key]
+        except KeyError:
+            pass
+
+        betas = [0] * m
         lb = lowbound
         for i in range(m-1, -1, -1):
-            # Precompute neff using previous wavelength
-            o = omega + (i-j) * h
-            wl = Wavelength(omega=o)
-            lb = self.neff(mode, wl, delta, lb) + delta * 1.1
+            # Compute neff using previous wavelength as lowbound
+            wl = Wavelength(omega=omega + (i-j) * h)
+            neff = self.neff(mode, wl, delta, lb)
+            betas[i] = neff * wl.k0
+            lb = neff + delta * 1.1
+        self.beta_cache[key] = betas
+        return betas
+
+    def _dneff(self, mode, wl, delta=1e-6, lowbound=None):
+        """neff and its derivatives with respect to omega (up to 3rd).
+
+        Derivatives are obtained by implicit differentiation of the
+        characteristic equation, when the solver supports it.
+        Returns None otherwise.
+
+        """
+        try:
+            return self.dn_cache[wl][mode]
+        except KeyError:
+            pass
 
-        return derivative(
-            self.beta, omega, p, m, j, h, mode, 0, delta, lowbound)
+        dn = self._surrogate(mode, wl, 3)
+        if dn is not None:
+            return dn
+
+        if self.solvercache is not None:
+            dn = self.solvercache.derivatives(self._solverKey(), wl, mode,
+                                              delta)
+        if dn is None:
+            neff = self.neff(mode, wl, delta, lowbound)
+            if isnan(neff):
+                dn = [neff] * 4
+            else:
+                try:
+                    dn = self._neff._neffDerivatives(Wavelength(wl), mode,
+                                                     neff)
+                except NotImplementedError:
+                    pass
+            if dn is not None and self.solvercache is not None:
+                self.solvercache.setDerivatives(self._solverKey(), wl, mode,
+                                                delta, dn)
+        try:
+            self.dn_cache[wl][mode] = dn
+        except KeyError:
+            self.dn_cache[wl] = {mode: dn}
+        return dn
 
     def b(self, mode, wl, delta=1e-6, lowbound=None):
         """Normalized propagation constant"""
@@ -329,14 +753,167 @@ class Fiber(object):
                     break
         return modes
 
+    def guidedModes(self, wl, families=None, numax=None, mmax=None,
+                    method="cutoff", delta=1e-6):
+        """Find guided modes of given families, within given constraints.
+
+        With method "cutoff", modes are enumerated from their cutoff
+        only: a mode is guided if its cutoff is below V0. Effective
+        indexes are not computed; they are solved later, when needed.
+        Cutoffs of all modes of a family and azimuthal order are found
+        together (see :py:meth:`cutoffMap`). Odd modes have the same
+        cutoff as even modes.
+
+        With method "neff", or if the cutoff solver is not implemented
+        for the fiber, this is the same as :py:meth:`findModes`.
+
+        Args:
+            wl(Wavelength): Wavelength
+            families(list): Mode families (default: vector modes,
+                            as :py:meth:`findVmodes`).
+            numax(int): Maximum azimuthal order (default: no limit).
+            mmax(int or list): Maximum radial order, or list of
+                               maximum radial order for each nu.
+            method(str): "cutoff" or "neff".
+            delta(float): Step used to find roots of neff.
+
+        Returns:
+            Set of modes.
+
+        """
+        if families is None:
+            families = (ModeFamily.HE, ModeFamily.HE_odd, ModeFamily.EH,
+                        ModeFamily.EH_odd, ModeFamily.TE, ModeFamily.TM)
+        if method == "cutoff":
+            try:
+                return self._guidedModes(wl, families, numax, mmax)
+            except NotImplementedError:
+                pass
+        elif method != "neff":
+            raise ValueError("Unknown method {}".format(method))
+        return self.findModes(families, wl, numax, mmax, delta)
+
+    def _guidedModes(self, wl, families, numax, mmax):
+        even = {ModeFamily.HE_odd: ModeFamily.HE,
+                ModeFamily.EH_odd: ModeFamily.EH}
+        modes = set()
+        v0 = self.V0(wl)
+        for fam in families:
+            cofam = even.get(fam, fam)
+            for nu in count(0):
+                try:
+                    _mmax = mmax[nu]
+                except IndexError:
+                    _mmax = mmax[-1]
+                except TypeError:
+                    _mmax = mmax
+
+                if (fam is ModeFamily.TE or fam is ModeFamily.TM) and nu > 0:
+                    break
+                if fam not in (ModeFamily.LP, ModeFamily.TE,
+                               ModeFamily.TM) and nu == 0:
+                    continue
+                if numax is not None and nu > numax:
+                    break
+
+                found = [mode.m for mode in self._cutoffMap(cofam, nu, v0)
+                         if mode.family is cofam and
+                         (_mmax is None or mode.m <= _mmax)]
+                if not found:
+                    break
+                modes.update(Mode(fam, nu, m) for m in found)
+        return modes
+
+    def solveAll(self, wl, families=None, numax=None, delta=1e-6):
+        """Find all modes of given families, and their effective index.
+
+        For each family and azimuthal order, the characteristic equation
+        is scanned once for all modes (m = 1, 2, ...), and the effective
+        indexes are stored in cache. When the solver supports it, HE and
+        EH modes of the same order are found from a single scan.
+
+        Args:
+            wl(Wavelength): Wavelength
+            families(list): Mode families (default: HE, EH, TE, and TM).
+            numax(int): Maximum azimuthal order (default: no limit).
+            delta(float): Step used to find roots.
+
+        Returns:
+            Dict {mode: neff} of the guided modes.
+
+        """
+        if families is None:
+            families = (ModeFamily.HE, ModeFamily.EH,
+                        ModeFamily.TE, ModeFamily.TM)
+        wl = Wavelength(wl)
+        if getattr(self._neff, 'solveAll', None) is not None:
+            # HE and EH modes share the same characteristic equation
+            hybrid = {ModeFamily.EH: ModeFamily.HE,
+                      ModeFamily.EH_odd: ModeFamily.HE_odd}
+        else:
+            hybrid = {}
+        scans = {}
+        modes = {}
+        for fam in families:
+            for nu in count(0):
+                if (fam is ModeFamily.TE or fam is ModeFamily.TM) and nu > 0:
+                    break
+                if fam not in (ModeFamily.LP, ModeFamily.TE,
+                               ModeFamily.TM) and nu == 0:
+                    continue
+                if numax is not None and nu > numax:
+                    break
+
+                key = (hybrid.get(fam, fam), nu)
+                if key not in scans:
+                    scans[key] = self._solveAll(wl, fam, nu, delta)
+                guided = {mode: neff for mode, neff in scans[key].items()
+                          if mode.family is fam and not isnan(neff)}
+                if not guided:
+                    break
+                modes.update(guided)
+        return modes
+
+    def _solveAll(self, wl, fam, nu, delta):
+        solveAll = getattr(self._neff, 'solveAll', None)
+        if solveAll is None:
+            found = {}
+            for m in count(1):
+                mode = Mode(fam, nu, m)
+                found[mode] = self.neff(mode, wl, delta)
+                if isnan(found[mode]):
+                    return found
+        found = solveAll(wl, fam, nu, delta)
+
+        if fam is ModeFamily.HE_odd or fam is ModeFamily.EH_odd:
+            odd = {ModeFamily.HE: ModeFamily.HE_odd,
+                   ModeFamily.EH: ModeFamily.EH_odd}
+            found = {Mode(odd[mode.family], nu, mode.m): neff
+                     for mode, neff in found.items()}
+        for mode, neff in found.items():
+            self.set_ne_cache(wl, mode, neff, delta)
+        return found
+
     def field(self, mode, wl, r, np=101):
         """Return electro-magnetic field.
 
         """
         return Field(self, mode, wl, r, np)
 
-    @lru_cache(maxsize=None)
     def _rfield(self, mode, wl, r):
+        """Radial E and H fields.
+
+        r can be a scalar or an array of radial positions. Returned
+        (E, H) arrays have shape (3,) + numpy.shape(r), where the first
+        axis is the field component.
+
+        Fields are interpolated from the profile stored in field_cache.
+
+        """
+        return self.field_cache(mode, Wavelength(wl), r)
+
+    def _solveField(self, mode, wl, r):
+        """Radial E and H fields, computed from the mode solver."""
         neff = self.neff(mode, wl)
         fct = {ModeFamily.LP: self._neff._lpfield,
                ModeFamily.TE: self._neff._tefield,
@@ -346,11 +923,14 @@ class Fiber(object):
                ModeFamily.HE_odd: self._neff._hofield,
                ModeFamily.EH_odd: self._neff._hofield}
         return fct[mode.family](wl, mode.nu, neff, r)
+
     def _control(self, mode, wl, r):
         neff = self.neff(mode, wl)
         act = {ModeFamily.HE: self._neff._HEpoint,
+               ModeFamily.EH: self._neff._EHpoint,
                ModeFamily.TE: self._neff._TEpoint,
                ModeFamily.TM: self._neff._TMpoint}
         return act[mode.family](wl, mode.nu, neff, r)
+
     def _bb(self):
         pass
\ No newline at end of file
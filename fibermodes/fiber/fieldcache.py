@@ -0,0 +1,176 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Bounded cache for radial field profiles.
+
+Radial fields of a given mode, at a given wavelength, are tabulated
+once on each layer of the fiber, using Chebyshev interpolation.
+Fields at any radial position then are interpolated from those tables.
+
+"""
+
+from collections import OrderedDict, namedtuple
+import numpy
+from numpy.polynomial import chebyshev
+
+
+#: Statistics about a :py:class:`FieldCache`.
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+class _FieldProfile(object):
+
+    """Chebyshev interpolation of E and H fields, layer by layer.
+
+    Args:
+        fct: Function computing (E, H) for an array of radii.
+        bounds(list): Radial positions of layer interfaces.
+        rmax(float): Maximum radial position of the table.
+        npoints(int): Number of interpolation points per layer.
+
+    """
+
+    def __init__(self, fct, bounds, rmax, npoints):
+        self.bounds = numpy.asarray(bounds, dtype=float)
+        self.rmax = rmax
+        edges = numpy.concatenate(([0], self.bounds, [rmax]))
+        self.centers = (edges[1:] + edges[:-1]) / 2
+        self.widths = (edges[1:] - edges[:-1]) / 2
+
+        # Chebyshev nodes (first kind) never reach the interfaces,
+        # where some field components are discontinuous.
+        x = numpy.cos(numpy.pi * (numpy.arange(npoints) + 0.5) / npoints)
+        r = (self.centers[:, numpy.newaxis] +
+             self.widths[:, numpy.newaxis] * x)
+        E, H = fct(r.ravel())
+        EH = numpy.vstack((E, H)).reshape(6, len(self.centers), npoints)
+        self.coefs = [chebyshev.chebfit(x, EH[:, i, :].T, npoints - 1)
+                      for i in range(len(self.centers))]
+
+    def __call__(self, r):
+        idx = numpy.searchsorted(self.bounds, r, side='right')
+        EH = numpy.empty((6,) + r.shape)
+        for i, coef in enumerate(self.coefs):
+            sel = idx == i
+            if numpy.any(sel):
+                x = (r[sel] - self.centers[i]) / self.widths[i]
+                EH[:, sel] = chebyshev.chebval(x, coef)
+        return EH[:3], EH[3:]
+
+
+class FieldCache(object):
+
+    """Bounded cache of radial field profiles, for a given fiber.
+
+    Profiles are keyed on (mode, wavelength), and are interpolated for
+    any radial position. The least recently used profile is discarded
+    when the cache is full.
+
+    Args:
+        fct: Function computing the exact fields. It is called as
+             fct(mode, wl, r), where r is an array of radial positions,
+             and it must return (E, H) arrays of shape (3, len(r)).
+        bounds(list): Radial positions of layer interfaces.
+        maxsize(int): Maximum number of profiles kept. If 0, fields are
+                      always computed without caching. If None, the
+                      cache is unbounded.
+        npoints(int): Number of interpolation points per layer.
+
+    """
+
+    def __init__(self, fct, bounds, maxsize=32, npoints=64):
+        self._fct = fct
+        self._bounds = list(bounds)
+        self._profiles = OrderedDict()
+        self.maxsize = maxsize
+        self.npoints = npoints
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __contains__(self, key):
+        mode, wl = key
+        return (mode, float(wl)) in self._profiles
+
+    def __call__(self, mode, wl, r):
+        """Radial E and H fields, interpolated from the cached profile.
+
+        Args:
+            mode(Mode): Mode
+            wl(Wavelength): Wavelength
+            r(float or ndarray): Radial position(s). Must be positive.
+
+        Returns:
+            (E, H) tuple of arrays of shape (3,) + numpy.shape(r).
+
+        """
+        r = numpy.asarray(r, dtype=float)
+        if self.maxsize == 0:
+            self.misses += 1
+            return self._fct(mode, wl, r)
+
+        key = (mode, float(wl))
+        rmax = r.max() if r.size else 0
+        profile = self._profiles.get(key)
+        if profile is None or rmax > profile.rmax:
+            self.misses += 1
+            profile = self._build(mode, wl, rmax, profile)
+            self._profiles[key] = profile
+            self._evict()
+        else:
+            self.hits += 1
+        self._profiles.move_to_end(key)
+        return profile(r)
+
+    def _build(self, mode, wl, rmax, profile=None):
+        """Tabulate fields up to rmax (at least twice the outer radius)."""
+        rmin = 2 * self._bounds[-1] if self._bounds else 1e-6
+        if profile is not None:
+            rmin = max(rmin, 1.5 * profile.rmax)
+        return _FieldProfile(lambda r: self._fct(mode, wl, r),
+                             self._bounds, max(rmax, rmin), self.npoints)
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def invalidate(self, mode=None, wl=None):
+        """Remove cached profiles.
+
+        Args:
+            mode(Mode): Remove profiles of this mode only (default: all).
+            wl(Wavelength): Remove profiles at this wavelength only
+                            (default: all).
+
+        """
+        for key in list(self._profiles):
+            if ((mode is None or key[0] == mode) and
+                    (wl is None or key[1] == float(wl))):
+                del self._profiles[key]
+
+    def clear(self):
+        """Remove all profiles, and reset statistics."""
+        self._profiles.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Cache statistics (hits, misses, maxsize, currsize)."""
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._profiles))
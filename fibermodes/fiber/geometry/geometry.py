@@ -18,6 +18,9 @@ from fibermodes.fiber import material
 
 class Geometry(object):
 
+    #: Maximum number of wavelengths kept in the index cache.
+    NCACHE = 256
+
     def __init__(self, ri, ro, *fp, m, mp, **kwargs):
         self._m = material.__dict__[m]()  # instantiate material object
         self._mp = mp
@@ -28,6 +31,33 @@ class Geometry(object):
         self._fp = fp
         self.ri = ri
         self.ro = ro
+        self._ncache = {}
+        self._cncache = {}
+
+    def _n(self, wl):
+        """Index of the material at wl.
+
+        Indexes are cached by wavelength, since solvers ask for
+        the same index many times while finding a root.
+
+        """
+        return self._index(self._ncache, self._m, self._mp, wl)
+
+    def _cn(self, wl):
+        """Index of the cladding material at wl (cached)."""
+        return self._index(self._cncache, self._cm, self._cmp, wl)
+
+    def _index(self, cache, m, mp, wl):
+        try:
+            return cache[wl]
+        except KeyError:
+            pass
+        except TypeError:  # numpy array
+            return m.n(wl, *mp)
+        if len(cache) >= self.NCACHE:
+            cache.clear()
+        n = cache[wl] = m.n(wl, *mp)
+        return n
 
     def __str__(self):
         return self.__class__.__name__ + ' ' + self._m.str(*self._mp)
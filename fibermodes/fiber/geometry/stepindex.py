@@ -29,15 +29,15 @@ class StepIndex(Geometry):
 
     def index(self, r, wl):
         if self.ri <= abs(r) <= self.ro:
-            return self._m.n(wl, *self._mp)
+            return self._n(wl)
         else:
             return None
 
     def minIndex(self, wl):
-        return self._m.n(wl, *self._mp)
+        return self._n(wl)
 
     def maxIndex(self, wl):
-        return self._m.n(wl, *self._mp)
+        return self._n(wl)
 
     def u(self, r, neff, wl):
         return wl.k0 * r * sqrt(abs(self.index(r, wl)**2 - neff**2))
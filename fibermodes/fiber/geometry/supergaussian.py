@@ -17,16 +17,25 @@ from .geometry import Geometry
 from ... import constants
 from math import sqrt, exp
 import numpy
-from scipy.special import jn, iv
-from scipy.special import jvp, ivp
-
-from scipy.integrate import ode
 
 
 class SuperGaussian(Geometry):
 
     DEFAULT_PARAMS = [0, 1e-6, 1]
 
+    #: Maximum integration step, as a fraction of the wavelength
+    #: in the material.
+    STEP = 0.02
+
+    #: Maximum relative variation of the index over one step.
+    DN = 0.02
+
+    #: Maximum integration step near the center, relative to r / (nu+1).
+    GROWTH = 0.25
+
+    #: Starting radius of the integration, times k0 * n.
+    R0 = 1e-4
+
     def __init__(self, ri, ro, *fp, **kwargs):
         super().__init__(ri, ro, *fp, **kwargs)
         mu, self.c, self.m = fp
@@ -34,12 +43,13 @@ class SuperGaussian(Geometry):
             self.mu = mu
         else:
             self.mu = (self.ro - self.ri) / 2 + self.ri + mu
+        self._gcache = {}
 
     def index(self, r, wl):
         if self.ri <= abs(r) <= self.ro:
 
-            n = self._m.n(wl, *self._mp)
-            cn = self._cm.n(wl, *self._cmp)
+            n = self._n(wl)
+            cn = self._cn(wl)
 
             if r > 0 or self.ri == 0:
                 a = exp(-0.5 * ((r - self.mu) / self.c)**(2*self.m))
@@ -54,15 +64,23 @@ class SuperGaussian(Geometry):
 
     def indexp(self, r, wl):
         """First derivative of index."""
-        n = self._m.n(wl, *self._mp)
-        cn = self._cm.n(wl, *self._cmp)
+        n = self._n(wl)
+        cn = self._cn(wl)
 
-        if r > 0 or self.ri == 0:
-            return ((cn - n) * self.m * n *
-                    ((r - self.mu) / self.c)**(2*self.m - 1) / self.c)
-        else:
-            return ((cn - n) * self.m * n *
-                    ((r + self.mu) / self.c)**(2*self.m) / (self.mu + r))
+        x = (r - self.mu if r > 0 or self.ri == 0 else r + self.mu) / self.c
+        a = exp(-0.5 * x**(2*self.m))
+        return (cn - n) * self.m * a * x**(2*self.m - 1) / self.c
+
+    def _profile(self, r, wl):
+        """Index and its derivative, for an array of positive radii."""
+        n = self._n(wl)
+        cn = self._cn(wl)
+
+        x = (r - self.mu) / self.c
+        xm = numpy.abs(x)**(2*self.m - 1)
+        a = numpy.exp(-0.5 * xm * numpy.abs(x))
+        return (cn + a * (n - cn),
+                (cn - n) * self.m * a * xm * numpy.sign(x) / self.c)
 
     def minIndex(self, wl):
         di = abs(self.mu - self.ri)
@@ -81,113 +99,194 @@ class SuperGaussian(Geometry):
         return wl.k0 * r * sqrt(abs(self.index(r, wl)**2 - neff**2))
 
     def EH_fields(self, ri, ro, nu, neff, wl, EH, tm=False):
-        dr = 1e-10
+        """Scalar version of :py:meth:`propagate`, for a single neff.
+
+        Fields start from the center when ri is 0, and from EH
+        otherwise. modify EH in-place (for speed)
+
+        """
+        g = self._grid(wl, nu)
+        beta = wl.k0 * neff
         if ri == 0:
-            # set initial condition
-            ri = dr
-            n = self.index(ri, wl)
-            u = self.u(ri, neff, wl)
-            if neff < n:
-                ez = jn(nu, u)
-                ezp = jvp(nu, u) * u / ri
-            else:
-                ez = iv(nu, u)
-                ezp = ivp(nu, u) * u / ri
-            hz = 0
-            hzp = 0
-            eza = 0
-            ezap = 0
-            hza = ez
-            hzap = ezp
+            Y = _center(g, beta, nu)
+            if nu == 0:
+                Y = Y[:1] if tm else Y[1:]
         elif nu == 0:
-            ez, hz = EH
+            Y = [tuple(EH.tolist())]
         else:
-            ez, eza = EH[0]
-            hz, hza = EH[1]
-            # find derivatives...
-
-        nu2 = nu * nu
-        beta = wl.k0 * neff
-        beta2 = beta * beta
-
-        def f(r, y):
-            """
-            Bures (3.139)
-
-            """
-            assert r != 0
-            r2 = r * r
-            p = (wl.k0 * self.index(r, wl))**2 - beta2
-
-            np = self.indexp(r, wl)
-            n = self.index(r, wl)
-
-            yp = numpy.empty(4)
-            yp[0] = y[2]
-            yp[1] = y[3]
-            yp[2] = (y[0] * (nu2 / r2 - p) +
-                     y[2] * (2 * beta2 / p * np / n - 1 / r) -
-                     y[1] * constants.eta0 * (2 * nu * beta * wl.k0 * np /
-                                              (r * p * n)))
-            yp[3] = (y[1] * (nu2 / r2 - p) +
-                     y[3] * (2 * wl.k0**2 * n * np / p - 1 / r) -
-                     y[0] * constants.Y0 * (2 * nu * beta * wl.k0 * n * np /
-                                            (r * p)))
-            return yp
-
-        def jac(r, y):
-            r2 = r * r
-            p = (wl.k0 * self.index(r, wl))**2 - beta2
-
-            np = self.indexp(r, wl)
-            n = self.index(r, wl)
-
-            m = numpy.empty((4, 4))
-            m[0, :] = (0, 0, 1, 0)
-            m[1, :] = (0, 0, 0, 1)
-            m[2, :] = ((nu2 / r2 - p),
-                       -(constants.eta0 * (2 * nu * beta * wl.k0 * np /
-                                           (r * p * n))),
-                       (2 * wl.k0**2 * n * np / p - 1 / r),
-                       0)
-            m[3, :] = (-constants.Y0 * (2 * nu * beta * wl.k0 * n * np /
-                                        (r * p)),
-                       0,
-                       (nu2 / r2 - p),
-                       (2 * wl.k0**2 * n * np / p - 1 / r))
-            return m
-
-        s = ode(f, jac).set_integrator("dopri5")
+            Y = [tuple(col) for col in EH.T.tolist()]
 
+        Y = [_rk4(g, beta, nu, y) for y in Y]
         if nu == 0:
-            s.set_initial_value([ez, hz, ezp, hzp], ri)
-            ez, hz, ezp, hzp = s.integrate(ro)
-
-            EH = ez, hz
-            Ezp = numpy.array([ezp])
-            Hzp = numpy.array([hzp])
+            EH[:] = Y[0]
         else:
-            s.set_initial_value([ez, hz, ezp, hzp], ri)
-            ez, hz, ezp, hzp = s.integrate(ro)
-
-            s.set_initial_value([eza, hza, ezap, hzap], ri)
-            eza, hza, ezap, hzap = s.integrate(ro)
-
-            EH[0] = ez, eza
-            EH[1] = hz, hza
-
-            Ezp = numpy.array([ezp, ezap])
-            Hzp = numpy.array([hzp, hzap])
-
-        # calc ephi and hphi
-        u = self.u(ro, neff, wl)
-        n = self.index(ro, wl)
-        beta = wl.k0 * neff
-        c = 1 / (wl.k0**2 * (n*n - neff*neff))
-
-        EH[2] = c * (beta * EH[0] * nu / ro -
-                     constants.eta0 * wl.k0 * Hzp)
-        EH[3] = c * (-beta * EH[1] * nu / ro +
-                     constants.Y0 * wl.k0 * n * n * Ezp)
-
+            EH[:] = numpy.array(Y).T
         return EH
+
+    def propagate(self, nu, neff, wl, EH=None):
+        """Ez, Hz, Ephi and Hphi at the outer radius of the layer.
+
+        The differential equations of the fields (in terms of the
+        tangential components only, so that there is no singularity
+        where neff equals the index) are integrated with a fourth order
+        Runge-Kutta method, on the radial grid of the layer (see
+        :py:meth:`_grid`). Both independent solutions, and all neff,
+        are integrated at once.
+
+        Fields are scaled by (r / ri)**-nu during the integration,
+        to keep them within floating point range for high order modes.
+        Hence, they are known up to a positive factor, common to both
+        solutions.
+
+        Args:
+            nu(int): Azimuthal order
+            neff(array): Effective indexes.
+            wl(Wavelength): Wavelength
+            EH(array): Fields at the inner radius, with shape
+                       neff.shape + (4, 2). If None, fields start from
+                       the center of the fiber: Ez = 1 (first
+                       solution) and Hz = 1 (second solution) when nu
+                       is 0.
+
+        Returns:
+            Array of fields, with shape neff.shape + (4, 2).
+
+        """
+        g = self._grid(wl, nu)
+        beta = wl.k0 * numpy.asarray(neff, dtype=float)[..., numpy.newaxis]
+        if EH is None:
+            Y = [numpy.concatenate(
+                 numpy.broadcast_arrays(y0, y1, beta)[:2], axis=-1)
+                 for y0, y1 in zip(*_center(g, beta, nu))]
+        else:
+            Y = [EH[..., i, :] for i in range(4)]
+        return numpy.stack(_rk4(g, beta, nu, Y), axis=-2)
+
+    def _grid(self, wl, nu):
+        """Radial integration grid of the layer, at wl.
+
+        Steps are limited by the wavelength in the material (STEP),
+        by the variation of the index (DN), and near the center, by the
+        distance to the center (GROWTH). Coefficients of the equations
+        that only depend on the radius are computed once, at each node
+        and at the middle of each step.
+
+        """
+        key = (wl, nu)
+        try:
+            return self._gcache[key]
+        except KeyError:
+            pass
+        if len(self._gcache) >= self.NCACHE:
+            self._gcache.clear()
+
+        n = self.maxIndex(wl)
+        hmax = self.STEP * wl / n
+        dn = self.DN * abs(self._n(wl) - self._cn(wl))
+        r = self.ri if self.ri > 0 else self.R0 / (wl.k0 * n)
+        R = [r]
+        while r < self.ro:
+            h = hmax
+            if self.ri == 0:
+                h = min(h, self.GROWTH * r / (nu + 1))
+            npr = abs(self.indexp(r, wl))
+            if npr * h > dn > 0:
+                h = dn / npr
+            r = self.ro if r + 1.5 * h > self.ro else r + h
+            R.append(r)
+        R = numpy.array(R)
+        h = numpy.diff(R)
+
+        # Coefficients at nodes (even) and at middle of steps (odd)
+        r = numpy.empty(2 * R.size - 1)
+        r[::2] = R
+        r[1::2] = R[:-1] + h / 2
+        ir = 1 / r
+        ek = constants.eta0 * wl.k0
+        yn2 = constants.Y0 * wl.k0 * self._profile(r, wl)[0]**2
+        nir2 = (nu * ir)**2
+        g = self._gcache[key] = _Grid(
+            h=h.tolist(),
+            coefs=list(zip((ir / yn2).tolist(),
+                           (ir / ek).tolist(),
+                           (1 / yn2).tolist(),
+                           yn2.tolist(),
+                           (nu * ir).tolist(),
+                           ((nu + 1) * ir).tolist(),
+                           (ek - nir2 / yn2).tolist(),
+                           (nir2 / ek - yn2).tolist())),
+            r0=R[0], ek=ek, yn2=yn2[0])
+        return g
+
+
+class _Grid(object):
+
+    """Radial grid of a graded-index layer, at given wavelength and nu."""
+
+    def __init__(self, h, coefs, r0, ek, yn2):
+        self.h = h
+        self.coefs = coefs
+        self.r0 = r0
+        self.ek = ek
+        self.yn2 = yn2
+
+
+def _center(g, beta, nu):
+    """Fields of both solutions, near the center of the fiber.
+
+    Leading terms of the series expansions of the fields, scaled
+    by r0**(1-nu): (Ez, Hz) ~ r**nu and (Ephi, Hphi) ~ r**(nu-1).
+
+    """
+    r0, ek, yn2 = g.r0, g.ek, g.yn2
+    if nu == 0:
+        # Ez = 1 (TM), and Hz = 1 (TE)
+        return ((1, 0, 0, -yn2 * r0 / 2),
+                (0, 1, ek * r0 / 2, 0))
+    # Ephi = 1, and Hphi = 1
+    return ((-beta * r0 / nu, -yn2 * r0 / nu, 1, 0),
+            (ek * r0 / nu, beta * r0 / nu, 0, 1))
+
+
+def _rk4(g, beta, nu, Y):
+    """Integrate fields Y = (Ez, Hz, Ephi, Hphi) over grid g.
+
+    Y and beta either are floats, or arrays, in which case all
+    solutions are integrated at once.
+
+    """
+    ek = g.ek
+    bb = beta * beta
+    bnu = beta * nu
+    bbek = bb / ek
+
+    def coefs(q1, q2, iy, y, s, t, d1, d2):
+        return (bnu * q1, bnu * q2, ek - bb * iy, bbek - y, s, t, d1, d2)
+
+    def f(ez, hz, ep, hp, c1, c2, c3, c4, s, t, d1, d2):
+        return (c1 * hz + c3 * hp - s * ez,
+                c2 * ez + c4 * ep - s * hz,
+                d1 * hz + c1 * hp - t * ep,
+                d2 * ez + c2 * ep - t * hp)
+
+    ez, hz, ep, hp = Y
+    it = iter(g.coefs)
+    C = coefs(*next(it))
+    for h in g.h:
+        M = coefs(*next(it))
+        N = coefs(*next(it))
+        h2 = h / 2
+        a1, b1, c1, d1 = f(ez, hz, ep, hp, *C)
+        a2, b2, c2, d2 = f(ez + h2 * a1, hz + h2 * b1,
+                           ep + h2 * c1, hp + h2 * d1, *M)
+        a3, b3, c3, d3 = f(ez + h2 * a2, hz + h2 * b2,
+                           ep + h2 * c2, hp + h2 * d2, *M)
+        a4, b4, c4, d4 = f(ez + h * a3, hz + h * b3,
+                           ep + h * c3, hp + h * d3, *N)
+        h6 = h / 6
+        ez = ez + h6 * (a1 + 2 * (a2 + a3) + a4)
+        hz = hz + h6 * (b1 + 2 * (b2 + b3) + b4)
+        ep = ep + h6 * (c1 + 2 * (c2 + c3) + c4)
+        hp = hp + h6 * (d1 + 2 * (d2 + d3) + d4)
+        C = N
+    return ez, hz, ep, hp
@@ -35,6 +35,11 @@ class ClaussiusMossotti(CompMaterial):
         cls._testRange(wl)
         cls._testConcentration(x)
 
-        wl2 = wl * wl
-        s = numpy.sum((cls.A + cls.B * x) * wl2 / (wl2 - cls.Z * cls.Z))
-        return sqrt((2 * s + 1) / (1 - s))
+        if isinstance(wl, (float, int)):
+            wl2 = wl * wl
+            s = numpy.sum((cls.A + cls.B * x) * wl2 / (wl2 - cls.Z * cls.Z))
+            return sqrt((2 * s + 1) / (1 - s))
+        wl2 = numpy.multiply(wl, wl)[..., numpy.newaxis]
+        s = numpy.sum((cls.A + cls.B * x) * wl2 / (wl2 - cls.Z * cls.Z),
+                      axis=-1)
+        return numpy.sqrt((2 * s + 1) / (1 - s))
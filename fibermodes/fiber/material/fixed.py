@@ -16,6 +16,7 @@
 """Module for fixed index material."""
 
 from .material import Material
+import numpy
 
 
 class Fixed(Material):
@@ -33,4 +34,6 @@ class Fixed(Material):
 
     @classmethod
     def n(cls, wl, n):
+        if numpy.ndim(wl):
+            return numpy.full(numpy.shape(wl), n, dtype=float)
         return n
@@ -16,10 +16,12 @@
 """Module for fiber materials.
 
 A material gives a refractive index, as function of the wavelength.
+Wavelength can be a scalar, or a numpy array of wavelengths.
 
 """
 
 from scipy.optimize import brentq
+import numpy
 import warnings
 
 
@@ -53,7 +55,11 @@ class Material(object):
     def _testRange(cls, wl):
         if cls.WLRANGE is None:
             return
-        if cls.WLRANGE[0] <= wl <= cls.WLRANGE[1]:
+        if isinstance(wl, (float, int)):
+            if cls.WLRANGE[0] <= wl <= cls.WLRANGE[1]:
+                return
+        elif numpy.all((cls.WLRANGE[0] <= numpy.asarray(wl)) &
+                       (numpy.asarray(wl) <= cls.WLRANGE[1])):
             return
 
         msg = ("Wavelength {} out of supported range for material {}. "
@@ -19,6 +19,7 @@
 
 from .material import Material
 from math import sqrt
+import numpy
 
 
 class Sellmeier(Material):
@@ -35,8 +36,13 @@ class Sellmeier(Material):
 
     @classmethod
     def _n(cls, wl, B, C):
-        x2 = wl * wl * 1e12
-        return sqrt(abs(1 + x2 * sum(b / (x2 - c**2) for (b, c) in zip(B, C))))
+        if isinstance(wl, (float, int)):
+            x2 = wl * wl * 1e12
+            return sqrt(abs(1 + x2 * sum(b / (x2 - c**2)
+                                         for (b, c) in zip(B, C))))
+        x2 = numpy.multiply(wl, wl) * 1e12
+        return numpy.sqrt(numpy.abs(
+            1 + x2 * sum(b / (x2 - c**2) for (b, c) in zip(B, C))))
 
     @classmethod
     def n(cls, wl):
@@ -7,6 +7,7 @@ in a given :py:class:`fibermodes.fiber.fiber.Fiber`.
 from . import ssif
 from . import tlsif
 from . import mlsif
+from . import batch
 
 
-__all__ = ['ssif', 'tlsif', 'mlsif']
+__all__ = ['ssif', 'tlsif', 'mlsif', 'batch']
@@ -0,0 +1,75 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Batch solver for multilayers step-index fibers.
+
+The characteristic equation is evaluated on a grid of effective indexes,
+from the cladding index to the maximum index of the fiber, and every
+sign change is refined. All modes of a given family and azimuthal order
+are found at once, and stored in the cache of the fiber.
+
+The grid is split among several threads. This is useful on multicore
+processors, as NumPy and SciPy functions release the GIL.
+
+Use it with :py:meth:`~fibermodes.fiber.factory.FiberFactory.setSolvers`::
+
+    factory.setSolvers(Neff=batch.Neff)
+
+"""
+
+from . import mlsif
+from fibermodes import Wavelength, ModeFamily
+from concurrent.futures import ThreadPoolExecutor
+from math import isnan
+import numpy
+import os
+
+
+class Neff(mlsif.Neff):
+
+    """Effective index solver, finding all modes of a (family, nu)
+    at once.
+
+    """
+
+    #: Minimum number of points on the grid of effective indexes.
+    NPOINTS = 1000
+
+    #: Number of threads used to evaluate the characteristic equation
+    #: (None: number of processors).
+    nthreads = None
+
+    def __call__(self, wl, mode, delta, lowbound):
+        if ((lowbound is not None and not isnan(lowbound)) or
+                mode.family is ModeFamily.HE_odd or
+                mode.family is ModeFamily.EH_odd):
+            return super().__call__(wl, mode, delta, lowbound)
+
+        wl = Wavelength(wl)
+        modes = self.solveAll(wl, mode.family, mode.nu, delta)
+        for m, neff in modes.items():
+            self.fiber.set_ne_cache(wl, m, neff, delta)
+        return modes.get(mode, float("nan"))
+
+    def _evaluate(self, vfct, X):
+        nthreads = self.nthreads or os.cpu_count() or 1
+        evaluate = super()._evaluate
+        if nthreads < 2 or X.size < 2 * self.NPOINTS:
+            return evaluate(vfct, X)
+
+        with ThreadPoolExecutor(nthreads) as executor:
+            F = executor.map(lambda x: evaluate(vfct, x),
+                             numpy.array_split(X, nthreads))
+            return numpy.concatenate(list(F))
@@ -16,147 +16,322 @@
 from .solver import FiberSolver
 from fibermodes import Wavelength, Mode, ModeFamily
 from fibermodes import constants
-from math import isnan
+from fibermodes.fiber.geometry import StepIndex
+from math import isnan, sqrt
 import numpy
+from numpy.linalg import LinAlgError
 from scipy.special import kn, kvp, k0, k1, jn, jvp, yn, yvp, iv, ivp
 
 
 class Neff(FiberSolver):
 
+    #: Minimum number of points used by :py:meth:`solveAll` to scan
+    #: the characteristic equation.
+    NPOINTS = 100
+
+    #: Maximum number of wavelengths kept in the context cache.
+    NCONTEXT = 64
+
+    #: Number of neff evaluated at once, when scanning the
+    #: characteristic equation of a fiber with graded-index layers.
+    GRADEDCHUNK = 1024
+
+    def __init__(self, fiber):
+        super().__init__(fiber)
+        self._contexts = {}
+
     def __call__(self, wl, mode, delta, lowbound):
         wl = Wavelength(wl)
         if lowbound is None or isnan(lowbound):
-            pm = None
-            if mode.family is ModeFamily.HE:
-                if mode.m > 1:
-                    pm = Mode(ModeFamily.EH, mode.nu, mode.m - 1)
-            elif mode.family is ModeFamily.EH:
-                pm = Mode(ModeFamily.HE, mode.nu, mode.m)
-            elif mode.m > 1:
-                pm = Mode(mode.family, mode.nu, mode.m - 1)
-
-            if pm:
-                lowbound = self.fiber.neff(pm, wl, delta)
-                if isnan(lowbound):
-                    return lowbound
-            else:
-                lowbound = max(layer.maxIndex(wl)
-                               for layer in self.fiber.layers)
-
-            if mode.family is ModeFamily.LP and mode.nu > 0:
-                pm = Mode(mode.family, mode.nu - 1, mode.m)
-                lb = self.fiber.neff(pm, wl, delta)
-                if isnan(lb):
-                    return lb
-                lowbound = min(lowbound, lb)
-        # try:
-        #     # Use cutoff information if available
-        #     co = self.fiber.cutoff(mode)
-        #     if self.fiber.V0(wl) < co:
-        #         return float("nan")
-
-        #     nco = max(layer.maxIndex(wl) for layer in self.fiber.layers)
-        #     r = self.fiber.innerRadius(-1)
-
-        #     lowbound = min(lowbound, sqrt(nco**2 - (co / (r * wl.k0))**2))
-        # except (NotImplementedError):
-        #     pass
-        # if mode == Mode(ModeFamily.HE, 3, 1):
-        #     print('3', lowbound)
+            lowbound = self._lowbounds([wl], mode, delta)[0]
+        return float(self._solve([wl], mode, delta, [lowbound])[0])
 
-        highbound = self.fiber.minIndex(-1, wl)
+    def batch(self, wavelengths, mode, delta=1e-6):
+        """Effective index of a mode, at many wavelengths at once.
+
+        When all layers are step-index, the characteristic equation
+        is evaluated for all wavelengths simultaneously.
 
-        fct = {ModeFamily.LP: self._lpceq,
-               ModeFamily.TE: self._teceq,
-               ModeFamily.TM: self._tmceq,
-               ModeFamily.HE: self._heceq,
-               ModeFamily.EH: self._heceq
-               }
+        Args:
+            wavelengths(list): List of wavelengths
+            mode(Mode): Mode
+            delta(float): Step used to find sign changes of the
+                          characteristic equation.
 
-        if lowbound <= highbound:
-            print("impossible bound")
-            return float("nan")
+        Returns:
+            numpy.ndarray of effective indexes (nan if mode not found).
 
-        if (lowbound - highbound) < 10 * delta:
-            delta = (lowbound - highbound) / 10
+        """
+        wls = [Wavelength(wl) for wl in wavelengths]
+        return self._solve(wls, mode, delta,
+                           self._lowbounds(wls, mode, delta))
 
-        return self._findFirstRoot(fct[mode.family], args=(wl, mode.nu),
-                                   lowbound=lowbound-1e-15,
-                                   highbound=highbound+1e-15,
-                                   delta=-delta)
+    def solveAll(self, wl, family, nu, delta=1e-6):
+        """Effective index of all modes of given family and order.
+
+        The characteristic equation is scanned only once, from the
+        maximum index of the fiber down to the cladding index.
+
+        Args:
+            wl(Wavelength): Wavelength
+            family(ModeFamily): Mode family. HE and EH modes
+                                share the same equation, and both
+                                are returned for any hybrid family.
+            nu(int): Azimuthal order
+            delta(float): Step used to find sign changes of the
+                          characteristic equation.
+
+        Returns:
+            Dict {mode: neff}, for m = 1, 2, ...; the first mode not
+            found is included, with neff = nan.
+
+        """
+        wl = Wavelength(wl)
+        if family in (ModeFamily.HE, ModeFamily.HE_odd,
+                      ModeFamily.EH, ModeFamily.EH_odd):
+            families = (ModeFamily.HE, ModeFamily.EH)
+        else:
+            families = (family,)
+        mode = Mode(families[0], nu, 1)
+        fct = self._ceq(mode)
+
+        lowbound = max(layer.maxIndex(wl) for layer in self.fiber.layers)
+        highbound = self.fiber.minIndex(-1, wl)
+        neffs = []
+        if lowbound > highbound:
+            delta = min(delta, (lowbound - highbound) / self.NPOINTS)
+            lowbound -= 1e-15
+            highbound += 1e-15
+            if self._isVectorized(mode):
+                neffs = self._findAllRoots(fct, self._vceq(mode, [wl]),
+                                           (wl, nu), lowbound, highbound,
+                                           -delta)
+            else:
+                neff = self._findFirstRoot(fct, args=(wl, nu),
+                                           lowbound=lowbound,
+                                           highbound=highbound,
+                                           delta=-delta)
+                while not isnan(neff):
+                    neffs.append(neff)
+                    neff = self._findFirstRoot(fct, args=(wl, nu),
+                                               lowbound=neff-1e-15,
+                                               highbound=highbound,
+                                               delta=-delta)
+        neffs.append(float("nan"))
+
+        modes = {}
+        for i, neff in enumerate(neffs):
+            fam = families[i % len(families)]
+            modes[Mode(fam, nu, i // len(families) + 1)] = float(neff)
+        return modes
+
+    def solveBracket(self, wl, mode, nmin, nmax, npoints=8):
+        """Effective index of a mode, known to be between nmin and nmax.
+
+        This is used to follow a mode from a predicted effective index.
+        The bracket is sampled on npoints points, and the root is
+        returned only if it is the only one in the bracket.
+
+        Args:
+            wl(Wavelength): Wavelength
+            mode(Mode): Mode
+            nmin(float): Lower limit of the bracket.
+            nmax(float): Upper limit of the bracket.
+            npoints(int): Number of points used to sample the bracket.
+
+        Returns:
+            Effective index, or nan if there is no root, or more than one
+            root, in the bracket.
+
+        """
+        wl = Wavelength(wl)
+        fct = self._ceq(mode)
+        X = numpy.linspace(nmax, nmin, npoints)
+        if self._isVectorized(mode):
+            F = self._evaluate(self._vceq(mode, [wl]), X)
+        else:
+            F = numpy.array([fct(x, wl, mode.nu) for x in X])
+        roots = list(self._refineRoots(fct, (wl, mode.nu), X, F))
+        return float(roots[0]) if len(roots) == 1 else float("nan")
+
+    def _lowbounds(self, wls, mode, delta):
+        """Upper limit of neff (from previous mode), for each wavelength."""
+        pm = None
+        if mode.family is ModeFamily.HE:
+            if mode.m > 1:
+                pm = Mode(ModeFamily.EH, mode.nu, mode.m - 1)
+        elif mode.family is ModeFamily.EH:
+            pm = Mode(ModeFamily.HE, mode.nu, mode.m)
+        elif mode.m > 1:
+            pm = Mode(mode.family, mode.nu, mode.m - 1)
+
+        if pm:
+            lowbounds = self.fiber.neffs(pm, wls, delta)
+        else:
+            lowbounds = numpy.array([max(layer.maxIndex(wl)
+                                         for layer in self.fiber.layers)
+                                     for wl in wls])
+
+        if mode.family is ModeFamily.LP and mode.nu > 0:
+            pm = Mode(mode.family, mode.nu - 1, mode.m)
+            lowbounds = numpy.minimum(lowbounds,
+                                      self.fiber.neffs(pm, wls, delta))
+        return lowbounds
+
+    def _ceq(self, mode):
+        if self._isStepIndex():
+            return {ModeFamily.LP: self._lpceqp,
+                    ModeFamily.TE: self._teceqp,
+                    ModeFamily.TM: self._tmceqp,
+                    ModeFamily.HE: self._heceqp,
+                    ModeFamily.EH: self._heceqp
+                    }[mode.family]
+        return {ModeFamily.LP: self._lpceq,
+                ModeFamily.TE: self._teceq,
+                ModeFamily.TM: self._tmceq,
+                ModeFamily.HE: self._heceq,
+                ModeFamily.EH: self._heceq
+                }[mode.family]
+
+    def _ceqAlong(self, mode, neffs, wls):
+        if not self._isVectorized(mode):
+            return super()._ceqAlong(mode, neffs, wls)
+        with numpy.errstate(all='ignore'):
+            F = self._vceq(mode, wls)(numpy.reshape(neffs, (-1, 1)),
+                                      numpy.arange(len(wls)))
+        return F[:, 0]
+
+    def _solve(self, wls, mode, delta, lowbounds):
+        fct = self._ceq(mode)
+
+        neffs = numpy.empty(len(wls))
+        neffs.fill(numpy.nan)
+        rows, highbounds, deltas = [], [], []
+        for i, (wl, lowbound) in enumerate(zip(wls, lowbounds)):
+            if isnan(lowbound):
+                continue
+            highbound = self.fiber.minIndex(-1, wl)
+            if lowbound <= highbound:
+                self.logger.info("impossible bound")
+                continue
+            rows.append(i)
+            highbounds.append(highbound)
+            deltas.append(min(delta, (lowbound - highbound) / 10))
+        if not rows:
+            return neffs
+
+        args = [(wls[i], mode.nu) for i in rows]
+        lowbounds = numpy.asarray(lowbounds, dtype=float)[rows] - 1e-15
+        highbounds = numpy.array(highbounds) + 1e-15
+        deltas = -numpy.array(deltas)
+        if self._isVectorized(mode):
+            vfct = self._vceq(mode, [wls[i] for i in rows])
+            chunk = 128 if self._isStepIndex() else self.GRADEDCHUNK
+            neffs[rows] = self._findFirstRoots(fct, vfct, args, lowbounds,
+                                               highbounds, deltas, chunk)
+        else:
+            for i, a, lb, hb, d in zip(rows, args, lowbounds,
+                                       highbounds, deltas):
+                neffs[i] = self._findFirstRoot(fct, args=a, lowbound=lb,
+                                               highbound=hb, delta=d)
+        return neffs
 
     def _lpfield(self, wl, nu, neff, r):
+        r, idx = self._layerIndex(r)
         N = len(self.fiber)
         C = numpy.array((1, 0))
+        ex = numpy.empty(r.shape)
 
-        for i in range(1, N):
-            rho = self.fiber.innerRadius(i)
-            if r < rho:
-                layer = self.fiber.layers[i-1]
-                break
-            A = self.fiber.layers[i-1].Psi(rho, neff, wl, nu, C)
-            C = self.fiber.layers[i].lpConstants(rho, neff, wl, nu, A)
-        else:
-            layer = self.fiber.layers[-1]
-            u = layer.u(rho, neff, wl)
-            C = (0, A[0] / kn(nu, u))
+        for i, layer in enumerate(self.fiber.layers):
+            if i > 0:
+                rho = self.fiber.innerRadius(i)
+                A = self.fiber.layers[i-1].Psi(rho, neff, wl, nu, C)
+                if i < N-1:
+                    C = layer.lpConstants(rho, neff, wl, nu, A)
+                else:
+                    u = layer.u(rho, neff, wl)
+                    C = (0, A[0] / kn(nu, u))
+
+            sel = idx == i
+            if numpy.any(sel):
+                ex[sel] = self._psi(layer, r[sel], neff, wl, nu, C)
 
-        ex, _ = layer.Psi(r, neff, wl, nu, C)
         hy = neff * constants.Y0 * ex
 
-        return numpy.array((ex, 0, 0)), numpy.array((0, hy, 0))
+        z = numpy.zeros(r.shape)
+        return numpy.array((ex, z, z)), numpy.array((z, hy, z))
 
     def _tefield(self, wl, nu, neff, r):
-        pass
+        self._teceq(neff, wl, nu)
 
-    def _tmfield(self, wl, nu, neff, r):
-        N = len(self.fiber)
-        C = numpy.array((1, 0))
-        EH = numpy.zeros(4)
-        ri = 0
+        # Hz is continuous at the cladding interface
+        C = self.fiber.layers[-2].C
+        self.fiber.layers[-1].C = numpy.array((0, 0, 0, C[2] + C[3]))
 
-        for i in range(N-1):
-            ro = self.fiber.outerRadius(i)
-            layer = self.fiber.layers[i]
-            n = layer.maxIndex(wl)
-            u = layer.u(ro, neff, wl)
+        return self._fields(wl, nu, neff, r)
 
-            if i > 0:
-                C = layer.tetmConstants(ri, ro, neff, wl, EH,
-                                        constants.Y0 * n * n, (0, 3))
+    def _tmfield(self, wl, nu, neff, r):
+        self._tmceq(neff, wl, nu)
 
-            if r < ro:
-                break
+        # Ez is continuous at the cladding interface
+        C = self.fiber.layers[-2].C
+        self.fiber.layers[-1].C = numpy.array((0, C[0] + C[1], 0, 0))
 
-            if neff < n:
-                c1 = wl.k0 * ro / u
-                F3 = jvp(nu, u) / jn(nu, u)
-                F4 = yvp(nu, u) / yn(nu, u)
-            else:
-                c1 = -wl.k0 * ro / u
-                F3 = ivp(nu, u) / iv(nu, u)
-                F4 = kvp(nu, u) / kn(nu, u)
+        return self._fields(wl, nu, neff, r)
 
-            c4 = constants.Y0 * n * n * c1
+    def _hefield(self, wl, nu, neff, r):
+        self._heceq(neff, wl, nu)
+        return self._fields(wl, nu, neff, r)
 
-            EH[0] = C[0] + C[1]
-            EH[3] = c4 * (F3 * C[0] + F4 * C[1])
+    _ehfield = _hefield
+    _hofield = _hefield
+    _ehofield = _hefield
 
-            ri = ro
+    def _layerIndex(self, r):
+        """Index of the layer containing each radial position."""
+        r = numpy.asarray(r, dtype=float)
+        return r, numpy.searchsorted(self.fiber._r, r, side='right')
+
+    def _psi(self, layer, r, neff, wl, nu, C):
+        """Psi function of a step-index layer, for an array of radii."""
+        n = layer.maxIndex(wl)
+        u = wl.k0 * r * sqrt(abs(n*n - neff*neff))
+        if neff < n:
+            f1, f2 = jn, yn
         else:
-            layer = self.fiber.layers[-1]
-            u = layer.u(ro, neff, wl)
-            # C =
+            f1, f2 = iv, kn
 
-        return numpy.array((0, ephi, 0)), numpy.array((hr, 0, hz))
+        psi = C[0] * f1(nu, u) if C[0] else numpy.zeros(r.shape)
+        if C[1]:
+            psi += C[1] * f2(nu, u)
+        return psi
 
-    def _hefield(self, wl, nu, neff, r):
-        self._heceq(neff, wl, nu)
-        for i, rho in enumerate(self.fiber._r):
-            if r < rho:
-                break
-        else:
-            i += 1
+    def _fields(self, wl, nu, neff, r):
+        """E and H fields from the layer constants.
+
+        Constants must previously have been set by the
+        characteristic equation (layer.C).
+
+        """
+        r, idx = self._layerIndex(r)
+        E = numpy.empty((3,) + r.shape)
+        H = numpy.empty((3,) + r.shape)
+
+        for i, layer in enumerate(self.fiber.layers):
+            sel = idx == i
+            if not numpy.any(sel):
+                continue
+
+            C = layer.C
+            if C.ndim == 2:
+                C = C[:, 0] + C[:, 1] * self.alpha
+            E[:, sel], H[:, sel] = self._layerFields(i, wl, nu, neff,
+                                                     r[sel], C)
+
+        return E, H
+
+    def _layerFields(self, i, wl, nu, neff, r, C):
+        rho = self.fiber._r[min(i, len(self.fiber._r) - 1)]
         layer = self.fiber.layers[i]
         n = layer.maxIndex(wl)
         u = layer.u(rho, neff, wl)
@@ -164,7 +339,8 @@ class Neff(FiberSolver):
 
         c1 = rho / u
         c2 = wl.k0 * c1
-        c3 = nu * c1 / r if r else 0  # To avoid div by 0
+        # To avoid div by 0
+        c3 = numpy.divide(nu * c1, r, out=numpy.zeros(r.shape), where=r != 0)
         c6 = constants.Y0 * n * n
 
         if neff < n:
@@ -183,25 +359,24 @@ class Neff(FiberSolver):
             F3 = ivp(nu, urp) / B1
             F4 = kvp(nu, urp) / B2 if i > 0 else 0
 
-        A, B, Ap, Bp = layer.C[:, 0] + layer.C[:, 1] * self.alpha
+        A, B, Ap, Bp = C
 
         Ez = A * F1 + B * F2
         Ezp = A * F3 + B * F4
         Hz = Ap * F1 + Bp * F2
         Hzp = Ap * F3 + Bp * F4
 
-        if r == 0 and nu == 1:
+        c3ez = c3 * Ez
+        c3hz = c3 * Hz
+        if nu == 1:
             # Asymptotic expansion of Ez (or Hz):
             # J1(ur/p)/r (r->0) = u/(2p)
             if neff < n:
                 f = 1 / (2 * jn(nu, u))
             else:
                 f = 1 / (2 * iv(nu, u))
-            c3ez = A * f
-            c3hz = Ap * f
-        else:
-            c3ez = c3 * Ez
-            c3hz = c3 * Hz
+            c3ez[r == 0] = A * f
+            c3hz[r == 0] = Ap * f
 
         Er = c2 * (neff * Ezp - constants.eta0 * c3hz)
         Ep = c2 * (neff * c3ez - constants.eta0 * Hzp)
@@ -211,8 +386,6 @@ class Neff(FiberSolver):
 
         return numpy.array((Er, Ep, Ez)), numpy.array((Hr, Hp, Hz))
 
-    _ehfield = _hefield
-
     def _lpceq(self, neff, wl, nu):
         N = len(self.fiber)
         C = numpy.zeros((N-1, 2))
@@ -302,3 +475,398 @@ class Neff(FiberSolver):
         return E[0]*H[1] - E[1]*H[0]
 
     _ehceq = _heceq
+
+    def _isStepIndex(self):
+        return all(isinstance(layer, StepIndex)
+                   for layer in self.fiber.layers)
+
+    def _isVectorized(self, mode):
+        """Whether :py:meth:`_vceq` is available for mode.
+
+        LP modes are not supported in graded-index layers.
+
+        """
+        return self._isStepIndex() or mode.family is not ModeFamily.LP
+
+    def _context(self, wl):
+        """Prepared :py:class:`_Context` of the fiber at wl."""
+        try:
+            return self._contexts[wl]
+        except KeyError:
+            if len(self._contexts) >= self.NCONTEXT:
+                self._contexts.clear()
+            ctx = self._contexts[wl] = _Context(self.fiber, wl)
+            return ctx
+
+    def _lpceqp(self, neff, wl, nu):
+        """_lpceq for step-index layers, using prepared context."""
+        try:
+            return self._lpceqc(neff, self._context(wl), nu)
+        except ZeroDivisionError:
+            return float("inf")
+
+    def _lpceqc(self, neff, ctx, nu):
+        k0 = ctx.k0
+        neff2 = neff * neff
+        N = len(ctx.n)
+        C0, C1 = 1, 0
+        for i in range(N-1):
+            r = ctx.r[i]
+            u = k0 * r * sqrt(abs(ctx.n2[i] - neff2))
+            F1, F2, F3, F4 = _bessel1(nu, u, neff < ctx.n[i])
+
+            # Psi at the outer radius of the layer
+            if C1:
+                A0, A1 = C0 * F1 + C1 * F2, u * (C0 * F3 + C1 * F4)
+            else:
+                A0, A1 = C0 * F1, u * C0 * F3
+
+            if i < N-2:
+                u = k0 * r * sqrt(abs(ctx.n2[i+1] - neff2))
+                osc = neff < ctx.n[i+1]
+                F1, F2, F3, F4 = _bessel1(nu, u, osc)
+                W = constants.pi / 2 if osc else 1
+                C0, C1 = (W * (u * F4 * A0 - F2 * A1),
+                          W * (F1 * A1 - u * F3 * A0))
+
+        # Last layer
+        u = k0 * r * sqrt(abs(ctx.n2[-1] - neff2))
+        K = kn(nu, u)
+        Kp = -kn(nu-1, u) - nu / u * K
+        return u * Kp * A0 - K * A1
+
+    def _EHp(self, neff, wl, nu):
+        """Scalar version of :py:meth:`_EHv`, using prepared context.
+
+        Returns:
+            (E, H) tuples, as :py:meth:`_EHv`.
+
+        """
+        ctx = self._context(wl)
+        k0 = ctx.k0
+        neff2 = neff * neff
+        a = ctx.a
+        EH = ctx.EH
+        ri = 0
+
+        for i in range(len(ctx.n) - 1):
+            ro = ctx.r[i]
+            osc = neff < ctx.n[i]
+            kr = k0 * sqrt(abs(ctx.n2[i] - neff2))
+            u = kr * ro
+            B1, B2, B3, B4 = _bessel1(nu, u, osc)
+            c1 = (k0 if osc else -k0) * ro / u
+            c3 = constants.eta0 * c1
+            c4 = constants.Y0 * ctx.n2[i] * c1
+
+            if ri == 0:
+                # Ez = 1 (first column), Hz = 1 (second column)
+                C = ((1, 0), (0, 0), (0, 1), (0, 0))
+            else:
+                urp = kr * ri
+                F1, F2, F3, F4 = _bessel1(nu, urp, osc)
+                F1, F2, F3, F4 = F1 / B1, F2 / B2, F3 / B1, F4 / B2
+                c2 = neff * nu / urp * c1
+
+                a[0, 0] = F1
+                a[0, 1] = F2
+                a[1, 2] = F1
+                a[1, 3] = F2
+                a[2, 0] = F1 * c2
+                a[2, 1] = F2 * c2
+                a[2, 2] = -F3 * c3
+                a[2, 3] = -F4 * c3
+                a[3, 0] = F3 * c4
+                a[3, 1] = F4 * c4
+                a[3, 2] = -F1 * c2
+                a[3, 3] = -F2 * c2
+                C = numpy.linalg.solve(a, EH).tolist()
+
+            F3 = B3 / B1
+            F4 = B4 / B2
+            c2 = neff * nu / u * c1
+            for j in range(2):
+                C0, C1, C2, C3 = C[0][j], C[1][j], C[2][j], C[3][j]
+                EH[0, j] = C0 + C1
+                EH[1, j] = C2 + C3
+                EH[2, j] = c2 * (C0 + C1) - c3 * (F3 * C2 + F4 * C3)
+                EH[3, j] = c4 * (F3 * C0 + F4 * C1) - c2 * (C2 + C3)
+            ri = ro
+
+        # Last layer
+        u = k0 * ri * sqrt(abs(ctx.n2[-1] - neff2))
+        K = kn(nu, u)
+        F4 = (-kn(nu-1, u) - nu / u * K) / K
+        c1 = -k0 * ri / u
+        c2 = neff * nu / u * c1
+        c3 = constants.eta0 * c1
+        c4 = constants.Y0 * ctx.n2[-1] * c1
+
+        (Ez0, Ez1), (Hz0, Hz1), (Ep0, Ep1), (Hp0, Hp1) = EH.tolist()
+        return ((Ep0 - (c2 * Ez0 - c3 * F4 * Hz0),
+                 Ep1 - (c2 * Ez1 - c3 * F4 * Hz1)),
+                (Hp0 - (c4 * F4 * Ez0 - c2 * Hz0),
+                 Hp1 - (c4 * F4 * Ez1 - c2 * Hz1)))
+
+    def _teceqp(self, neff, wl, nu):
+        """_teceq for step-index layers, using prepared context."""
+        try:
+            return self._EHp(neff, wl, nu)[0][1]
+        except (ZeroDivisionError, LinAlgError):
+            return float("inf")
+
+    def _tmceqp(self, neff, wl, nu):
+        """_tmceq for step-index layers, using prepared context."""
+        try:
+            return self._EHp(neff, wl, nu)[1][0]
+        except (ZeroDivisionError, LinAlgError):
+            return float("inf")
+
+    def _heceqp(self, neff, wl, nu):
+        """_heceq for step-index layers, using prepared context."""
+        try:
+            E, H = self._EHp(neff, wl, nu)
+        except (ZeroDivisionError, LinAlgError):
+            return float("inf")
+        return E[0]*H[1] - E[1]*H[0]
+
+    def _vceq(self, mode, wls):
+        """Vectorized characteristic equation.
+
+        Returns a function of (X, rows), where X is an array of neff,
+        and rows the indexes (in wls) of the wavelengths of each row of X.
+
+        """
+        contexts = [self._context(wl) for wl in wls]
+        k0 = numpy.array([ctx.k0 for ctx in contexts])[:, numpy.newaxis]
+        n = numpy.array([ctx.n for ctx in contexts])
+        nu = mode.nu
+
+        if not self._isStepIndex():
+            # Graded-index layers are integrated one wavelength at a time
+            def vfct(X, rows):
+                F = numpy.empty(X.shape)
+                for j, i in enumerate(rows):
+                    E, H = self._EHv(X[j:j+1], k0[i:i+1], n[i:i+1], nu,
+                                     wls[i])
+                    if mode.family is ModeFamily.TE:
+                        F[j] = E[1][0]
+                    elif mode.family is ModeFamily.TM:
+                        F[j] = H[0][0]
+                    else:
+                        F[j] = (E[0]*H[1] - E[1]*H[0])[0]
+                return F
+            return vfct
+
+        if mode.family is ModeFamily.LP:
+            return lambda X, rows: self._lpceqv(X, k0[rows], n[rows], nu)
+        elif mode.family is ModeFamily.TE:
+            return lambda X, rows: self._EHv(X, k0[rows], n[rows], nu)[0][1]
+        elif mode.family is ModeFamily.TM:
+            return lambda X, rows: self._EHv(X, k0[rows], n[rows], nu)[1][0]
+        else:
+            return lambda X, rows: self._heceqv(X, k0[rows], n[rows], nu)
+
+    def _lpceqv(self, neff, k0, n, nu):
+        """Vectorized _lpceq.
+
+        Args:
+            neff(array): Effective indexes
+            k0(array): Wavenumber, broadcastable to neff.
+            n(array): Layer indexes (last axis), for each row of neff.
+            nu(int): Azimuthal order
+
+        """
+        N = len(self.fiber)
+        C = (1, 0)
+        for i in range(N-1):
+            r = self.fiber.outerRadius(i)
+            ni = n[:, i:i+1]
+            u = k0 * r * numpy.sqrt(numpy.abs(ni*ni - neff*neff))
+            F1, F2, F3, F4 = _bessel(nu, u, neff < ni)
+
+            # Psi at the outer radius of the layer
+            if i == 0:
+                A = (C[0] * F1, u * C[0] * F3)
+            else:
+                A = (C[0] * F1 + C[1] * F2, u * (C[0] * F3 + C[1] * F4))
+
+            if i < N-2:
+                ni = n[:, i+1:i+2]
+                u = k0 * r * numpy.sqrt(numpy.abs(ni*ni - neff*neff))
+                osc = neff < ni
+                F1, F2, F3, F4 = _bessel(nu, u, osc)
+                W = numpy.where(osc, constants.pi / 2, 1)
+                C = (W * (u * F4 * A[0] - F2 * A[1]),
+                     W * (F1 * A[1] - u * F3 * A[0]))
+
+        # Last layer
+        ni = n[:, -1:]
+        u = k0 * r * numpy.sqrt(numpy.abs(ni*ni - neff*neff))
+        K = kn(nu, u)
+        return u * (-kn(nu-1, u) - nu / u * K) * A[0] - K * A[1]
+
+    def _EHv(self, neff, k0, n, nu, wl=None):
+        """Vectorized computation of E and H at the cladding interface.
+
+        Fields are computed for both solutions (Ez = 1 and Hz = 1 at
+        the center). Arguments are the same as for :py:meth:`_lpceqv`.
+        Fields in graded-index layers are integrated by the layer
+        (see :py:meth:`~fibermodes.fiber.geometry.SuperGaussian.propagate`);
+        wl then is the wavelength of the (single) row of neff.
+
+        Returns:
+            (E, H) where E[i] and H[i] are the combinations of the
+            fields in the cladding, for solution i. When nu is 0,
+            E[1] is the TE characteristic equation, and H[0] the
+            TM characteristic equation.
+
+        """
+        N = len(self.fiber)
+        shape = neff.shape
+        EH = numpy.zeros(shape + (4, 2))
+        ri = 0
+
+        for i in range(N-1):
+            ro = self.fiber.outerRadius(i)
+            layer = self.fiber.layers[i]
+            if not isinstance(layer, StepIndex):
+                EH = layer.propagate(nu, neff, wl, EH if ri else None)
+                ri = ro
+                continue
+            ni = n[:, i:i+1]
+            osc = neff < ni
+            kr = k0 * numpy.sqrt(numpy.abs(ni*ni - neff*neff))
+            u = kr * ro
+            B1, B2, B3, B4 = _bessel(nu, u, osc)
+            c1 = numpy.where(osc, 1, -1) * k0 * ro / u
+            c3 = constants.eta0 * c1
+            c4 = constants.Y0 * ni * ni * c1
+
+            if ri == 0:
+                C = numpy.zeros(shape + (4, 2))
+                C[..., 0, 0] = 1  # Ez = 1
+                C[..., 2, 1] = 1  # Hz = 1
+            else:
+                urp = kr * ri
+                F1, F2, F3, F4 = _bessel(nu, urp, osc)
+                F1, F2, F3, F4 = F1 / B1, F2 / B2, F3 / B1, F4 / B2
+                c2 = neff * nu / urp * c1
+
+                a = numpy.zeros(shape + (4, 4))
+                a[..., 0, 0] = F1
+                a[..., 0, 1] = F2
+                a[..., 1, 2] = F1
+                a[..., 1, 3] = F2
+                a[..., 2, 0] = F1 * c2
+                a[..., 2, 1] = F2 * c2
+                a[..., 2, 2] = -F3 * c3
+                a[..., 2, 3] = -F4 * c3
+                a[..., 3, 0] = F3 * c4
+                a[..., 3, 1] = F4 * c4
+                a[..., 3, 2] = -F1 * c2
+                a[..., 3, 3] = -F2 * c2
+                C = _solve(a, EH)
+
+            F3 = (B3 / B1)[..., numpy.newaxis]
+            F4 = (B4 / B2)[..., numpy.newaxis]
+            c2 = (neff * nu / u * c1)[..., numpy.newaxis]
+            c3 = c3[..., numpy.newaxis]
+            c4 = c4[..., numpy.newaxis]
+
+            EH = numpy.empty(shape + (4, 2))
+            EH[..., 0, :] = C[..., 0, :] + C[..., 1, :]
+            EH[..., 1, :] = C[..., 2, :] + C[..., 3, :]
+            EH[..., 2, :] = (c2 * (C[..., 0, :] + C[..., 1, :]) -
+                             c3 * (F3 * C[..., 2, :] + F4 * C[..., 3, :]))
+            EH[..., 3, :] = (c4 * (F3 * C[..., 0, :] + F4 * C[..., 1, :]) -
+                             c2 * (C[..., 2, :] + C[..., 3, :]))
+            ri = ro
+
+        # Last layer
+        ni = n[:, -1:]
+        u = k0 * ri * numpy.sqrt(numpy.abs(ni*ni - neff*neff))
+        K = kn(nu, u)
+        F4 = (-kn(nu-1, u) - nu / u * K) / K
+        c1 = -k0 * ri / u
+        c2 = neff * nu / u * c1
+        c3 = constants.eta0 * c1
+        c4 = constants.Y0 * ni * ni * c1
+
+        E = [EH[..., 2, j] - (c2 * EH[..., 0, j] - c3 * F4 * EH[..., 1, j])
+             for j in range(2)]
+        H = [EH[..., 3, j] - (c4 * F4 * EH[..., 0, j] - c2 * EH[..., 1, j])
+             for j in range(2)]
+        return E, H
+
+    def _heceqv(self, neff, k0, n, nu):
+        """Vectorized _heceq (see :py:meth:`_lpceqv` for arguments)."""
+        E, H = self._EHv(neff, k0, n, nu)
+        return E[0]*H[1] - E[1]*H[0]
+
+
+class _Context(object):
+
+    """Parameters of a step-index fiber at a given wavelength.
+
+    Radii, layer indexes and wavenumber are fetched once, and work
+    buffers are allocated once, so that characteristic equations
+    can be evaluated many times, for different neff.
+
+    """
+
+    def __init__(self, fiber, wl):
+        self.k0 = Wavelength(wl).k0
+        self.r = [fiber.outerRadius(i) for i in range(len(fiber) - 1)]
+        self.n = [layer.maxIndex(wl) for layer in fiber.layers]
+        self.n2 = [n * n for n in self.n]
+        self.a = numpy.zeros((4, 4))
+        self.EH = numpy.empty((4, 2))
+
+
+def _bessel1(nu, x, osc):
+    """Scalar version of :py:func:`_bessel`."""
+    if osc:
+        f1, f2, s2 = jn, yn, 1
+    else:
+        f1, f2, s2 = iv, kn, -1
+    F1 = f1(nu, x)
+    F2 = f2(nu, x)
+    c = nu / x if nu else 0
+    return F1, F2, f1(nu-1, x) - c * F1, s2 * f2(nu-1, x) - c * F2
+
+
+def _bessel(nu, x, osc):
+    """(J, Y, J', Y') where osc is True, (I, K, I', K') elsewhere.
+
+    Derivatives are computed from recurrence relations, e.g.
+    J'(nu, x) = J(nu-1, x) - nu / x * J(nu, x).
+
+    """
+    osc = numpy.broadcast_to(osc, x.shape)
+    F = numpy.empty((4,) + x.shape)
+    for sel, f1, f2, s2 in ((osc, jn, yn, 1), (~osc, iv, kn, -1)):
+        xs = x[sel]
+        c = nu / xs if nu else 0
+        F[0, sel] = f1(nu, xs)
+        F[1, sel] = f2(nu, xs)
+        F[2, sel] = f1(nu-1, xs) - c * F[0, sel]
+        F[3, sel] = s2 * f2(nu-1, xs) - c * F[1, sel]
+    return F
+
+
+def _solve(a, b):
+    """Solve stacked linear systems, giving nan for singular ones."""
+    bad = ~numpy.all(numpy.isfinite(a), axis=(-2, -1))
+    a[bad] = numpy.eye(a.shape[-1])
+    try:
+        x = numpy.linalg.solve(a, b)
+    except numpy.linalg.LinAlgError:
+        x = numpy.empty(b.shape)
+        for idx in numpy.ndindex(a.shape[:-2]):
+            try:
+                x[idx] = numpy.linalg.solve(a[idx], b[idx])
+            except numpy.linalg.LinAlgError:
+                bad[idx] = True
+    x[bad] = numpy.nan
+    return x
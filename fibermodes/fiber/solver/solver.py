@@ -13,9 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
 
+from fibermodes import Wavelength
 from itertools import count
+from math import factorial
+from numpy.polynomial import chebyshev
 from scipy.optimize import brentq
 import logging
+import numpy
 
 
 class FiberSolver(object):
@@ -33,6 +37,65 @@ class FiberSolver(object):
     def __call__(self, *args, **kwargs):
         raise NotImplementedError()
 
+    def _ceq(self, mode):
+        """Characteristic function of the mode, as fct(neff, wl, nu)."""
+        raise NotImplementedError()
+
+    def _ceqAlong(self, mode, neffs, wls):
+        """Characteristic function evaluated at points (neffs[i], wls[i])."""
+        fct = self._ceq(mode)
+        return numpy.array([fct(neff, wl, mode.nu)
+                            for neff, wl in zip(neffs, wls)])
+
+    def _neffDerivatives(self, wl, mode, neff, order=3, rho=1e-3,
+                         npoints=10):
+        """Derivatives of neff with respect to omega.
+
+        The characteristic equation F(neff, omega) = 0 is differentiated
+        implicitly. With omega = omega0 (1 + tau), the coefficients of
+        neff(tau) = neff + c1 tau + c2 tau^2 + ... are found such that
+        F(neff(tau), omega) = O(tau^(order+1)), using values of F
+        sampled along the curve at Chebyshev nodes (abs(tau) <= rho).
+        Material dispersion is included, since F uses the indexes of
+        the layers at each wavelength.
+
+        Args:
+            wl(Wavelength): Wavelength
+            mode(Mode): Mode
+            neff(float): Effective index of the mode at wl.
+            order(int): Maximum order of derivative.
+            rho(float): Relative half width of the sampling interval.
+            npoints(int): Number of sampling points.
+
+        Returns:
+            List [neff, dneff/domega, ..., d^order neff / domega^order],
+            or None if F is not smooth around the root.
+
+        """
+        fct = self._ceq(mode)
+        omega = Wavelength(wl).omega
+        x = numpy.cos(numpy.pi * (numpy.arange(npoints) + 0.5) / npoints)
+        tau = rho * x
+        wls = [Wavelength(omega=omega * (1 + t)) for t in tau]
+
+        s = 1e-9 * neff
+        fn = (fct(neff + s, wl, mode.nu) - fct(neff - s, wl, mode.nu)) / (2*s)
+
+        c = numpy.zeros(order + 1)
+        c[0] = neff
+        for i in range(order + 2):
+            G = self._ceqAlong(mode, numpy.polyval(c[::-1], tau), wls)
+            a = chebyshev.chebfit(x, G, npoints - 1)
+            if i == 0 and (abs(a[-2:]).max() > 1e-6 * abs(a).max() or
+                           not numpy.all(numpy.isfinite(a))):
+                self.logger.info("_neffDerivatives: F not smooth enough")
+                return None
+            g = chebyshev.cheb2poly(a)[1:order+1] / rho**numpy.arange(
+                1, order + 1)
+            c[1:] -= g / fn
+
+        return [c[k] * factorial(k) / omega**k for k in range(order + 1)]
+
     def start_log(self):
         self.log = []
         self._logging = True
@@ -92,6 +155,112 @@ class FiberSolver(object):
                             maxiter, lowbound, highbound))
         return float("nan")
 
+    def _findFirstRoots(self, fct, vfct, args, lowbounds, highbounds,
+                        deltas, chunk=128):
+        """Vectorized version of :py:meth:`_findFirstRoot`.
+
+        Each row (e.g. each wavelength) is a separate root finding
+        problem. The characteristic function is evaluated on a grid of
+        points, from lowbound toward highbound, for all rows at once,
+        using vfct. Sign changes are then refined with brentq, using
+        the scalar function fct.
+
+        Args:
+            fct: Scalar function, called as fct(x, *args[i]) for row i.
+            vfct: Vectorized function, called as vfct(X, rows), where X
+                  is a (len(rows), n) array of points, and rows the
+                  indexes of the rows of X.
+            args(list): Arguments of fct, for each row.
+            lowbounds(array): Starting point, for each row.
+            highbounds(array): Limit of the search, for each row.
+            deltas(array): Step of the grid, for each row.
+            chunk(int): Number of grid points evaluated at once.
+
+        Returns:
+            Array with the first root of each row (nan if not found).
+
+        """
+        fct = self.__record(fct)  # For debug purpose.
+        lowbounds = numpy.asarray(lowbounds, dtype=float)
+        highbounds = numpy.asarray(highbounds, dtype=float)
+        deltas = numpy.array(deltas, dtype=float)
+        roots = numpy.empty(lowbounds.size)
+        roots.fill(numpy.nan)
+
+        start = numpy.zeros(lowbounds.size, dtype=int)
+        rows = numpy.arange(lowbounds.size)
+        while rows.size:
+            k = start[rows, numpy.newaxis] + numpy.arange(chunk + 1)
+            X = (lowbounds[rows, numpy.newaxis] +
+                 deltas[rows, numpy.newaxis] * k)
+            out = ((X - highbounds[rows, numpy.newaxis]) *
+                   numpy.sign(deltas[rows, numpy.newaxis]) > 0)
+            with numpy.errstate(all='ignore'):
+                F = vfct(X, rows)
+            F[out] = numpy.nan
+
+            todo = []
+            for j, i in enumerate(rows):
+                z = self._refineFirstRoot(fct, args[i], X[j], F[j])
+                if z is not None:
+                    roots[i] = z
+                elif not out[j, -1]:
+                    start[i] += chunk
+                    todo.append(i)
+                elif (highbounds[i] - lowbounds[i]) / deltas[i] < 100:
+                    deltas[i] /= 10
+                    start[i] = 0
+                    todo.append(i)
+                else:
+                    self.logger.info("maxiter reached ({}, {})".format(
+                                     lowbounds[i], highbounds[i]))
+            rows = numpy.array(todo, dtype=int)
+        return roots
+
+    def _findAllRoots(self, fct, vfct, args, lowbound, highbound, delta):
+        """Find all roots of fct between lowbound and highbound.
+
+        The characteristic function is evaluated on a grid of points,
+        with step delta, using vectorized function vfct (see
+        :py:meth:`_findFirstRoots`). Each sign change then is refined
+        with brentq, using the scalar function fct.
+
+        Returns:
+            List of roots, ordered from lowbound to highbound.
+
+        """
+        fct = self.__record(fct)  # For debug purpose.
+        npoints = int((highbound - lowbound) / delta) + 1
+        X = lowbound + delta * numpy.arange(npoints)
+        return list(self._refineRoots(fct, args, X, self._evaluate(vfct, X)))
+
+    def _evaluate(self, vfct, X, chunk=4096):
+        """Evaluate vfct on the points of 1-D array X, chunk by chunk."""
+        rows = numpy.zeros(1, dtype=int)
+        F = numpy.empty(X.size)
+        with numpy.errstate(all='ignore'):
+            for i in range(0, X.size, chunk):
+                F[i:i+chunk] = vfct(X[numpy.newaxis, i:i+chunk], rows)[0]
+        return F
+
+    def _refineFirstRoot(self, fct, args, X, F):
+        """First root of fct, from values F evaluated on grid X."""
+        return next(self._refineRoots(fct, args, X, F), None)
+
+    def _refineRoots(self, fct, args, X, F):
+        """Roots of fct, from values F evaluated on grid X."""
+        for a, b, fa, fb in zip(X[:-1], X[1:], F[:-1], F[1:]):
+            if fa == 0:
+                yield a
+            elif (fa > 0 and fb < 0) or (fa < 0 and fb > 0):
+                try:
+                    z = brentq(fct, a, b, args=args, xtol=1e-20)
+                except ValueError:
+                    continue  # sign change not confirmed by fct
+                fz = fct(z, *args)
+                if abs(fa) > abs(fz) < abs(fb):  # Skip discontinuities
+                    yield z
+
     def _findBetween(self, fct, lowbound, highbound, args=(), maxj=15):
         fct = self.__record(fct)  # For debug purpose.
         v = [lowbound, highbound]
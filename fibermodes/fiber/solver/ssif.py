@@ -17,8 +17,9 @@ from .solver import FiberSolver
 from fibermodes import Mode, ModeFamily
 from math import sqrt, isnan, isinf
 import numpy
-from scipy.special import jn, jn_zeros, kn, j0, j1, k0, k1, jvp, kvp
+from scipy.special import jn, kn, j0, j1, k0, k1, jvp, kvp
 from fibermodes.constants import Y0
+from fibermodes.functions import besselZeros
 import logging
 
 
@@ -44,7 +45,7 @@ class Cutoff(FiberSolver):
             else:
                 return self._findHEcutoff(mode)
 
-        return jn_zeros(nu, m)[m-1]
+        return besselZeros(nu, m)[m-1]
 
     def _cutoffHE(self, V0, nu):
         wl = self.fiber.toWl(V0)
@@ -62,8 +63,8 @@ class Cutoff(FiberSolver):
             lowbound += delta
         else:
             lowbound = delta = self._MCD
-        ipoints = numpy.concatenate((jn_zeros(mode.nu, mode.m),
-                                     jn_zeros(mode.nu-2, mode.m)))
+        ipoints = numpy.concatenate((besselZeros(mode.nu, mode.m),
+                                     besselZeros(mode.nu-2, mode.m)))
         ipoints.sort()
         ipoints = list(ipoints[ipoints > lowbound])
         co = self._findFirstRoot(self._cutoffHE,
@@ -113,18 +114,19 @@ class Neff(FiberSolver):
         except ValueError:
             lowbound = nco
 
-        fct = {ModeFamily.LP: self._lpceq,
-               ModeFamily.TE: self._teceq,
-               ModeFamily.TM: self._tmceq,
-               ModeFamily.HE: self._heceq,
-               ModeFamily.EH: self._ehceq,
-               ModeFamily.HE_odd: self._hoceq,
-               ModeFamily.EH_odd: self._ehoceq              # HERE
-               }
-
-        return self._findBetween(fct[mode.family], lowbound, highbound,
+        return self._findBetween(self._ceq(mode), lowbound, highbound,
                                  args=(wl, mode.nu))
 
+    def _ceq(self, mode):
+        return {ModeFamily.LP: self._lpceq,
+                ModeFamily.TE: self._teceq,
+                ModeFamily.TM: self._tmceq,
+                ModeFamily.HE: self._heceq,
+                ModeFamily.EH: self._ehceq,
+                ModeFamily.HE_odd: self._hoceq,
+                ModeFamily.EH_odd: self._ehoceq
+                }[mode.family]
+
     def _lpfield(self, wl, nu, neff, r):
         rho = self.fiber.outerRadius(0)
         k = wl.k0
@@ -133,13 +135,14 @@ class Neff(FiberSolver):
         u = rho * k * sqrt(nco2 - neff**2)
         w = rho * k * sqrt(neff**2 - ncl2)
 
-        if r < rho:
-            ex = j0(u * r / rho) / j0(u)
-        else:
-            ex = k0(w * r / rho) / k0(w)
+        r, core, clad = self._regions(r)
+        ex = numpy.empty(r.shape)
+        ex[core] = j0(u * r[core] / rho) / j0(u)
+        ex[clad] = k0(w * r[clad] / rho) / k0(w)
         hy = neff * Y0 * ex  # Snyder & Love uses nco, but Bures uses neff
 
-        return numpy.array((ex, 0, 0)), numpy.array((0, hy, 0))
+        z = numpy.zeros(r.shape)
+        return numpy.array((ex, z, z)), numpy.array((z, hy, z))
 
     def _tefield(self, wl, nu, neff, r):
         rho = self.fiber.outerRadius(0)
@@ -149,15 +152,19 @@ class Neff(FiberSolver):
         u = rho * k * sqrt(nco2 - neff**2)
         w = rho * k * sqrt(neff**2 - ncl2)
 
-        if r < rho:
-            hz = -Y0 * u / (k * rho) * j0(u * r / rho) / j1(u)
-            ephi = -j1(u * r / rho) / j1(u)
-        else:
-            hz = Y0 * w / (k * rho) * k0(w * r / rho) / k1(w)
-            ephi = -k1(w * r / rho) / k1(w)
+        r, core, clad = self._regions(r)
+        hz = numpy.empty(r.shape)
+        ephi = numpy.empty(r.shape)
+        ur = u * r[core] / rho
+        wr = w * r[clad] / rho
+        hz[core] = -Y0 * u / (k * rho) * j0(ur) / j1(u)
+        ephi[core] = -j1(ur) / j1(u)
+        hz[clad] = Y0 * w / (k * rho) * k0(wr) / k1(w)
+        ephi[clad] = -k1(wr) / k1(w)
         hr = -neff * Y0 * ephi
 
-        return numpy.array((0, ephi, 0)), numpy.array((hr, 0, hz))
+        z = numpy.zeros(r.shape)
+        return numpy.array((z, ephi, z)), numpy.array((hr, z, hz))
 
     def _tmfield(self, wl, nu, neff, r):
         rho = self.fiber.outerRadius(0)
@@ -167,16 +174,21 @@ class Neff(FiberSolver):
         u = rho * k * sqrt(nco2 - neff**2)
         w = rho * k * sqrt(neff**2 - ncl2)
 
-        if r < rho:
-            ez = -u / (k * neff * rho) * j0(u * r / rho) / j1(u)
-            er = j1(u * r / rho) / j1(u)
-            hphi = Y0 * nco2 / neff * er
-        else:
-            ez = nco2 / ncl2 * w / (k * neff * rho) * k0(w * r / rho) / k1(w)
-            er = nco2 / ncl2 * k1(w * r / rho) / k1(w)
-            hphi = Y0 * nco2 / ncl2 * k1(w * r / rho) / k1(w)
-
-        return numpy.array((er, 0, ez)), numpy.array((0, hphi, 0))
+        r, core, clad = self._regions(r)
+        ez = numpy.empty(r.shape)
+        er = numpy.empty(r.shape)
+        hphi = numpy.empty(r.shape)
+        ur = u * r[core] / rho
+        wr = w * r[clad] / rho
+        ez[core] = -u / (k * neff * rho) * j0(ur) / j1(u)
+        er[core] = j1(ur) / j1(u)
+        hphi[core] = Y0 * nco2 / neff * er[core]
+        ez[clad] = nco2 / ncl2 * w / (k * neff * rho) * k0(wr) / k1(w)
+        er[clad] = nco2 / ncl2 * k1(wr) / k1(w)
+        hphi[clad] = Y0 * nco2 / ncl2 * k1(wr) / k1(w)
+
+        z = numpy.zeros(r.shape)
+        return numpy.array((er, z, ez)), numpy.array((z, hphi, z))
 
     def _f1(self, wl, nu, neff):
         rho = self.fiber.outerRadius(0)
@@ -220,33 +232,51 @@ class Neff(FiberSolver):
         a5 = (F1 - 1 + 2 * Delta) / 2
         a6 = (F1 + 1 - 2 * Delta) / 2
 
-        if r < rho:
-            jmur = jn(nu-1, u * r / rho)
-            jpur = jn(nu+1, u * r / rho)
-            jnur = jn(nu, u * r / rho)
-            er = -(a1 * jmur + a2 * jpur) / jnu
-            ephi = -(a1 * jmur - a2 * jpur) / jnu
-            ez = u / (k * neff * rho) * jnur / jnu
-            hr = Y0 * nco2 / neff * (a3 * jmur - a4 * jpur) / jnu
-            hphi = -Y0 * nco2 / neff * (a3 * jmur + a4 * jpur) / jnu
-            hz = Y0 * u * F2 / (k * rho) * jnur / jnu
-        else:
-            kmur = kn(nu-1, w * r / rho)
-            kpur = kn(nu+1, w * r / rho)
-            knur = kn(nu, w * r / rho)
-            er = -u / w * (a1 * kmur - a2 * kpur) / knw
-            ephi = -u / w * (a1 * kmur + a2 * kpur) / knw
-            ez = u / (k * neff * rho) * knur / knw
-            hr = Y0 * nco2 / neff * u / w * (a5 * kmur + a6 * kpur) / knw
-            hphi = -Y0 * nco2 / neff * u / w * (a5 * kmur - a6 * kpur) / knw
-            hz = Y0 * u * F2 / (k * rho) * knur / knw
-
-        return numpy.array((er, ephi, ez)), numpy.array((hr, hphi, hz))
+        r, core, clad = self._regions(r)
+        E = numpy.empty((3,) + r.shape)
+        H = numpy.empty((3,) + r.shape)
+
+        ur = u * r[core] / rho
+        jmur = jn(nu-1, ur)
+        jpur = jn(nu+1, ur)
+        jnur = jn(nu, ur)
+        E[0, core] = -(a1 * jmur + a2 * jpur) / jnu
+        E[1, core] = -(a1 * jmur - a2 * jpur) / jnu
+        E[2, core] = u / (k * neff * rho) * jnur / jnu
+        H[0, core] = Y0 * nco2 / neff * (a3 * jmur - a4 * jpur) / jnu
+        H[1, core] = -Y0 * nco2 / neff * (a3 * jmur + a4 * jpur) / jnu
+        H[2, core] = Y0 * u * F2 / (k * rho) * jnur / jnu
+
+        wr = w * r[clad] / rho
+        kmur = kn(nu-1, wr)
+        kpur = kn(nu+1, wr)
+        knur = kn(nu, wr)
+        E[0, clad] = -u / w * (a1 * kmur - a2 * kpur) / knw
+        E[1, clad] = -u / w * (a1 * kmur + a2 * kpur) / knw
+        E[2, clad] = u / (k * neff * rho) * knur / knw
+        H[0, clad] = Y0 * nco2 / neff * u / w * (a5 * kmur + a6 * kpur) / knw
+        H[1, clad] = (-Y0 * nco2 / neff * u / w *
+                      (a5 * kmur - a6 * kpur) / knw)
+        H[2, clad] = Y0 * u * F2 / (k * rho) * knur / knw
+
+        return E, H
 
     _ehfield = _hefield
     _hofield = _hefield
     _ehofield = _hefield
 
+    def _regions(self, r):
+        """Split radial positions between core and cladding.
+
+        Field functions accept either a scalar or an array of radial
+        positions. Returned masks can be used to evaluate core and
+        cladding expressions only where they apply.
+
+        """
+        r = numpy.asarray(r, dtype=float)
+        core = r < self.fiber.outerRadius(0)
+        return r, core, ~core
+
     def _uw(self, wl, neff):
         r = self.fiber.outerRadius(0)
         rk0 = r * wl.k0
@@ -316,23 +346,10 @@ class Neff(FiberSolver):
         w2 = w ** 2
         v = rho * k * sqrt(nco2 - ncl2)
 
-
         jnu = jn(nu, u)
         jnu2 = jnu ** 2
-        jmur = jn(nu - 1, u * r / rho)
-        jmur2 = jmur ** 2
-        jpur = jn(nu + 1, u * r / rho)
-        jpur2 = jpur ** 2
         knw = kn(nu, w)
         knw2 = knw ** 2
-        kmur = kn(nu - 1, w * r / rho)
-        kmur2 = kmur ** 2
-        kpur = kn(nu + 1, w * r / rho)
-        kpur2 = kpur ** 2
-        k1wr = k1(w * r / rho)
-        k1w = k1(w)
-        j1ur = j1(u * r / rho)
-        j1u = j1(u)
 
         Delta = (1 - ncl2 / nco2) / 2
         b1 = jvp(nu, u) / (u * jnu)
@@ -346,11 +363,24 @@ class Neff(FiberSolver):
         a5 = (F1 - 1 + 2 * Delta) / 2
         a6 = (F1 + 1 - 2 * Delta) / 2
 
-        if r > rho:
-            pz = ((1**2) / 2 * Y0) * ((nco2 * u2)/(neff * knw2 * w2)) * ((a1 * a5 * kmur2) + (a2 * a6 * kpur2) + (((1 - 2 * Delta - F1 * F2)/2) * kmur * kpur))
-        else:
-            pz = ((1**2) / 2 * Y0) * (nco2/(neff * jnu2)) * (a1 * a3 * jmur2) + ((a2 * a4 * jpur2) + (((1 - F1 * F2)/2) * jmur * jpur))
-        return numpy.array((0, 0, pz))#, numpy.array((0, 0, pz))
+        r = numpy.asarray(r, dtype=float)
+        clad = r > rho
+        core = ~clad
+        pz = numpy.empty(r.shape)
+
+        wr = w * r[clad] / rho
+        kmur = kn(nu - 1, wr)
+        kpur = kn(nu + 1, wr)
+        pz[clad] = ((1**2) / 2 * Y0) * ((nco2 * u2)/(neff * knw2 * w2)) * ((a1 * a5 * kmur**2) + (a2 * a6 * kpur**2) + (((1 - 2 * Delta - F1 * F2)/2) * kmur * kpur))
+
+        ur = u * r[core] / rho
+        jmur = jn(nu - 1, ur)
+        jpur = jn(nu + 1, ur)
+        pz[core] = ((1**2) / 2 * Y0) * (nco2/(neff * jnu2)) * (a1 * a3 * jmur**2) + ((a2 * a4 * jpur**2) + (((1 - F1 * F2)/2) * jmur * jpur))
+
+        z = numpy.zeros(r.shape)
+        return numpy.array((z, z, pz))
+
     def _TEpoint(self, wl, nu, neff, r):
         rho = self.fiber.outerRadius(0)
         k = wl.k0
@@ -358,29 +388,19 @@ class Neff(FiberSolver):
         ncl2 = self.fiber.minIndex(1, wl) ** 2
         u = rho * k * sqrt(nco2 - neff ** 2)
         w = rho * k * sqrt(neff ** 2 - ncl2)
-        v = rho * k * sqrt(nco2 - ncl2)
 
-        jnu = jn(nu, u)
-        knw = kn(nu, w)
-        k1wr = k1(w * r / rho)
-        k1wr2 = k1wr ** 2
-        k1w = k1(w)
-        k1w2 = k1w ** 2
-        j1ur = j1(u * r / rho)
-        j1ur2 = j1ur ** 2
-        j1u = j1(u)
-        j1u2 = j1u ** 2
+        k1w2 = k1(w) ** 2
+        j1u2 = j1(u) ** 2
 
-        b1 = jvp(nu, u) / (u * jnu)
-        b2 = kvp(nu, w) / (w * knw)
-        F2 = (v / (u * w)) ** 2 * nu / (b1 + b2)
-        a1 = (F2 - 1) / 2
+        r = numpy.asarray(r, dtype=float)
+        clad = r > rho
+        core = ~clad
+        pz = numpy.empty(r.shape)
+        pz[clad] = ((1**2) / 2 * Y0) * (k1(w * r[clad] / rho)**2 * neff / k1w2)
+        pz[core] = ((1**2) / 2 * Y0) * (j1(u * r[core] / rho)**2 * neff / j1u2)
 
-        if r > rho:
-             pz = ((1**2) / 2 * Y0) * (k1wr2 * neff / k1w2)
-        else:
-            pz = ((1**2) / 2 * Y0) * (j1ur2 * neff / j1u2)
-        return numpy.array((0, 0, pz))#, numpy.array((0, 0, 0))
+        z = numpy.zeros(r.shape)
+        return numpy.array((z, z, pz))
 
     def _TMpoint(self, wl, nu, neff, r):
         rho = self.fiber.outerRadius(0)
@@ -389,29 +409,19 @@ class Neff(FiberSolver):
         ncl2 = self.fiber.minIndex(1, wl) ** 2
         u = rho * k * sqrt(nco2 - neff ** 2)
         w = rho * k * sqrt(neff ** 2 - ncl2)
-        v = rho * k * sqrt(nco2 - ncl2)
-
-        jnu = jn(nu, u)
-        knw = kn(nu, w)
-        k1wr = k1(w * r / rho)
-        k1wr2 = k1wr ** 2
-        k1w = k1(w)
-        k1w2 = k1w ** 2
-        j1ur = j1(u * r / rho)
-        j1ur2 = j1ur ** 2
-        j1u = j1(u)
-        j1u2 = j1u ** 2
 
+        k1w2 = k1(w) ** 2
+        j1u2 = j1(u) ** 2
         Delta = (1 - ncl2 / nco2) / 2
-        b1 = jvp(nu, u) / (u * jnu)
-        b2 = kvp(nu, w) / (w * knw)
-        F2 = (v / (u * w)) ** 2 * nu / (b1 + b2)
-        a1 = (F2 - 1) / 2
 
-        if r > rho:
-            pz = ((1**2) / 2 * Y0) * (nco2 / neff - neff * 2 * Delta) * (k1wr2 / k1w2)
-        else:
-            pz = ((1**2) / 2 * Y0) * (nco2 / neff) * (j1ur2 / j1u2)
-        return numpy.array((0, 0, pz))#, numpy.array((0, 0, 0))
+        r = numpy.asarray(r, dtype=float)
+        clad = r > rho
+        core = ~clad
+        pz = numpy.empty(r.shape)
+        pz[clad] = ((1**2) / 2 * Y0) * (nco2 / neff - neff * 2 * Delta) * (k1(w * r[clad] / rho)**2 / k1w2)
+        pz[core] = ((1**2) / 2 * Y0) * (nco2 / neff) * (j1(u * r[core] / rho)**2 / j1u2)
+
+        z = numpy.zeros(r.shape)
+        return numpy.array((z, z, pz))
 
-    _EHpoint = _HEpoint
\ No newline at end of file
+    _EHpoint = _HEpoint
@@ -17,7 +17,9 @@
 
 from .solver import FiberSolver
 from fibermodes import Mode, ModeFamily, Wavelength, HE11
+from fibermodes import constants
 from fibermodes.fiber.material.material import OutOfRangeWarning
+from itertools import count
 from math import sqrt, isinf, isnan
 import numpy
 from scipy.special import j0, y0, i0, k0
@@ -30,12 +32,32 @@ import warnings
 class Cutoff(FiberSolver):
 
     def __call__(self, mode):
-        fct = {ModeFamily.LP: self._lpcoeq,
-               ModeFamily.TE: self._tecoeq,
-               ModeFamily.TM: self._tmcoeq,
-               ModeFamily.HE: self._hecoeq,
-               ModeFamily.EH: self._ehcoeq
-               }
+        lowbound, delta = self._lowbound(mode, self.fiber.cutoff)
+        return self._findFirstRoot(self._coeq(mode),
+                                   args=(mode.nu,),
+                                   lowbound=lowbound,
+                                   delta=delta,
+                                   maxiter=int(250/delta))
+
+    def _coeq(self, mode):
+        return {ModeFamily.LP: self._lpcoeq,
+                ModeFamily.TE: self._tecoeq,
+                ModeFamily.TM: self._tmcoeq,
+                ModeFamily.HE: self._hecoeq,
+                ModeFamily.EH: self._ehcoeq
+                }[mode.family]
+
+    def _lowbound(self, mode, cutoff):
+        """Starting point and step of the search for the cutoff of mode.
+
+        Args:
+            mode(Mode): Mode
+            cutoff: Function giving the cutoff of a previous mode.
+
+        Returns:
+            (lowbound, delta) tuple.
+
+        """
         if mode.m > 1:
             if mode.family is ModeFamily.HE:
                 pm = Mode(ModeFamily.EH, mode.nu, mode.m - 1)
@@ -45,30 +67,136 @@ class Cutoff(FiberSolver):
                 pm = Mode(ModeFamily.TE, 0, 1)
             elif pm == Mode(ModeFamily.LP, 0, 1):
                 pm = Mode(ModeFamily.LP, 1, 1)
-            lowbound = self.fiber.cutoff(pm)
+            lowbound = cutoff(pm)
             delta = 0.05 / lowbound if lowbound > 4 else self._MCD
             lowbound += delta / 100
         elif mode.family is ModeFamily.EH:
             pm = Mode(ModeFamily.HE, mode.nu, mode.m)
-            lowbound = self.fiber.cutoff(pm)
+            lowbound = cutoff(pm)
             delta = 0.05 / lowbound if lowbound > 4 else self._MCD
             lowbound += delta / 100
         elif mode.nu > 0:
             # TE(0,1) is single-mode condition
             # Roots below TE(0,1) are false-positive
             pm = Mode(ModeFamily.TE, 0, 1)
-            lowbound = self.fiber.cutoff(pm)
+            lowbound = cutoff(pm)
             delta = 0.05 / lowbound
             lowbound -= delta / 100
         else:
             lowbound = delta = self._MCD
         if isnan(delta):
             print(lowbound)
-        return self._findFirstRoot(fct[mode.family],
-                                   args=(mode.nu,),
-                                   lowbound=lowbound,
-                                   delta=delta,
-                                   maxiter=int(250/delta))
+        return lowbound, delta
+
+    def cutoffMap(self, family, nu, v0max):
+        """Cutoff of all modes of given family and order, up to v0max.
+
+        Each characteristic equation is evaluated only once, on a grid
+        from the lowest cutoff up to v0max, with the same step as
+        :py:meth:`__call__` (0.1 below V0 = 4, 0.05 / V0 above).
+        Cutoffs are then found from the sampled values, using the same
+        lower bounds as when solving modes one by one.
+
+        The grid only covers V0 values where the wavelength can be
+        interpolated from the table of the fiber (see
+        :py:meth:`~fibermodes.fiber.fiber.Fiber.toWl`). Below that
+        range, each wavelength is found by fixed point iterations, and
+        points are evaluated one by one, as in :py:meth:`__call__`,
+        only up to the cutoff.
+
+        Args:
+            family(ModeFamily): Mode family. HE and EH modes are
+                                interleaved, and both are returned for
+                                any hybrid family.
+            nu(int): Azimuthal order
+            v0max(float): Maximum normalized frequency.
+
+        Returns:
+            Dict {mode: cutoff}, for m = 1, 2, ..., of the modes with
+            cutoff below v0max.
+
+        """
+        if family in (ModeFamily.HE, ModeFamily.EH):
+            families = (ModeFamily.HE, ModeFamily.EH)
+        else:
+            families = (family,)
+        cutoffs = {}
+
+        def cutoff(mode):
+            try:
+                return cutoffs[mode]
+            except KeyError:
+                return self.fiber.cutoff(mode)
+
+        vmin = self._gridmin()
+        grids = {}
+        for m in count(1):
+            for fam in families:
+                mode = Mode(fam, nu, m)
+                co = self.fiber.co_cache.get(mode)
+                if co is None:
+                    lowbound, delta = self._lowbound(mode, cutoff)
+                    if isnan(lowbound) or lowbound >= v0max:
+                        return cutoffs
+                    fct = self._coeq(mode)
+                    if lowbound < vmin:
+                        co, lowbound = self._scanRoot(fct, nu, lowbound,
+                                                      delta, min(vmin, v0max))
+                    if co is None:
+                        if lowbound >= v0max:
+                            return cutoffs
+                        if fam not in grids:
+                            X = self._grid(lowbound, v0max)
+                            grids[fam] = X, self._vcoeq(mode, X)
+                        co = self._gridRoot(fct, nu, lowbound, *grids[fam])
+                if isnan(co) or co > v0max:
+                    return cutoffs
+                cutoffs[mode] = co
+
+    def _gridmin(self):
+        """Lowest V0 where the equations are sampled on a grid."""
+        if self.fiber._fixedNA() is not None:
+            return 0
+        table = self.fiber._wlTable()
+        return float("inf") if table is None else table[0][0]
+
+    def _scanRoot(self, fct, nu, lowbound, delta, highbound):
+        """First root of fct, evaluated every delta from lowbound,
+        as in :py:meth:`__call__`.
+
+        Returns:
+            (root, x) tuple, where x is the last evaluated point (at
+            least highbound if no root was found), and root is None
+            if no root was found.
+
+        """
+        a, fa = lowbound, fct(lowbound, nu)
+        while a < highbound:
+            b = a + delta
+            fb = fct(b, nu)
+            z = self._refineFirstRoot(fct, (nu,), (a, b), (fa, fb))
+            if z is not None:
+                return z, b
+            a, fa = b, fb
+        return None, a
+
+    def _grid(self, lowbound, v0max):
+        X = [lowbound]
+        while X[-1] < v0max:
+            x = X[-1]
+            X.append(x + (0.05 / x if x > 4 else self._MCD))
+        return numpy.array(X)
+
+    def _gridRoot(self, fct, nu, lowbound, X, F):
+        """First root of fct above lowbound, from values F sampled on X."""
+        i = numpy.searchsorted(X, lowbound, side='right')
+        if i == 0 or X[i-1] != lowbound:
+            X = numpy.concatenate(([lowbound], X[i:]))
+            F = numpy.concatenate(([fct(lowbound, nu)], F[i:]))
+        else:
+            X, F = X[i-1:], F[i-1:]
+        z = self._refineFirstRoot(fct, (nu,), X, F)
+        return float("nan") if z is None else z
 
     def __params(self, v0):
         with warnings.catch_warnings():
@@ -92,14 +220,57 @@ class Cutoff(FiberSolver):
             u1, u2, u3 = numpy.sqrt(numpy.abs(Usq))
             return u1*r1, u2*r1, u2*r2, s1, s2, n1sq, n2sq, n3sq
 
+    def _vparams(self, v0s):
+        """Parameters of the characteristic equations, as arrays."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=OutOfRangeWarning)
+            r1, r2 = self.fiber._r
+            wls = self.fiber.toWl(v0s)
+            wls[numpy.isinf(wls)] = constants.tpi  # k0 = 1, as in __params
+            Nsq = numpy.square([self.fiber.minIndex(i, wls)
+                                for i in range(3)])
+            with numpy.errstate(all='ignore'):
+                Usq = (constants.tpi / wls)**2 * (Nsq - Nsq[2])
+            Usq[:, wls == 0] = float("inf")
+            s1, s2, s3 = numpy.sign(Usq)
+            u1, u2, u3 = numpy.sqrt(numpy.abs(Usq))
+            return u1*r1, u2*r1, u2*r2, s1, s2, Nsq[0], Nsq[1], Nsq[2]
+
+    def _vcoeq(self, mode, v0s):
+        """Characteristic equation of mode, evaluated on array v0s.
+
+        Points are grouped by signs of (n1 - n3) and (n2 - n3), and by
+        index profile, so that each group follows a single branch of
+        the scalar equation.
+
+        """
+        fct = {ModeFamily.LP: self._lpfct,
+               ModeFamily.TE: self._tefct,
+               ModeFamily.TM: self._tmfct,
+               ModeFamily.HE: self._hefct,
+               ModeFamily.EH: self._ehfct
+               }[mode.family]
+        params = self._vparams(v0s)
+        u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq = params
+        keys = numpy.array([s1, s2, (n1sq > n2sq) & (n2sq > n3sq)])
+        F = numpy.empty(v0s.size)
+        F.fill(numpy.nan)
+        with numpy.errstate(all='ignore'):
+            for key in numpy.unique(keys, axis=1).T:
+                idx = numpy.all(keys.T == key, axis=1)
+                F[idx] = fct(mode.nu, u1r1[idx], u2r1[idx], u2r2[idx],
+                             key[0], key[1],
+                             n1sq[idx], n2sq[idx], n3sq[idx])
+        return F
+
     def __delta(self, nu, u1r1, u2r1, s1, s2, s3, n1sq, n2sq, n3sq):
         """s3 is sign of Delta"""
         if s1 < 0:
             f = ivp(nu, u1r1) / (iv(nu, u1r1) * u1r1)  # c
         else:
             jnnuu1r1 = jn(nu, u1r1)
-            if jnnuu1r1 == 0:  # Avoid zero division error
-                return float("inf")
+            if numpy.ndim(jnnuu1r1) == 0 and jnnuu1r1 == 0:
+                return float("inf")  # Avoid zero division error
             f = jvp(nu, u1r1) / (jnnuu1r1 * u1r1)  # a b d
 
         if s1 == s2:
@@ -114,12 +285,18 @@ class Cutoff(FiberSolver):
                       nu**2 * n3sq / n2sq * (1 / u1r1**2 + 1 / u2r1**2)**2)
 
         d = kappa1**2 - 4 * kappa2
-        if d < 0:
+        if numpy.ndim(d):
+            sqrtd = numpy.sqrt(d)  # nan where d < 0
+        elif d < 0:
             return numpy.nan
-        return u2r1 * (nu / u2r1**2 + (kappa1 + s3 * sqrt(d)) * 0.5)
+        else:
+            sqrtd = sqrt(d)
+        return u2r1 * (nu / u2r1**2 + (kappa1 + s3 * sqrtd) * 0.5)
 
     def _lpcoeq(self, v0, nu):
-        u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq = self.__params(v0)
+        return self._lpfct(nu, *self.__params(v0))
+
+    def _lpfct(self, nu, u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq):
 
         if s1 == 0:  # e
             return (jn(nu+1, u2r1) * yn(nu-1, u2r2) -
@@ -138,7 +315,9 @@ class Cutoff(FiberSolver):
         return f11a * f2a * u1r1 - f11b * f2b * u2r1
 
     def _tecoeq(self, v0, nu):
-        u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq = self.__params(v0)
+        return self._tefct(nu, *self.__params(v0))
+
+    def _tefct(self, nu, u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq):
         (f11a, f11b) = ((j0(u1r1), jn(2, u1r1)) if s1 > 0 else
                         (i0(u1r1), -iv(2, u1r1)))
         if s2 > 0:
@@ -152,7 +331,9 @@ class Cutoff(FiberSolver):
         return f11a * f2a - f11b * f2b
 
     def _tmcoeq(self, v0, nu):
-        u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq = self.__params(v0)
+        return self._tmfct(nu, *self.__params(v0))
+
+    def _tmfct(self, nu, u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq):
         if s1 == 0:  # e
             f11a, f11b = 2, 1
         elif s1 > 0:  # a, b, d
@@ -170,7 +351,9 @@ class Cutoff(FiberSolver):
         return f11a * n2sq * f2a - f11b * n1sq * f2b * u2r1
 
     def _ehcoeq(self, v0, nu):
-        u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq = self.__params(v0)
+        return self._ehfct(nu, *self.__params(v0))
+
+    def _ehfct(self, nu, u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq):
         if s1 == 0:
             return self.__fct3(nu, u2r1, u2r2, 2, n2sq, n3sq)
         else:
@@ -187,12 +370,15 @@ class Cutoff(FiberSolver):
                                n1sq, n2sq, n3sq)
 
     def _hecoeq(self, v0, nu):
-        u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq = self.__params(v0)
+        return self._hefct(nu, *self.__params(v0))
+
+    def _hefct(self, nu, u1r1, u2r1, u2r2, s1, s2, n1sq, n2sq, n3sq):
         if s1 == 0:
             return self.__fct3(nu, u2r1, u2r2, -2, n2sq, n3sq)
         else:
             s3 = -1 if s1 == s2 else 1
-            if n1sq > n2sq > n3sq:
+            # Arrays are homogeneous here (see _vcoeq)
+            if ((n1sq > n2sq) & (n2sq > n3sq)).all():
                 s3 = -1 if nu == 1 else 1
             #     return self.__fct1(nu, u1r1, u2r1, u2r2,
             #                        s1, s2, s3,
@@ -0,0 +1,161 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Persistent cache of solver results, stored in a SQLite database.
+
+Results are keyed by a hash of the fiber definition (radii, geometry
+and material of each layer, with their parameters, and solver classes),
+the wavelength, the mode, and (for effective indexes) the delta
+parameter of the solver. Therefore, the same file can be shared by
+many fibers, and reused between runs.
+
+The database is opened in WAL mode, and each process (and each thread)
+uses its own connection. This allows concurrent readers and writers,
+e.g. from :py:class:`~fibermodes.simulator.psimulator.PSimulator`
+workers, or from the executor threads of
+:py:class:`~fibermodes.simulator.asyncsimulator.AsyncSimulator`.
+
+Use it with :py:meth:`~fibermodes.fiber.factory.FiberFactory.setSolverCache`::
+
+    factory.setSolverCache(SolverCache("cache.sqlite"))
+
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+
+def fiberKey(fiber):
+    """Canonical hash of the definition of a fiber."""
+    layers = [[layer.__class__.__name__,
+               [float(p) for p in layer._fp],
+               layer._m.__class__.__name__,
+               [float(p) for p in layer._mp]]
+              for layer in fiber.layers]
+    solvers = [type(s).__module__ + '.' + type(s).__qualname__
+               for s in (fiber._cutoff, fiber._neff)]
+    definition = json.dumps([[float(r) for r in fiber._r], layers, solvers])
+    return hashlib.sha1(definition.encode('utf-8')).hexdigest()
+
+
+class SolverCache(object):
+
+    """Persistent cache of effective indexes, their derivatives, and
+    cutoffs.
+
+    Args:
+        filename(str): Name of the SQLite database file.
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._local = threading.local()  # conn and pid, for each thread
+
+    def __getstate__(self):
+        return {'filename': self.filename}
+
+    def __setstate__(self, state):
+        self.__init__(state['filename'])
+
+    def _connection(self):
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, 'pid', None) != pid:
+            # Connections must not be shared with other threads,
+            # or with forked processes
+            conn = sqlite3.connect(self.filename, timeout=60,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS neff ("
+                         "fiber TEXT, wl REAL, mode TEXT, delta REAL, "
+                         "neff REAL, PRIMARY KEY (fiber, wl, mode, delta))")
+            conn.execute("CREATE TABLE IF NOT EXISTS cutoff ("
+                         "fiber TEXT, mode TEXT, cutoff REAL, "
+                         "PRIMARY KEY (fiber, mode))")
+            conn.execute("CREATE TABLE IF NOT EXISTS dneff ("
+                         "fiber TEXT, wl REAL, mode TEXT, delta REAL, "
+                         "d0 REAL, d1 REAL, d2 REAL, d3 REAL, "
+                         "PRIMARY KEY (fiber, wl, mode, delta))")
+            local.conn = conn
+            local.pid = pid
+        return local.conn
+
+    def neff(self, key, wl, mode, delta):
+        """Cached effective index (None if not found)."""
+        row = self._connection().execute(
+            "SELECT neff FROM neff WHERE fiber=? AND wl=? AND mode=? "
+            "AND delta=?", (key, float(wl), str(mode), delta)).fetchone()
+        if row is None:
+            return None
+        return float("nan") if row[0] is None else row[0]
+
+    def setNeff(self, key, wl, mode, delta, neff):
+        """Store effective index."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO neff VALUES (?, ?, ?, ?, ?)",
+            (key, float(wl), str(mode), delta, float(neff)))
+
+    def derivatives(self, key, wl, mode, delta):
+        """Cached neff and its derivatives with respect to omega (None if
+        not found).
+
+        """
+        row = self._connection().execute(
+            "SELECT d0, d1, d2, d3 FROM dneff WHERE fiber=? AND wl=? "
+            "AND mode=? AND delta=?",
+            (key, float(wl), str(mode), delta)).fetchone()
+        if row is None:
+            return None
+        return [float("nan") if d is None else d for d in row]
+
+    def setDerivatives(self, key, wl, mode, delta, dn):
+        """Store neff and its derivatives (up to 3rd)."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO dneff VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, float(wl), str(mode), delta) + tuple(float(d) for d in dn))
+
+    def cutoff(self, key, mode):
+        """Cached cutoff (None if not found)."""
+        row = self._connection().execute(
+            "SELECT cutoff FROM cutoff WHERE fiber=? AND mode=?",
+            (key, str(mode))).fetchone()
+        if row is None:
+            return None
+        return float("nan") if row[0] is None else row[0]
+
+    def setCutoff(self, key, mode, cutoff):
+        """Store cutoff."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cutoff VALUES (?, ?, ?)",
+            (key, str(mode), float(cutoff)))
+
+    def clear(self):
+        """Remove all cached values."""
+        conn = self._connection()
+        conn.execute("DELETE FROM neff")
+        conn.execute("DELETE FROM dneff")
+        conn.execute("DELETE FROM cutoff")
+
+    def close(self):
+        """Close the connection of this thread."""
+        local = self._local
+        if getattr(local, 'pid', None) == os.getpid():
+            local.conn.close()
+        local.__dict__.clear()
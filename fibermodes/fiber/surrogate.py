@@ -0,0 +1,196 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Surrogate model of the effective index of a mode, as function of
+the angular frequency.
+
+The wavelength interval is split into pieces, and neff(omega) is
+approximated by a Chebyshev series on each piece. A piece is split in two
+until the last coefficients of the series are smaller than the
+requested tolerance. Pieces where the mode is not guided are kept
+(neff is nan), and pieces containing the cutoff are split until
+the maximum depth is reached. Those last pieces are not covered by the
+model.
+
+Once built, a model can be registered to a fiber using
+:py:meth:`~fibermodes.fiber.fiber.Fiber.addSurrogate`. Queries of neff,
+ng, D, and S inside the covered interval are then evaluated from the
+series, instead of solving the characteristic equation.
+
+"""
+
+from fibermodes import Wavelength, Mode
+from bisect import bisect_right
+from numpy.polynomial import chebyshev
+import json
+import numpy
+
+
+class NeffSurrogate(object):
+
+    """Piecewise Chebyshev model of neff(omega) for a given mode.
+
+    Args:
+        mode(Mode): Mode
+        pieces(list): List of (omin, omax, coefs) tuples, sorted by
+                      omega. coefs is None where the mode is not guided.
+
+    """
+
+    def __init__(self, mode, pieces):
+        self.mode = mode
+        self.pieces = sorted(pieces, key=lambda p: p[0])
+        self._omin = [p[0] for p in self.pieces]
+
+    @classmethod
+    def build(cls, fiber, mode, wlmin, wlmax, tol=1e-10, degree=16,
+              maxdepth=6, delta=1e-6):
+        """Build the model from solver samples.
+
+        Args:
+            fiber(Fiber): Fiber
+            mode(Mode): Mode
+            wlmin(Wavelength): Lower wavelength of the interval.
+            wlmax(Wavelength): Upper wavelength of the interval.
+            tol(float): Maximum error on neff.
+            degree(int): Degree of the series on each piece.
+            maxdepth(int): Maximum number of subdivisions of the interval.
+            delta(float): Step used by the solver.
+
+        """
+        omin = Wavelength(wlmax).omega
+        omax = Wavelength(wlmin).omega
+        x = numpy.cos(numpy.pi * (numpy.arange(degree+1) + 0.5) / (degree+1))
+
+        pieces = []
+        todo = [(omin, omax, 0)]
+        while todo:
+            o1, o2, depth = todo.pop()
+            omegas = (o1 + o2) / 2 + (o2 - o1) / 2 * x
+            neffs = fiber.neffs(mode, [Wavelength(omega=o) for o in omegas],
+                                delta)
+            guided = ~numpy.isnan(neffs)
+            if not guided.any():
+                pieces.append((o1, o2, None))
+                continue
+            if guided.all():
+                coefs = chebyshev.chebfit(x, neffs, degree)
+                if abs(coefs[-2:]).max() < tol:
+                    pieces.append((o1, o2, coefs))
+                    continue
+            if depth < maxdepth:
+                om = (o1 + o2) / 2
+                todo.append((o1, om, depth+1))
+                todo.append((om, o2, depth+1))
+        return cls(mode, pieces)
+
+    def _piece(self, omega):
+        i = bisect_right(self._omin, omega) - 1
+        if i >= 0:
+            o1, o2, coefs = self.pieces[i]
+            if omega <= o2:
+                return o1, o2, coefs
+        return None
+
+    def contains(self, wl):
+        """True if the model is defined at wavelength wl."""
+        return self._piece(Wavelength(wl).omega) is not None
+
+    def derivatives(self, wl, order=3):
+        """neff and its derivatives with respect to omega.
+
+        Args:
+            wl(Wavelength): Wavelength
+            order(int): Maximum order of derivative.
+
+        Returns:
+            List [neff, dneff/domega, ..., d^order neff / domega^order],
+            or None if wl is not covered by the model.
+
+        """
+        omega = Wavelength(wl).omega
+        piece = self._piece(omega)
+        if piece is None:
+            return None
+        o1, o2, coefs = piece
+        if coefs is None:
+            return [float("nan")] * (order + 1)
+
+        s = 2 / (o2 - o1)
+        x = (omega - o1) * s - 1
+        dn = [float(chebyshev.chebval(x, coefs))]
+        for k in range(1, order + 1):
+            coefs = chebyshev.chebder(coefs)
+            dn.append(float(chebyshev.chebval(x, coefs)) * s**k)
+        return dn
+
+    def __call__(self, wl):
+        """Effective index at wl (None if wl is not covered)."""
+        dn = self.derivatives(wl, 0)
+        return None if dn is None else dn[0]
+
+    def todict(self):
+        """Model as a dict, suitable for json serialization."""
+        return {'mode': [self.mode.family.name, self.mode.nu, self.mode.m],
+                'pieces': [[o1, o2, None if c is None else list(c)]
+                           for o1, o2, c in self.pieces]}
+
+    @classmethod
+    def fromdict(cls, obj):
+        """Model from a dict built by :py:meth:`todict`."""
+        pieces = [(o1, o2, None if c is None else numpy.array(c))
+                  for o1, o2, c in obj['pieces']]
+        return cls(Mode(*obj['mode']), pieces)
+
+    def dump(self, fp, **kwargs):
+        """Dump model to file object.
+
+        Args:
+            fp: File object.
+            **kwargs: See json.dumps
+
+        """
+        fp.write(self.dumps(**kwargs))
+
+    def dumps(self, **kwargs):
+        """Dump model to a json string.
+
+        Args:
+            **kwargs: See json.dumps.
+
+        """
+        return json.dumps(self.todict(), **kwargs)
+
+    @classmethod
+    def load(cls, fp, **kwargs):
+        """Load model from file object.
+
+        Args:
+            fp: File object.
+            **kwargs: See json.loads
+
+        """
+        return cls.loads(fp.read(), **kwargs)
+
+    @classmethod
+    def loads(cls, s, **kwargs):
+        """Load model from a json string.
+
+        Args:
+            s(str): json string.
+            **kwargs: See json.loads
+
+        """
+        return cls.fromdict(json.loads(s, **kwargs))
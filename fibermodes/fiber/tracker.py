@@ -0,0 +1,119 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Follow the effective index of a mode along a sweep of wavelengths.
+
+The effective index at the next wavelength is predicted by polynomial
+extrapolation of the last computed points, then it is solved in a
+narrow bracket around the prediction (predictor-corrector). This avoids
+scanning the whole range of effective indexes at each wavelength.
+
+"""
+
+from fibermodes import Wavelength
+from collections import deque
+from math import isnan
+import numpy
+
+
+class NeffTracker(object):
+
+    """Effective index of a mode, along a sweep of wavelengths.
+
+    When the mode cannot be followed (not enough points, prediction
+    close to the cladding index, or zero or many roots in the
+    bracket), the effective index is computed using the full solver
+    of the fiber.
+
+    Args:
+        fiber(Fiber): Fiber
+        mode(Mode): Mode to follow.
+        delta(float): Step used by the full solver.
+        order(int): Order of the extrapolation polynomial.
+        margin(float): Half width of the bracket, relative to the
+                       predicted variation of effective index.
+
+    """
+
+    def __init__(self, fiber, mode, delta=1e-6, order=2, margin=2):
+        self.fiber = fiber
+        self.mode = mode
+        self.delta = delta
+        self.margin = margin
+        self.points = deque(maxlen=order+1)
+        self.tracked = 0  # Number of neff found by tracking.
+
+    def add(self, wl, neff):
+        """Add a point to the curve being followed.
+
+        The curve is restarted when the mode is not guided (neff is nan).
+
+        """
+        wl = Wavelength(wl)
+        if isnan(neff):
+            self.points.clear()
+        elif not self.points or self.points[-1][0] != wl:
+            self.points.append((wl, neff))
+
+    def predict(self, wl):
+        """Predicted effective index at wl (nan if not enough points)."""
+        if len(self.points) < 2:
+            return float("nan")
+        o0 = self.points[-1][0].omega
+        x = [(p[0].omega - o0) / o0 for p in self.points]
+        y = [p[1] for p in self.points]
+        coefs = numpy.polyfit(x, y, len(self.points) - 1)
+        return float(numpy.polyval(coefs, (Wavelength(wl).omega - o0) / o0))
+
+    def __call__(self, wl, lowbound=None):
+        """Effective index at wl.
+
+        Args:
+            wl(Wavelength): Wavelength
+            lowbound(float): Known upper limit of the effective index
+                             (e.g. from the previous mode), passed to
+                             the full solver.
+
+        """
+        wl = Wavelength(wl)
+        try:
+            neff = self.fiber.ne_cache[wl][self.mode]
+        except KeyError:
+            neff = self.fiber._loadNeff(self.mode, wl, self.delta)
+            if neff is None:
+                neff = self._track(wl, lowbound)
+                if isnan(neff):
+                    neff = self.fiber.neff(self.mode, wl, self.delta,
+                                           lowbound)
+                else:
+                    self.tracked += 1
+                    self.fiber.set_ne_cache(wl, self.mode, neff, self.delta)
+        self.add(wl, neff)
+        return neff
+
+    def _track(self, wl, lowbound):
+        solveBracket = getattr(self.fiber._neff, 'solveBracket', None)
+        neff = self.predict(wl)
+        if solveBracket is None or isnan(neff):
+            return float("nan")
+
+        width = self.margin * abs(neff - self.points[-1][1]) + self.delta
+        nmin = neff - width
+        nmax = neff + width
+        if lowbound is not None and not isnan(lowbound):
+            nmax = min(nmax, lowbound)
+        if nmin <= self.fiber.minIndex(-1, wl) + self.delta or nmax <= nmin:
+            return float("nan")  # Close to cutoff: stop tracking
+        return solveBracket(wl, self.mode, nmin, nmax)
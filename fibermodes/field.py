@@ -15,10 +15,7 @@
 
 
 """Electromagnetic fields computation."""
-from math import sqrt
-
 import numpy
-from itertools import product
 
 import numpy as np
 from scipy.special import jvp, kvp
@@ -59,6 +56,29 @@ class Field(object):
         self.R = numpy.sqrt(numpy.square(self.X) + numpy.square(self.Y))
         self.Phi = numpy.arctan2(self.Y, self.X)
 
+        # Fields only depend on r; they are computed for unique radii,
+        # and mapped back to the grid using the inverse index.
+        self._r, ridx = numpy.unique(self.R, return_inverse=True)
+        self._ridx = ridx.reshape(self.R.shape)
+        self._fields = None
+
+    def _rfield(self):
+        """Radial E and H fields, mapped on the (np x np) grid.
+
+        The radial profile is computed only once, as a (6 x nr) table
+        (E and H components for each unique radius), and is shared by all
+        field components, whatever the phase or orientation is.
+
+        Returns:
+            (E, H) tuple of (3 x np x np) arrays.
+
+        """
+        if self._fields is None:
+            er, hr = self.fiber._rfield(self.mode, self.wl, self._r)
+            self._fields = numpy.vstack((er, hr))
+        F = self._fields[:, self._ridx]
+        return F[:3], F[3:]
+
     def f(self, phi0):
         """Azimuthal dependency function.
 
@@ -97,11 +117,8 @@ class Field(object):
 
         """
         if self.mode.family is ModeFamily.LP:
-            self._Ex = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Ex[j, i] = er[0] * f[j, i]
+            er, hr = self._rfield()
+            self._Ex = er[0] * self.f(phi)
             return self._Ex
         else:
             return self.Et(phi, theta) * numpy.cos(self.Epol(phi, theta))
@@ -118,11 +135,8 @@ class Field(object):
 
         """
         if self.mode.family is ModeFamily.LP:
-            self._Ey = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Ey[j, i] = er[1] * f[j, i]
+            er, hr = self._rfield()
+            self._Ey = er[1] * self.f(phi)
             return self._Ey
         else:
             return self.Et(phi, theta) * numpy.sin(self.Epol(phi, theta))
@@ -138,21 +152,14 @@ class Field(object):
             (np x np) numpy array
 
         """
-        self._Ez = numpy.zeros(self.X.shape)
-        f = self.f(phi)
-        g2 = self.g(phi)
-        g = -g2
-        for i, j in product(range(self.np), repeat=2):
-            er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-            if self.mode.family is ModeFamily.HE_odd or self.mode.family is ModeFamily.EH_odd:
-                self._Ez[j, i] = er[2] * g[j, i]
-                return self._Ez
-            if self.mode.family is ModeFamily.TM:
-                self._Ez[j, i] = er[2]
-                return self._Ez
-            else:
-                self._Ez[j, i] = er[2] * f[j, i]
-                return self._Ez
+        er, hr = self._rfield()
+        if self.mode.family is ModeFamily.HE_odd or self.mode.family is ModeFamily.EH_odd:
+            self._Ez = er[2] * -self.g(phi)
+        elif self.mode.family is ModeFamily.TM:
+            self._Ez = er[2]
+        else:
+            self._Ez = er[2] * self.f(phi)
+        return self._Ez
 
     def Er(self, phi=0, theta=0):
         """r component of the E field.
@@ -167,27 +174,14 @@ class Field(object):
         """
         if self.mode.family is ModeFamily.LP:
             return (self.Et(phi, theta) * numpy.cos(self.Epol(phi, theta) - self.Phi))
+        er, hr = self._rfield()
         if self.mode.family is ModeFamily.HE_odd or self.mode.family is ModeFamily.EH_odd:
-            self._Er = numpy.zeros(self.X.shape)
-            g1 = self.g(phi)
-            g = -g1
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Er[j, i] = er[0] * g[j, i]
-            return self._Er
-        if self.mode.family is ModeFamily.TM:
-            self._Er = numpy.zeros(self.X.shape)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Er[j, i] = er[0]
-            return self._Er
+            self._Er = er[0] * -self.g(phi)
+        elif self.mode.family is ModeFamily.TM:
+            self._Er = er[0]
         else:
-            self._Er = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Er[j, i] = er[0] * f[j, i]
-            return self._Er
+            self._Er = er[0] * self.f(phi)
+        return self._Er
 
     def Ephi(self, phi=0, theta=0):
         """phi component of the E field.
@@ -203,27 +197,14 @@ class Field(object):
         if self.mode.family is ModeFamily.LP:
             return (self.Et(phi, theta) *
                     numpy.sin(self.Epol(phi, theta) - self.Phi))
+        er, hr = self._rfield()
         if self.mode.family is ModeFamily.HE_odd or self.mode.family is ModeFamily.EH_odd:
-            self._Ephi = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Ephi[j, i] = er[1] * f[j, i]
-            return self._Ephi
-        if self.mode.family is ModeFamily.TE:
-            self._Ephi = numpy.zeros(self.X.shape)
-            g = self.g(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Ephi[j, i] = er[1]
-            return self._Ephi
+            self._Ephi = er[1] * self.f(phi)
+        elif self.mode.family is ModeFamily.TE:
+            self._Ephi = er[1]
         else:
-            self._Ephi = numpy.zeros(self.X.shape)
-            g = self.g(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Ephi[j, i] = er[1] * g[j, i]
-            return self._Ephi
+            self._Ephi = er[1] * self.g(phi)
+        return self._Ephi
 
     def Et(self, phi=0, theta=0):
         """transverse component of the E field.
@@ -364,11 +345,8 @@ class Field(object):
 
         """
         if self.mode.family is ModeFamily.LP:
-            self._Hx = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Hx[j, i] = hr[0] * f[j, i]
+            er, hr = self._rfield()
+            self._Hx = hr[0] * self.f(phi)
             return self._Hx
         else:
             return self.Ht(phi, theta) * numpy.cos(self.Hpol(phi, theta))
@@ -385,11 +363,8 @@ class Field(object):
 
         """
         if self.mode.family is ModeFamily.LP:
-            self._Hy = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Hy[j, i] = hr[1] * f[j, i]
+            er, hr = self._rfield()
+            self._Hy = hr[1] * self.f(phi)
             return self._Hy
         else:
             return self.Ht(phi, theta) * numpy.sin(self.Hpol(phi, theta))
@@ -405,11 +380,8 @@ class Field(object):
             (np x np) numpy array
 
         """
-        self._Hz = numpy.zeros(self.X.shape)
-        g = self.g(phi)
-        for i, j in product(range(self.np), repeat=2):
-            er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-        self._Hz[j, i] = hr[2] * g[j, i]
+        er, hr = self._rfield()
+        self._Hz = hr[2] * self.g(phi)
         return self._Hz
 
     def Hr(self, phi=0, theta=0):
@@ -427,11 +399,8 @@ class Field(object):
             return (self.Ht(phi, theta) *
                     numpy.cos(self.Hpol(phi, theta) - self.Phi))
         else:
-            self._Hr = numpy.zeros(self.X.shape)
-            g = self.g(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Hr[j, i] = hr[0] * g[j, i]
+            er, hr = self._rfield()
+            self._Hr = hr[0] * self.g(phi)
             return self._Hr
 
     def Hphi(self, phi=0, theta=0):
@@ -449,11 +418,8 @@ class Field(object):
             return (self.Ht(phi, theta) *
                     numpy.sin(self.Hpol(phi, theta) - self.Phi))
         else:
-            self._Hphi = numpy.zeros(self.X.shape)
-            f = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                er, hr = self.fiber._rfield(self.mode, self.wl, self.R[j, i])
-                self._Hphi[j, i] = hr[1] * f[j, i]
+            er, hr = self._rfield()
+            self._Hphi = hr[1] * self.f(phi)
             return self._Hphi
 
     def Ht(self, phi=0, theta=0):
@@ -542,33 +508,8 @@ class Field(object):
 
     def poynting(self, phi=0, theta=0):
         """Poynting vector"""
-        if self.mode.family is ModeFamily.HE:
-            self._poynting = numpy.zeros(self.X.shape)
-            f2 = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                pz = self.fiber._control(self.mode, self.wl, self.R[j, i])
-                self._poynting[j, i] = pz[2]# * f2[j, i]
-            return self._poynting
-        if self.mode.family is ModeFamily.TM:
-            self._poynting = numpy.zeros(self.X.shape)
-            for i, j in product(range(self.np), repeat=2):
-                pz = self.fiber._control(self.mode, self.wl, self.R[j, i])
-                self._poynting[j, i] = pz[2]
-            return self._poynting
-        if self.mode.family is ModeFamily.TE:
-            self._poynting = numpy.zeros(self.X.shape)
-            for i, j in product(range(self.np), repeat=2):
-                pz = self.fiber._control(self.mode, self.wl, self.R[j, i])
-                self._poynting[j, i] = pz[2]
-            return self._poynting
-        if self.mode.family is ModeFamily.EH:
-            self._poynting = numpy.zeros(self.X.shape)
-            f2 = self.f(phi)
-            for i, j in product(range(self.np), repeat=2):
-                pz = self.fiber._control(self.mode, self.wl, self.R[j, i])
-                self._poynting[j, i] = pz[2]# * f2[j, i]
+        if self.mode.family in (ModeFamily.HE, ModeFamily.EH,
+                                ModeFamily.TE, ModeFamily.TM):
+            pz = self.fiber._control(self.mode, self.wl, self._r)
+            self._poynting = pz[2][self._ridx]
             return self._poynting
-
-
-
-
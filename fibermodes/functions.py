@@ -17,6 +17,7 @@
 """Miscellaneous mathematical functions."""
 
 from math import factorial
+from scipy.special import jn_zeros
 
 # A[(k, m, i)]
 A = {
@@ -133,5 +134,48 @@ def derivative(f, x, k, m, j, h, *args):
         *args: other function arguments
 
     """
+    return stencilDerivative([f(x + (i-j) * h, *args) for i in range(m)],
+                             k, j, h)
+
+
+def stencilDerivative(y, k, j, h):
+    """Numerical differentiation from precomputed function values
+
+    Args:
+        y(list): function values f(x + (i-j) * h), for i in range(m)
+        k(int): differentiation order (1 to 5)
+        j(int): central point (0 to m-1)
+        h(float): distance between points
+
+    """
+    m = len(y)
     C = factorial(k) / (factorial(m-1) * h**k)
-    return C * sum(A[(k, m, j)][i] * f(x + (i-j) * h, *args) for i in range(m))
+    return C * sum(A[(k, m, j)][i] * y[i] for i in range(m))
+
+
+_JNZEROS = {}  # nu: zeros of J_nu
+
+
+def besselZeros(nu, m):
+    """First m zeros of the Bessel function of the first kind J_nu.
+
+    Zeros are kept in a process-wide table, which is extended (at least
+    doubled) when more zeros are needed. Looping over m = 1, 2, ...
+    therefore computes zeros only a few times.
+
+    Args:
+        nu(int): Order of the Bessel function.
+        m(int): Number of zeros.
+
+    Returns:
+        Read-only array of the first m zeros.
+
+    """
+    nu = abs(nu)  # J_-nu = (-1)^nu J_nu
+    zeros = _JNZEROS.get(nu)
+    if zeros is None or zeros.size < m:
+        n = max(m, 2 * zeros.size if zeros is not None else 16)
+        zeros = jn_zeros(nu, n)
+        zeros.flags.writeable = False
+        _JNZEROS[nu] = zeros
+    return zeros[:m]
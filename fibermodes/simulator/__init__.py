@@ -9,7 +9,10 @@ in parallel using multiple processes, or even using MPI.
 
 """
 
-from .simulator import Simulator
+from .simulator import Simulator, CancelToken
 from .psimulator import PSimulator
+from .result import SimulationResult
+from .asyncsimulator import AsyncSimulator
 
-__all__ = ['Simulator', 'PSimulator']
+__all__ = ['Simulator', 'PSimulator', 'SimulationResult', 'CancelToken',
+           'AsyncSimulator']
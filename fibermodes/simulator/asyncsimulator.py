@@ -0,0 +1,265 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""asyncio front end of the simulator.
+
+Solves are run on an executor, and never block the event loop.
+Computations on a given fiber are serialized (fiber caches are not
+thread safe), but different fibers are computed concurrently.
+Concurrent requests for the same value share a single computation.
+
+Example::
+
+    async def main(sim):
+        asim = AsyncSimulator(sim)
+        async for fnum, wlnum, mode, name, value in asim.stream(["neff"]):
+            print(fnum, wlnum, mode, name, value)
+        ng = await asim.value("ng", 0, 0, HE11, timeout=10)
+
+"""
+
+from .simulator import CancelToken
+from .psimulator import PSimulator
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import weakref
+
+
+class AsyncSimulator(object):
+
+    """asyncio wrapper of a :py:class:`~fibermodes.simulator.Simulator`.
+
+    Blocking computations are run on the given executor, which must be
+    a thread pool: solves share the fibers (and their caches) of the
+    wrapped simulator, which cannot be sent to other processes. To use
+    many processes, wrap a
+    :py:class:`~fibermodes.simulator.psimulator.PSimulator`: results of
+    :py:meth:`stream` are then computed by its worker processes, and the
+    executor only waits for them. :py:meth:`value` and :py:meth:`modes`
+    still are computed in this process.
+
+    Args:
+        simulator(Simulator): Wrapped simulator.
+        executor(concurrent.futures.ThreadPoolExecutor): Executor used
+            to run blocking computations (default: default executor of
+            the event loop).
+        maxqueue(int): Maximum number of records computed ahead of
+            the consumer of :py:meth:`stream`. This also is the number
+            of fibers streamed concurrently.
+
+    Raises:
+        TypeError: executor is not a thread pool.
+
+    """
+
+    def __init__(self, simulator, executor=None, maxqueue=64):
+        if not (executor is None or isinstance(executor, ThreadPoolExecutor)):
+            raise TypeError("executor must be a ThreadPoolExecutor "
+                            "(use a PSimulator for worker processes)")
+        self.simulator = simulator
+        self.executor = executor
+        self.maxqueue = maxqueue
+        self._locks = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._pending = {}  # key: [future, number of waiters]
+
+    def _fiberLock(self, fnum):
+        with self._lock:
+            fsim = self.simulator._fsims[fnum]
+            lock = self._locks.get(fsim)
+            if lock is None:
+                # Keyed by the _FSimulator, so that locks follow
+                # changes of fibers or wavelengths
+                lock = threading.Lock()
+                self._locks[fsim] = lock
+            return fsim, lock
+
+    async def _call(self, fnum, fct, *args):
+        """Run fct(fsim, *args) on the executor, holding the lock
+        of fiber fnum.
+
+        """
+        fsim, lock = self._fiberLock(fnum)
+
+        def job():
+            with lock:
+                return fct(fsim, *args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, job)
+
+    async def modes(self, fnum, wlnum):
+        """Set of modes of fiber fnum, at wavelength wlnum."""
+        return await self._call(fnum, _modes, wlnum)
+
+    async def value(self, name, fnum, wlnum, mode, timeout=None):
+        """Compute a single value.
+
+        Concurrent requests for the same value are de-duplicated.
+        Cancelling a request (or reaching its timeout) does not affect
+        other requests for the same value. The computation itself is
+        cancelled when no request is waiting for it anymore, unless it
+        already is running.
+
+        Args:
+            name(str): Name of the property (e.g. "neff", "cutoffWl").
+            fnum(int): Index of the fiber.
+            wlnum(int): Index of the wavelength.
+            mode(Mode): Mode.
+            timeout(float): Maximum time to wait, in seconds.
+
+        Raises:
+            asyncio.TimeoutError: Timeout was reached.
+
+        """
+        key = (self.simulator._fsims[fnum], name, wlnum, mode)
+        pending = self._pending.get(key)
+        if pending is None:
+            future = asyncio.ensure_future(
+                self._call(fnum, _value, name, wlnum, mode))
+            pending = self._pending[key] = [future, 0]
+            future.add_done_callback(lambda f: self._release(key, f))
+        future = pending[0]
+        pending[1] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            pending[1] -= 1
+            if pending[1] == 0 and not future.done():
+                future.cancel()
+
+    def _release(self, key, future):
+        if self._pending.get(key, [None])[0] is future:
+            del self._pending[key]
+        if not future.cancelled():
+            future.exception()  # Mark exception as retrieved
+
+    async def stream(self, names, timeout=None):
+        """Compute many properties, yielding each value as soon as it
+        is computed.
+
+        Leaving the loop (break, exception, or cancellation of the
+        task) cancels the computation.
+
+        Args:
+            names(list): Names of properties.
+            timeout(float): Maximum duration of the whole computation,
+                            in seconds.
+
+        Returns:
+            Asynchronous generator yielding (fnum, wlnum, mode, name,
+            value) records.
+
+        Raises:
+            asyncio.TimeoutError: Timeout was reached.
+
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        names = tuple(names)
+        if isinstance(self.simulator, PSimulator):
+            records = self._pstream(names)
+        else:
+            records = self._fstream(names)
+        try:
+            while True:
+                if deadline is None:
+                    record = await records.__anext__()
+                else:
+                    record = await asyncio.wait_for(
+                        records.__anext__(), max(0, deadline - loop.time()))
+                yield record
+        except StopAsyncIteration:
+            pass
+        finally:
+            await records.aclose()
+
+    async def _fstream(self, names):
+        """Stream fibers concurrently, each from its own generator.
+
+        A bounded number of producers take fibers one after the other,
+        so that fibers (and their simulators) are built only when they
+        are streamed.
+
+        """
+        queue = asyncio.Queue(self.maxqueue)
+        done = object()
+        nfibers = len(self.simulator.fibers)
+        fnums = iter(range(nfibers))
+
+        async def produce():
+            try:
+                for fnum in fnums:
+                    records = self.simulator._fsims[fnum].stream(names)
+                    while True:
+                        record = await self._call(fnum, _next, records)
+                        if record is None:
+                            break
+                        if record[1] is not None:
+                            await queue.put((fnum,) + record)
+                await queue.put(done)
+            except Exception as e:
+                await queue.put(e)
+
+        nproducers = nfibers
+        if self.maxqueue > 0:  # Otherwise, the queue is unbounded
+            nproducers = min(self.maxqueue, nfibers)
+        tasks = [asyncio.ensure_future(produce())
+                 for _ in range(nproducers)]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                record = await queue.get()
+                if record is done:
+                    remaining -= 1
+                elif isinstance(record, Exception):
+                    raise record
+                else:
+                    yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _pstream(self, names):
+        """Stream results of the worker processes of a PSimulator."""
+        cancel = CancelToken()
+        records = self.simulator.stream(names, cancel=cancel)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                record = await loop.run_in_executor(self.executor, next,
+                                                    records, None)
+                if record is None:
+                    break
+                yield record
+        finally:
+            cancel.cancel()  # Interrupts a running next()
+            if not records.gi_running:
+                records.close()
+
+
+def _modes(fsim, wlnum):
+    return fsim._findModes(wlnum)
+
+
+def _value(fsim, name, wlnum, mode):
+    fsim._findModes(wlnum)  # Same lowbounds as when streaming
+    lowbound = fsim._lowbound(mode, wlnum)
+    return fsim._value(name, mode, fsim._wavelengths[wlnum], lowbound)
+
+
+def _next(fsim, records):
+    return next(records, None)
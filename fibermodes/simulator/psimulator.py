@@ -1,41 +1,203 @@
-
-from .simulator import Simulator
-from multiprocessing import Pool
+from .simulator import Simulator, _FSimulator
+from multiprocessing import Process, Queue, Value
 from functools import partial
+from itertools import count
 import os
+import queue
+
+
+def _worker(fsims, tasks, results, cancelled):
+    """Worker process loop.
 
+    Each worker keeps its own copy of the fibers, and of the simulators
+    of the wavelength chunks it already computed. Therefore, caches
+    persist between requests of different properties.
 
-def applyf(fsim, name):
-    fct = getattr(fsim, name)
-    return fct(), fsim.__self__._fiber.ne_cache
+    Tasks of a run numbered at most cancelled.value are skipped.
+
+    """
+    chunks = {}
+    for run, name, args, fnum, start, stop in iter(tasks.get, None):
+        if run <= cancelled.value:
+            continue
+        try:
+            fsim = chunks.get((fnum, start, stop))
+            if fsim is None:
+                fsim = fsims[fnum]
+                if (start, stop) != (0, len(fsim._wavelengths)):
+                    fsim = _FSimulator(fsim._fiber,
+                                       fsim._wavelengths[start:stop],
+                                       fsim._numax, fsim._mmax,
+                                       fsim._vectorial, fsim._scalar,
+                                       fsim._delta)
+                chunks[(fnum, start, stop)] = fsim
+            if name == 'stream':
+                for record in fsim.stream(*args):
+                    if run <= cancelled.value:
+                        break
+                    results.put((run, fnum, start, record, None))
+                results.put((run, fnum, start, None, None))
+            else:
+                results.put((run, fnum, start, getattr(fsim, name)(*args),
+                             None))
+        except Exception as e:
+            results.put((run, fnum, start, None, e))
 
 
 class PSimulator(Simulator):
 
+    """Simulator computing fibers in parallel processes.
+
+    Worker processes are started at the first request, and kept alive
+    until the fibers or the wavelengths change, or until
+    :py:meth:`terminate` is called. Each fiber (or each chunk of
+    wavelengths, if there are fewer fibers than processes) always is
+    computed by the same worker, so that solver caches are reused
+    between properties.
+
+    Args:
+        processes(int): Number of processes (default: number of CPUs).
+
+    """
+
+    #: Maximum number of results waiting to be read.
+    MAXQUEUE = 1024
+
     def __init__(self, *args, **kwargs):
-        self.pool = None
+        self._workers = []
+        self._results = None
+        self._cancelled = Value('l', -1)
+        self._runs = count()
         self.numProcs = kwargs.pop("processes", 0) or os.cpu_count()
 
         super().__init__(*args, **kwargs)
 
+    def _build_fsims(self):
+        self.terminate()
+        super()._build_fsims()
+
+    def _chunks(self):
+        """List of (fnum, start, stop) tasks, in a fixed order."""
+        nwl = len(self.wavelengths)
+        nfibers = len(self._fsims)
+        n = min(nwl, max(1, -(-self.numProcs // nfibers)))
+        bounds = [i * nwl // n for i in range(n + 1)]
+        return [(fnum, bounds[i], bounds[i+1])
+                for fnum in range(nfibers) for i in range(n)]
+
+    def _start(self):
+        # Bounded, so that workers wait for a slow consumer
+        self._results = Queue(self.MAXQUEUE)
+        for _ in range(self.numProcs):
+            tasks = Queue()
+            p = Process(target=_worker,
+                        args=(self._fsims, tasks, self._results,
+                              self._cancelled),
+                        daemon=True)
+            p.start()
+            self._workers.append((p, tasks))
+
+    def compute(self, names):
+        return self._run('compute', tuple(names))
+
     def __getattr__(self, name):
-        def wrapper():
-            if self.pool is not None:
+        return partial(self._run, name)
+
+    def _submit(self, name, *args):
+        if not self._workers:
+            self._start()
+
+        run = next(self._runs)
+        chunks = self._chunks()
+        for i, (fnum, start, stop) in enumerate(chunks):
+            self._workers[i % len(self._workers)][1].put(
+                (run, name, args, fnum, start, stop))
+        return run, chunks
+
+    def _get(self):
+        """Next result, or None if none arrived within a short delay.
+
+        Raises:
+            RuntimeError: A worker process died. Workers are stopped,
+                and restarted at the next request.
+
+        """
+        try:
+            return self._results.get(timeout=0.1)
+        except queue.Empty:
+            pass
+        for p, _ in self._workers:
+            if not p.is_alive():
+                code = p.exitcode
                 self.terminate()
-            self.pool = Pool(self.numProcs)
+                raise RuntimeError(
+                    "Worker process died (exit code {})".format(code))
+        return None
 
-            r = self.pool.imap(partial(applyf, name=name), self._fsims)
-            for i, (res, ne_cache) in enumerate(r):
-                self.fibers[i].ne_cache = ne_cache
-                yield res
-            self.pool.close()
-            self.pool.join()
-            self.pool = None
+    def _stream(self, names, cancel):
+        run, chunks = self._submit('stream', names)
+        remaining = len(chunks)
+        try:
+            while remaining:
+                if cancel is not None and cancel.cancelled:
+                    return
+                result = self._get()
+                if result is None:
+                    continue
+                r, fnum, start, record, err = result
+                if r != run:
+                    continue  # Result from an interrupted request
+                if err is not None:
+                    raise err
+                if record is None:
+                    remaining -= 1
+                else:
+                    wlnum, mode, name, value = record
+                    yield fnum, start + wlnum, mode, name, value
+        finally:
+            if remaining:
+                self._cancelled.value = run
 
-        return wrapper
+    def _run(self, name, *args):
+        run, chunks = self._submit(name, *args)
+
+        # Results are merged as they arrive, and yielded in fiber order
+        pending = [0] * len(self._fsims)
+        for fnum, _, _ in chunks:
+            pending[fnum] += 1
+        values = [{} for _ in self._fsims]
+        fnum = 0
+        try:
+            while fnum < len(self._fsims):
+                if pending[fnum] == 0:
+                    yield [r for start in sorted(values[fnum])
+                           for r in values[fnum][start]]
+                    values[fnum] = None
+                    fnum += 1
+                    continue
+                result = self._get()
+                if result is None:
+                    continue
+                r, f, start, res, err = result
+                if r != run:
+                    continue  # Result from an interrupted request
+                if err is not None:
+                    raise err
+                values[f][start] = res
+                pending[f] -= 1
+        finally:
+            if fnum < len(self._fsims):
+                self._cancelled.value = run
 
     def terminate(self):
-        if self.pool is not None:
-            self.pool.terminate()
-            self.pool.join()
-            self.pool = None
+        """Stop worker processes."""
+        for p, tasks in self._workers:
+            p.terminate()
+        for p, tasks in self._workers:
+            p.join()
+        self._workers = []
+        self._results = None
+
+    def __del__(self):
+        if self.__dict__.get('_workers'):
+            self.terminate()
@@ -0,0 +1,102 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Columnar storage of simulation results.
+
+Values of each property are stored in a dense float64 array, indexed by
+(fiber, wavelength, mode). Modes are numbered in the order they are
+found. Values for modes that do not exist at a given fiber and
+wavelength are nan.
+
+"""
+
+import numpy
+
+
+class SimulationResult(object):
+
+    """Values of properties, for each fiber, wavelength, and mode.
+
+    Arrays returned by :py:meth:`__getitem__` and :py:meth:`get` are
+    views on the internal storage (no copy). They remain valid until
+    a new mode is added.
+
+    Args:
+        names(list): Names of properties.
+        nfibers(int): Number of fibers.
+        wavelengths(list): List of wavelengths.
+
+    """
+
+    def __init__(self, names, nfibers, wavelengths):
+        self.names = list(names)
+        self.nfibers = nfibers
+        self.wavelengths = numpy.array(wavelengths, dtype=float)
+        self.modes = []  # Mode index table
+        self.index = {}
+        shape = (nfibers, len(self.wavelengths), 0)
+        self._data = {name: numpy.empty(shape) for name in self.names}
+
+    def _modeIndex(self, mode):
+        try:
+            return self.index[mode]
+        except KeyError:
+            pass
+
+        k = len(self.modes)
+        for name, data in self._data.items():
+            if k == data.shape[2]:  # grow storage
+                F, W, M = data.shape
+                new = numpy.full((F, W, max(4, 2 * M)), numpy.nan)
+                new[:, :, :M] = data
+                self._data[name] = new
+        self.modes.append(mode)
+        self.index[mode] = k
+        return k
+
+    def set(self, fnum, wlnum, mode, name, value):
+        """Set a single value."""
+        k = self._modeIndex(mode)
+        self._data[name][fnum, wlnum, k] = value
+
+    def add(self, fnum, values):
+        """Set values of a fiber.
+
+        Args:
+            fnum(int): Index of the fiber.
+            values(list): List (one item per wavelength) of dict
+                          {mode: {name: value}}, as returned by
+                          :py:meth:`Simulator.compute`.
+
+        """
+        for wlnum, modes in enumerate(values):
+            for mode in sorted(modes):
+                k = self._modeIndex(mode)
+                for name, value in modes[mode].items():
+                    self._data[name][fnum, wlnum, k] = value
+
+    def __getitem__(self, name):
+        """Array of values of a property, indexed by (fiber, wavelength,
+        mode).
+
+        """
+        return self._data[name][:, :, :len(self.modes)]
+
+    def get(self, name, mode):
+        """Array of values of a property for a mode, indexed by
+        (fiber, wavelength).
+
+        """
+        return self._data[name][:, :, self.index[mode]]
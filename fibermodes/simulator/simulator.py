@@ -19,9 +19,13 @@ an array of parameters.
 """
 
 from fibermodes import FiberFactory, Wavelength, Mode, ModeFamily
+from fibermodes.fiber.tracker import NeffTracker
+from .result import SimulationResult
 from fibermodes.slrc import SLRC
 from functools import reduce, partial
 import operator
+import threading
+import time
 
 
 class _FSimulator(object):
@@ -31,6 +35,7 @@ class _FSimulator(object):
         self._fiber = fiber
         self._wavelengths = wavelengths
         self._modes = None
+        self._trackers = {}
 
         self._numax = numax
         self._mmax = mmax
@@ -39,22 +44,40 @@ class _FSimulator(object):
         self._delta = delta
 
     def modes(self):
-        if self._modes is None:
-            numax = self._numax
-            mmax = self._mmax
-            self._modes = [set() for _ in self._wavelengths]
-            for i, wl in enumerate(self._wavelengths):
-                if self._vectorial:
-                    self._modes[i] |= self._fiber.findVmodes(wl, numax, mmax)
-                if self._scalar:
-                    self._modes[i] |= self._fiber.findLPmodes(wl, numax, mmax)
-
-                numax = max(m.nu for m in self._modes[i])
-                mmax = [max((m.m for m in self._modes[i] if m.nu == nu),
-                            default=0)
-                        for nu in range(numax+1)]
+        for i in range(len(self._wavelengths)):
+            self._findModes(i)
         return self._modes
 
+    def _findModes(self, i):
+        """Modes at wavelength index i.
+
+        Modes are searched wavelength by wavelength, up to i, so that
+        results at the first wavelengths are available early.
+
+        """
+        if self._modes is None:
+            self._modes = []
+            self._nextmax = (self._numax, self._mmax)
+        while len(self._modes) <= i:
+            j = len(self._modes)
+            wl = self._wavelengths[j]
+            numax, mmax = self._nextmax
+            # Modes are enumerated from cutoffs when possible;
+            # neff is solved later, only for requested values
+            modes = set()
+            if self._vectorial:
+                modes |= self._fiber.guidedModes(wl, None, numax, mmax)
+            if self._scalar:
+                modes |= self._fiber.guidedModes(wl, (ModeFamily.LP,),
+                                                 numax, mmax)
+            self._modes.append(modes)
+
+            numax = max(m.nu for m in modes)
+            mmax = [max((m.m for m in modes if m.nu == nu), default=0)
+                    for nu in range(numax+1)]
+            self._nextmax = (numax, mmax)
+        return self._modes[i]
+
     def cutoff(self):
         co = [{} for _ in self._wavelengths]
         for i, wl in enumerate(self._wavelengths):
@@ -95,10 +118,68 @@ class _FSimulator(object):
     def beta3(self):
         return self._beta(3)
 
+    def compute(self, names):
+        """Compute many properties in a single pass over modes.
+
+        Returns:
+            List (one item per wavelength) of dict {mode: {name: value}}.
+
+        """
+        r = [{} for _ in self._wavelengths]
+        for i, wl in enumerate(self._wavelengths):
+            for m in self._findModes(i):
+                lowbound = self._lowbound(m, i)
+                r[i][m] = {name: self._value(name, m, wl, lowbound)
+                           for name in names}
+        return r
+
+    def stream(self, names):
+        """Yield (wlnum, mode, name, value) records, as soon as they are
+        computed. A record with mode None marks the end of a wavelength.
+
+        """
+        for i, wl in enumerate(self._wavelengths):
+            for m in sorted(self._findModes(i)):
+                lowbound = self._lowbound(m, i)
+                for name in names:
+                    yield i, m, name, self._value(name, m, wl, lowbound)
+            yield i, None, None, None
+
+    def _value(self, name, mode, wl, lowbound):
+        if name == 'cutoff':
+            return self._fiber.cutoff(mode)
+        if name == 'cutoffWl':
+            return self._fiber.toWl(self._fiber.cutoff(mode))
+        if name.startswith('beta') and name[4:].isdigit():
+            return self._fiber.beta(wl.omega, mode, p=int(name[4:]),
+                                    delta=self._delta, lowbound=lowbound)
+        fct = getattr(self._fiber, name)
+        return fct(mode, wl, delta=self._delta, lowbound=lowbound)
+
     def _neff(self, mode, wlidx):
-        lowbound = self._lowbound(mode, wlidx)
+        """Effective index of mode at wavelength index wlidx.
+
+        Modes are followed from the previous wavelength only when
+        their effective index is needed: the lowbound solves the
+        previous wavelength first, which feeds the tracker.
+
+        """
         wl = self._wavelengths[wlidx]
-        return self._fiber.neff(mode, wl, delta=self._delta, lowbound=lowbound)
+        try:
+            neff = self._fiber.ne_cache[wl][mode]
+        except KeyError:
+            lowbound = self._lowbound(mode, wlidx)
+            return self._tracker(mode)(wl, lowbound)
+        self._tracker(mode).add(wl, neff)
+        return neff
+
+    def _tracker(self, mode):
+        try:
+            return self._trackers[mode]
+        except KeyError:
+            tracker = NeffTracker(self._fiber, mode, self._delta)
+            self._trackers[mode] = tracker
+            return tracker
 
     def _Veff(self, mode, i):
         ve = [{} for _ in self._wavelengths]
@@ -146,6 +227,90 @@ class _FSimulator(object):
         return getattr(super(), name)
 
 
+class _Lazy(object):
+
+    """Sequence of n items, built by build(i) when first accessed."""
+
+    def __init__(self, n, build):
+        self._n = n
+        self._build = build
+        self._items = {}
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError(index)
+        try:
+            return self._items[index]
+        except KeyError:
+            return self._items.setdefault(index, self._build(index))
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self[i]
+
+
+def _fsimulator(fibers, wavelengths, numax, mmax, vectorial, scalar, delta,
+                fnum):
+    return _FSimulator(fibers[fnum], wavelengths, numax, mmax,
+                       vectorial, scalar, delta)
+
+
+class Progress(object):
+
+    """Progress of a simulation, reported by :py:meth:`Simulator.stream`.
+
+    Attributes:
+        total(int): Number of (fiber, wavelength) to compute.
+        done(int): Number of (fiber, wavelength) completed.
+        values(int): Number of values computed.
+
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.values = 0
+        self._start = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """Elapsed time, in seconds."""
+        return time.monotonic() - self._start
+
+    @property
+    def eta(self):
+        """Estimated remaining time, in seconds, from the mean time of
+        completed (fiber, wavelength).
+
+        """
+        if self.done == 0:
+            return float("nan")
+        return self.elapsed / self.done * (self.total - self.done)
+
+
+class CancelToken(object):
+
+    """Token used to cancel :py:meth:`Simulator.stream` from another
+    thread.
+
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
 class Simulator(object):
 
     """The Simulator links :py:class:`~fibermodes.fiber.factory.FiberFactory`
@@ -198,11 +363,13 @@ class Simulator(object):
 
     def _build_fsims(self):
         if self.initialized:
-            self._fsims = tuple(_FSimulator(fiber, self._wavelengths,
-                                            self.numax, self.mmax,
-                                            self.vectorial, self.scalar,
-                                            self.delta)
-                                for fiber in self._fibers)
+            # Simulators are built when first needed
+            self._fsims = _Lazy(len(self._fibers),
+                                partial(_fsimulator, self._fibers,
+                                        self._wavelengths,
+                                        self.numax, self.mmax,
+                                        self.vectorial, self.scalar,
+                                        self.delta))
 
     def set_wavelengths(self, value):
         """Set the list of wavelengths.
@@ -231,7 +398,9 @@ class Simulator(object):
             factory = FiberFactory(factory)
         self.factory = factory
         if factory is not None:
-            self._fibers = tuple(iter(factory))
+            # Fibers are built when first needed, and then kept
+            space = factory.space()
+            self._fibers = _Lazy(len(space), space.__getitem__)
             self._build_fsims()
 
     @property
@@ -307,6 +476,77 @@ class Simulator(object):
         """Whether FiberFactory and wavelengths are set."""
         return not (self._fibers is None or self._wavelengths is None)
 
+    def compute(self, names):
+        """Compute many properties in a single pass.
+
+        Modes, effective indexes and derivatives are computed once,
+        and shared by all properties.
+
+        Args:
+            names(list): Names of properties (e.g. ["neff", "ng", "D",
+                         "cutoffWl"]).
+
+        Returns:
+            Generator yielding, for each fiber, a list (one item per
+            wavelength) of dict {mode: {name: value}}.
+
+        """
+        for fsim in self._fsims:
+            yield fsim.compute(names)
+
+    def stream(self, names, progress=None, cancel=None):
+        """Compute many properties, yielding each value as soon as it
+        is computed.
+
+        Values are computed while the generator is consumed. Therefore,
+        a slow consumer also slows the computation.
+
+        Args:
+            names(list): Names of properties.
+            progress(function): Called with a :py:class:`Progress`
+                                object, each time a (fiber, wavelength)
+                                is completed.
+            cancel(CancelToken): Stop the computation when cancelled
+                                 (e.g. from another thread).
+
+        Returns:
+            Generator yielding (fnum, wlnum, mode, name, value) records.
+
+        """
+        prog = Progress(len(self.fibers) * len(self.wavelengths))
+        for fnum, wlnum, mode, name, value in self._stream(names, cancel):
+            if cancel is not None and cancel.cancelled:
+                return
+            if mode is None:
+                prog.done += 1
+                if progress is not None:
+                    progress(prog)
+            else:
+                prog.values += 1
+                yield fnum, wlnum, mode, name, value
+
+    def _stream(self, names, cancel):
+        for fnum, fsim in enumerate(self._fsims):
+            for record in fsim.stream(names):
+                yield (fnum,) + record
+                if cancel is not None and cancel.cancelled:
+                    return
+
+    def result(self, names):
+        """Compute many properties, and store them in arrays.
+
+        Args:
+            names(list): Names of properties.
+
+        Returns:
+            :py:class:`~fibermodes.simulator.result.SimulationResult`
+
+        """
+        result = SimulationResult(names, len(self.fibers), self.wavelengths)
+        for fnum, values in enumerate(self.compute(names)):
+            result.add(fnum, values)
+        return result
+
     def __getattr__(self, name):
         def wrapper():
             for fsim in self._fsims:
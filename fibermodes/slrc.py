@@ -24,6 +24,28 @@ be either a scalar (float), a list of floats, a range, or a function (code).
 import math
 import logging
 import numpy
+from functools import lru_cache
+from types import SimpleNamespace
+
+
+def _numpyMath():
+    """Namespace of numpy ufuncs and constants mirroring `math` names.
+
+    Only functions with the same meaning in both modules are included;
+    other `math` functions (e.g. `factorial`) are missing, and code
+    using them is evaluated element-wise.
+
+    """
+    names = {}
+    for name in dir(math):
+        if name.startswith('_') or name == 'remainder':
+            continue  # numpy.remainder is the modulo, not IEEE remainder
+        value = getattr(math, name)
+        if isinstance(value, float):
+            names[name] = value
+        elif isinstance(getattr(numpy, name, None), numpy.ufunc):
+            names[name] = getattr(numpy, name)
+    return SimpleNamespace(**names)
 
 
 class SLRC(object):
@@ -90,6 +112,9 @@ class SLRC(object):
         'math': math
     }
 
+    #: Globals for vectorized code, where math functions are numpy ufuncs.
+    nglobals = dict(rglobals, math=_numpyMath())
+
     def __init__(self, value=0):
         self.codeParams = None
         SLRC.value.fset(self, value)
@@ -117,16 +142,64 @@ class SLRC(object):
             else:
                 return []
         elif k == 'code':
-            cp = ", ".join(self.codeParams) + ", " if self.codeParams else ""
-            code = "def f({}*args, **kwargs):\n".format(cp)
-            for line in self._value.splitlines():
-                code += "    {}\n".format(line)
-            loc = {}
-            exec(code, self.rglobals, loc)
-            return loc['f']
+            return self._function(False)
         else:
             return self._value
 
+    def _function(self, vectorized):
+        params = tuple(self.codeParams) if self.codeParams else ()
+        return _compile(self._value, params, vectorized)
+
+    def array(self, *args, **kwargs):
+        """Return values as a numpy array.
+
+        For code, the function is called once with the given arguments,
+        which can be numpy arrays (e.g. a whole sweep axis). In the code,
+        `math` functions then are the numpy ufuncs of the same name, so
+        that functions like `math.sqrt` are applied element-wise.
+        If this call fails, or does not return one value per element of
+        the broadcast arguments (e.g. code using `math.factorial`, or
+        comparing its arguments), the code is called for each element.
+
+        Returns:
+            numpy.ndarray
+
+        """
+        k = self.kind
+        if k == 'code':
+            shape = numpy.broadcast(*args, *kwargs.values()).shape
+            try:
+                r = numpy.asarray(self._function(True)(*args, **kwargs),
+                                  dtype=float)
+                if r.shape == shape:
+                    return r
+            except Exception as e:
+                self.logger.debug("Vectorized code failed: {}".format(e))
+            return self._elementwise(shape, *args, **kwargs)
+        elif k == 'range':
+            low = self._value['start']
+            high = self._value['end']
+            n = self._value['num']
+            if n > 1:
+                # Same operations as value, for identical results
+                return low + numpy.arange(n) * (high - low) / (n - 1)
+            return numpy.full(n, low, dtype=float)
+        elif k == 'list':
+            return numpy.array(self._value, dtype=float)
+        else:
+            return numpy.array([self._value], dtype=float)
+
+    def _elementwise(self, shape, *args, **kwargs):
+        f = self._function(False)
+        keys = list(kwargs)
+        arrays = numpy.broadcast_arrays(*args, *kwargs.values())
+        r = numpy.empty(shape)
+        for index in numpy.ndindex(shape):
+            values = [a[index].item() for a in arrays]
+            r[index] = f(*values[:len(args)],
+                         **dict(zip(keys, values[len(args):])))
+        return r
+
     @value.setter
     def value(self, value):
         if isinstance(value, SLRC):
@@ -289,3 +362,15 @@ class SLRC(object):
             return self.value(*args, **kwargs)
         else:
             return self.value
+
+
+@lru_cache(maxsize=1024)
+def _compile(source, params, vectorized):
+    """Compile code into a function, only once for given arguments."""
+    cp = ", ".join(params) + ", " if params else ""
+    code = "def f({}*args, **kwargs):\n".format(cp)
+    for line in source.splitlines():
+        code += "    {}\n".format(line)
+    loc = {}
+    exec(code, SLRC.nglobals if vectorized else SLRC.rglobals, loc)
+    return loc['f']
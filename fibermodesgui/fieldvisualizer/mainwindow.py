@@ -10,11 +10,6 @@ import numpy
 
 class FieldVisualizer(AppWindow):
 
-    # TODO: cache field objects. Recompute fields only when needed:
-    # - np changed
-    # - r changed
-    # - (phase, oriendation, amplitude): compute only image
-
     def __init__(self, parent):
         super().__init__(parent)
         self.setWindowTitle(self.tr("Field Visualizer"))
@@ -67,6 +62,8 @@ class FieldVisualizer(AppWindow):
 
         self.__layers = None
         self.__quiver = []
+        self.__fieldobj = {}
+        self.__fieldparams = None
         self.initFields()
 
         self.graph = pg.PlotWidget()
@@ -106,11 +103,26 @@ class FieldVisualizer(AppWindow):
                     kwargs.pop(f)  # Do not recompute if already computed
 
         for m, p, t, a in self.modes:
-            field = self.fiber.field(m, self.wl, r, np)
+            field = self.getField(m, r, np)
             for f in Field.FTYPES:
                 if kwargs.get(f, False):
                     self.__field[f] += getattr(field, f)(p, t) * a
 
+    def getField(self, mode, r, np):
+        """Get Field object for given mode.
+
+        Field objects are kept, since they cache the radial field profile.
+        Therefore, changing phase, orientation, or amplitude of a mode
+        does not need to recompute the fields.
+
+        """
+        if self.__fieldparams != (r, np):
+            self.__fieldobj = {}
+            self.__fieldparams = (r, np)
+        if mode not in self.__fieldobj:
+            self.__fieldobj[mode] = self.fiber.field(mode, self.wl, r, np)
+        return self.__fieldobj[mode]
+
     def plotLayers(self, state):
         if self.__layers is None:
             vr = self.graph.viewRect()
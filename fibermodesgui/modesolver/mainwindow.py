@@ -306,7 +306,7 @@ class ModeSolver(AppWindow):
         self.setCentralWidget(self.splitter)
 
         self.doc.computeStarted.connect(self.initProgressBar)
-        self.doc.valueAvailable.connect(self.updateProgressBar)
+        self.doc.progressChanged.connect(self.updateProgressBar)
         self.doc.computeFinished.connect(self.stopProgressBar)
 
     def _parametersFrame(self):
@@ -609,18 +609,13 @@ class ModeSolver(AppWindow):
         self.timer.start(0)
         self.actions['exportcur'].setEnabled(False)
 
-    def updateProgressBar(self):
-        tot = self.progressBar.maximum()
-        if tot == 0:
-            tot = self.doc.toCompute + 1
-            self.progressBar.setMaximum(tot)
-        self.progressBar.setValue(self.progressBar.value() + 1)
+    def updateProgressBar(self, done, total):
+        self.progressBar.setMaximum(total)
+        self.progressBar.setValue(done)
         elapsed = self.time.elapsed()
         self.estimation = elapsed
-        if self.doc.toCompute > 0:
-            done = self.progressBar.value()
-            if done:
-                self.estimation = tot * (elapsed / done)
+        if done:
+            self.estimation = total * (elapsed / done)
 
     def stopProgressBar(self):
         tot = self.progressBar.maximum()
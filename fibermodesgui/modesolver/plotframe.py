@@ -18,6 +18,7 @@ import pyqtgraph as pg
 from fibermodesgui import blockSignals
 from fibermodesgui.widgets.delegate import ComboItemDelegate
 from fibermodes import ModeFamily
+import numpy
 
 
 FIBERS, WAVELENGTHS, VNUMBER, MODES = range(4)
@@ -399,30 +400,23 @@ class PlotFrame(QtGui.QFrame):
         except IndexError:
             nf = ''
 
-        y = {}
+        result = self.doc.result
+        if result is None or what >= len(result.names):
+            return
+        X = numpy.asarray(self.X)
         if xaxis == FIBERS:
-            for (f, w, m, j), v in self.doc.values.items():
-                if j == what and w == self._wl:
-                    if m in y:
-                        y[m].append((f+1, v))
-                    else:
-                        y[m] = [(f+1, v)]
+            data = result[result.names[what]][:, self._wl, :]
         else:
-            for (f, w, m, j), v in self.doc.values.items():
-                if j == what and f == self._fnum:
-                    if m in y:
-                        y[m].append((w, v))
-                    else:
-                        y[m] = [(w, v)]
-
-        for m, xy in y.items():
+            data = result[result.names[what]][self._fnum, :, :]
+            if xaxis == VNUMBER:
+                X = X[::-1]
+
+        for k, m in enumerate(result.modes):
             if self.doc.selection.get(m, 1) == 0:
                 continue
-            X, Y = zip(*sorted(xy))
-            if xaxis == VNUMBER:
-                X = [self.X[-x-1] for x in X]
-            elif xaxis == WAVELENGTHS:
-                X = [self.X[x] for x in X]
+            Y = data[:, k]
+            if numpy.isnan(Y).all():
+                continue
 
             col = m.color()
             symb = MARKM[m.family] if mark == 'Mode' else mark
@@ -431,12 +425,10 @@ class PlotFrame(QtGui.QFrame):
                            width=3 if m in self._modesel else 1)
             spen = pg.mkPen(color='w', width=2 if m in self._modesel else 1)
             name = str(m) if nr == 1 else "{} ({})".format(str(m), nf)
-            self.plot.plot(X, Y, pen=pen, symbol=symb,
+            self.plot.plot(X, Y, pen=pen, symbol=symb, connect='finite',
                            symbolBrush=symbb, symbolPen=spen, name=name)
-            miny = min(Y)
-            maxy = max(Y)
-            self.miny = min(miny, self.miny)
-            self.maxy = max(maxy, self.maxy)
+            self.miny = min(numpy.nanmin(Y), self.miny)
+            self.maxy = max(numpy.nanmax(Y), self.maxy)
 
     def plotCutoffs(self):
         xaxis = self.xAxisSelector.currentIndex()
@@ -444,10 +436,14 @@ class PlotFrame(QtGui.QFrame):
             index = self.doc.params.index("cutoff (wavelength)")
         else:
             index = self.doc.params.index("cutoff (V)")
-        for (f, w, m, j), v in self.doc.values.items():
+        result = self.doc.result
+        if result is None or index >= len(result.names):
+            return
+        values = result[result.names[index]][self._fnum, 0, :]
+        for m, v in zip(result.modes, values):
             if self.doc.selection.get(m, 1) == 0:
                 continue
-            if j == index and f == self._fnum and w == 0:
+            if not numpy.isnan(v):
                 if self.X[0] < v < self.X[-1]:
                     col = m.color()
                     self.plot.addLine(
@@ -1,6 +1,7 @@
 
 from PyQt4 import QtCore
 from fibermodes import FiberFactory, Simulator, PSimulator, Mode
+from fibermodes.simulator import SimulationResult, CancelToken
 import csv
 
 
@@ -9,6 +10,7 @@ class SolverDocument(QtCore.QThread):
     computeStarted = QtCore.pyqtSignal()
     modesAvailable = QtCore.pyqtSignal(int)  # fiber num
     valueAvailable = QtCore.pyqtSignal(int, int, object, int)
+    progressChanged = QtCore.pyqtSignal(int, int)  # done, total
     computeFinished = QtCore.pyqtSignal()
 
     def __init__(self, parent):
@@ -19,8 +21,8 @@ class SolverDocument(QtCore.QThread):
         self._params = []
         # self.numfibers = 0
 
-        self.toCompute = 0
         self.values = {}
+        self.result = None
         self.modes = []
         self.selection = {}
 
@@ -28,21 +30,22 @@ class SolverDocument(QtCore.QThread):
         self._numProcs = 0
         self.running = False
         self.ready = False
-
-        self.PARAMFCT = {
-            "cutoff (V)": self.simulator.cutoff,
-            "cutoff (wavelength)": self.simulator.cutoffWl,
-            "neff": self.simulator.neff,
-            "b": self.simulator.b,
-            "vp": self.simulator.vp,
-            "beta0": self.simulator.beta0,
-            "ng": self.simulator.ng,
-            "vg": self.simulator.vg,
-            "beta1": self.simulator.beta1,
-            "D": self.simulator.D,
-            "beta2": self.simulator.beta2,
-            "S": self.simulator.S,
-            "beta3": self.simulator.beta3}
+        self._cancel = None
+
+        self.PARAMNAME = {
+            "cutoff (V)": "cutoff",
+            "cutoff (wavelength)": "cutoffWl",
+            "neff": "neff",
+            "b": "b",
+            "vp": "vp",
+            "beta0": "beta0",
+            "ng": "ng",
+            "vg": "vg",
+            "beta1": "beta1",
+            "D": "D",
+            "beta2": "beta2",
+            "S": "S",
+            "beta3": "beta3"}
 
     @property
     def initialized(self):
@@ -148,33 +151,46 @@ class SolverDocument(QtCore.QThread):
     def run(self):
         self.modes = []
         self.values = {}
-        self.toCompute = 0
+        self.result = None
         self.running = True
-        for fnum, resultf in enumerate(self.simulator.modes()):
-            self.modes.append(resultf)
-            self.modesAvailable.emit(fnum)
-            self.toCompute += sum(len(rw) for rw in resultf)
-        self.toCompute *= len(self.params)
-
-        if self.toCompute > 0:
-            self.computeStarted.emit()
-
-            for j, p in enumerate(self.params):
-                fct = self.PARAMFCT[p]
-
-                for fnum, resultf in enumerate(fct()):
-                    if not self.running:
-                        self.simulator.terminate()
-                        return
-                    for wlnum, resultw in enumerate(resultf):
-                        for mode, value in resultw.items():
-                            self.values[(fnum, wlnum, mode, j)] = value
-                            self.valueAvailable.emit(fnum, wlnum, mode, j)
-                            self.toCompute -= 1
-            self.computeFinished.emit()
+
+        names = [self.PARAMNAME[p] for p in self.params]
+        if not names:
+            # Nothing to compute: only list modes
+            for fnum, resultf in enumerate(self.simulator.modes()):
+                self.modes.append(resultf)
+                self.modesAvailable.emit(fnum)
+            return
+
+        self.computeStarted.emit()
+        index = {name: j for j, name in enumerate(names)}
+        self.result = SimulationResult(names, len(self.fibers),
+                                       self.wavelengths)
+        self._cancel = CancelToken()
+        for fnum, wlnum, mode, name, value in self.simulator.stream(
+                names, progress=self._progress, cancel=self._cancel):
+            while len(self.modes) <= fnum:
+                self.modes.append([set() for _ in self.wavelengths])
+            modes = self.modes[fnum][wlnum]
+            if mode not in modes:
+                # New set, since the GUI thread may be reading the old one
+                self.modes[fnum][wlnum] = modes | {mode}
+                self.modesAvailable.emit(fnum)
+            j = index[name]
+            self.result.set(fnum, wlnum, mode, name, value)
+            self.values[(fnum, wlnum, mode, j)] = value
+            self.valueAvailable.emit(fnum, wlnum, mode, j)
+        if not self.running:
+            return
+        self.computeFinished.emit()
+
+    def _progress(self, progress):
+        self.progressChanged.emit(progress.done, progress.total)
 
     def stop_thread(self):
         self.running = False
+        if self._cancel is not None:
+            self._cancel.cancel()
         self.wait()
 
     def clear_all_caches(self):
@@ -183,10 +199,16 @@ class SolverDocument(QtCore.QThread):
         """
         self.modes = []
         self.values = {}
+        self.result = None
+        if isinstance(self.simulator, PSimulator):
+            self.simulator.terminate()  # workers hold their own caches
         for fiber in self.simulator.fibers:
             fiber.co_cache = {Mode("HE", 1, 1): 0,
                               Mode("LP", 0, 1): 0}
             fiber.ne_cache = {}
+            fiber.dn_cache = {}
+            fiber.beta_cache = {}
+            fiber.field_cache.clear()
 
     def export(self, filename, wlnum, fnum):
         with open(filename, 'w', newline='') as csvfile:
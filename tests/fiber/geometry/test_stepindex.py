@@ -18,6 +18,9 @@
 import unittest
 
 from fibermodes.fiber.geometry.stepindex import StepIndex
+from fibermodes.fiber.material import Silica
+from fibermodes import Wavelength
+import numpy
 
 
 class TestStepIndex(unittest.TestCase):
@@ -40,6 +43,26 @@ class TestStepIndex(unittest.TestCase):
         self.assertEqual(geom.index(10e-6, 1550e-9), 1.444)
         self.assertIsNone(geom.index(2e-6, 1550e-9))
 
+    def testIndexCache(self):
+        geom = StepIndex(0, 4e-6, m="SiO2GeO2", mp=(0.05,))
+        wl = Wavelength(1550e-9)
+        n = geom.maxIndex(wl)
+        self.assertEqual(geom._ncache, {wl: n})
+        geom._ncache[wl] = 1.5
+        self.assertEqual(geom.index(0, wl), 1.5)
+        self.assertEqual(geom.minIndex(1550e-9), 1.5)
+
+        wls = numpy.array([1300e-9, 1550e-9])
+        self.assertEqual(geom.maxIndex(wls).tolist(),
+                         [geom._m.n(1300e-9, 0.05), n])
+        self.assertEqual(len(geom._ncache), 1)
+
+        geom = StepIndex(0, 4e-6, m="Silica", mp=())
+        for i in range(geom.NCACHE + 10):
+            self.assertEqual(geom.maxIndex(1e-6 + i * 1e-9),
+                             Silica.n(1e-6 + i * 1e-9))
+        self.assertLessEqual(len(geom._ncache), geom.NCACHE)
+
 
 if __name__ == "__main__":
     import os
@@ -0,0 +1,86 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fiber.geometry.supergaussian module"""
+
+import unittest
+
+from fibermodes.fiber.geometry.supergaussian import SuperGaussian
+from fibermodes import FiberFactory, Mode, Wavelength
+import numpy
+
+
+class TestSuperGaussian(unittest.TestCase):
+
+    """Test suite for SuperGaussian class"""
+
+    def setUp(self):
+        self.wl = Wavelength(1550e-9)
+
+    def testIndexp(self):
+        for m in (1, 2):
+            geom = SuperGaussian(0, 8e-6, 0, 3e-6, m, m="Fixed",
+                                 mp=(1.454,), cm="Fixed", cmp=(1.444,))
+            for r in (1e-6, 3e-6, 5e-6):
+                dr = 1e-10
+                npr = (geom.index(r + dr, self.wl) -
+                       geom.index(r - dr, self.wl)) / (2 * dr)
+                self.assertAlmostEqual(geom.indexp(r, self.wl) / npr, 1,
+                                       delta=1e-5)
+                n, np = geom._profile(numpy.array([r]), self.wl)
+                self.assertAlmostEqual(n[0], geom.index(r, self.wl))
+                self.assertAlmostEqual(np[0], geom.indexp(r, self.wl))
+
+    def testPropagate(self):
+        geom = SuperGaussian(0, 8e-6, 0, 3e-6, 1, m="Fixed",
+                             mp=(1.454,), cm="Fixed", cmp=(1.444,))
+        neffs = numpy.array([1.445, 1.449, 1.453])
+        for nu in (0, 1, 3):
+            EH = geom.propagate(nu, neffs, self.wl)
+            self.assertEqual(EH.shape, (3, 4, 2))
+            for neff, eh in zip(neffs, EH):
+                if nu == 0:
+                    for j, tm in ((0, True), (1, False)):
+                        e = geom.EH_fields(0, 8e-6, nu, neff, self.wl,
+                                           numpy.empty(4), tm)
+                        numpy.testing.assert_allclose(e, eh[:, j],
+                                                      rtol=1e-12)
+                else:
+                    e = geom.EH_fields(0, 8e-6, nu, neff, self.wl,
+                                       numpy.empty((4, 2)))
+                    numpy.testing.assert_allclose(e, eh, rtol=1e-12)
+        self.assertEqual(len(geom._gcache), 3)
+
+    def testHomogeneousNeff(self):
+        """Very large width: same as step-index fiber."""
+        fibers = []
+        for geometry, tparams in (("StepIndex", []),
+                                  ("SuperGaussian", [0, 1, 1])):
+            f = FiberFactory()
+            f.addLayer(radius=8e-6, geometry=geometry, tparams=tparams,
+                       index=1.454)
+            f.addLayer(index=1.444)
+            fibers.append(f[0])
+        for mode in (Mode('HE', 1, 1), Mode('TE', 0, 1), Mode('TM', 0, 1),
+                     Mode('EH', 1, 1)):
+            self.assertAlmostEqual(fibers[1].neff(mode, self.wl),
+                                   fibers[0].neff(mode, self.wl),
+                                   delta=1e-9)
+
+
+if __name__ == "__main__":
+    import os
+    os.chdir('../..')
+    unittest.main()
@@ -19,6 +19,7 @@ import unittest
 
 from fibermodes import Wavelength
 from fibermodes.fiber.material import Silica
+import numpy
 
 
 class TestSilica(unittest.TestCase):
@@ -29,6 +30,13 @@ class TestSilica(unittest.TestCase):
         self.assertAlmostEqual(Silica.n(Wavelength(0.5876e-6)), 1.45846, 5)
         self.assertAlmostEqual(Silica.n(Wavelength(1.55e-6)), 1.44402, 5)
 
+    def testArray(self):
+        wls = numpy.linspace(0.5e-6, 1.6e-6, 12)
+        n = Silica.n(wls)
+        self.assertEqual(n.shape, wls.shape)
+        for wl, n_ in zip(wls, n):
+            self.assertEqual(n_, Silica.n(wl))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -19,7 +19,9 @@ import unittest
 import warnings
 
 from fibermodes import Wavelength
-from fibermodes.fiber.material import Silica, Germania, SiO2GeO2
+from fibermodes.fiber.material import Silica, Germania, SiO2GeO2, SiO2F
+from fibermodes.fiber.material import Fixed, Air
+import numpy
 
 
 class TestSiO2GeO2(unittest.TestCase):
@@ -55,6 +57,15 @@ class TestSiO2GeO2(unittest.TestCase):
         self.assertAlmostEqual(SiO2GeO2.n(Wavelength(1.55e-6), 0.2),
                                1.473791249750968)
 
+    def testArray(self):
+        wls = numpy.linspace(1.0e-6, 1.6e-6, 7)
+        for M, args in ((SiO2GeO2, (0.05,)), (SiO2F, (0.01,)),
+                        (Fixed, (1.45,)), (Air, ())):
+            n = M.n(wls, *args)
+            self.assertEqual(n.shape, wls.shape)
+            for wl, n_ in zip(wls, n):
+                self.assertEqual(n_, M.n(wl, *args))
+
     def testXFromN(self):
         self.assertAlmostEqual(
             SiO2GeO2.xFromN(Wavelength(1.55e-6), 1.451526777142772),
@@ -0,0 +1,72 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.fiber.solver.batch module."""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode, Wavelength
+from fibermodes.fiber.solver import batch
+from math import isnan
+
+
+class TestBatch(unittest.TestCase):
+
+    """Test suite for batch solver."""
+
+    def setUp(self):
+        self.f = FiberFactory()
+        self.f.addLayer(radius=4e-6, index=1.4489)
+        self.f.addLayer(radius=10e-6, index=1.4474)
+        self.f.addLayer(index=1.4444)
+
+    def testCompareMLSIF(self):
+        fiber = self.f[0]
+        self.f.setSolvers(Neff=batch.Neff)
+        bfiber = self.f[0]
+        self.assertIsInstance(bfiber._neff, batch.Neff)
+
+        wl = Wavelength(1550e-9)
+        for mode in (Mode('HE', 1, 1), Mode('EH', 1, 1), Mode('HE', 2, 1),
+                     Mode('TE', 0, 1), Mode('TM', 0, 1), Mode('LP', 0, 1),
+                     Mode('LP', 1, 1)):
+            self.assertAlmostEqual(bfiber.neff(mode, wl, delta=1e-5),
+                                   fiber.neff(mode, wl, delta=1e-5))
+
+    def testCacheAllModes(self):
+        self.f.setSolvers(Neff=batch.Neff)
+        fiber = self.f[0]
+        wl = Wavelength(1300e-9)
+
+        fiber.neff(Mode('HE', 1, 1), wl)
+        cache = fiber.ne_cache[wl]
+        for mode in (Mode('EH', 1, 1), Mode('HE', 1, 2)):
+            self.assertIn(mode, cache)
+            self.assertFalse(isnan(cache[mode]))
+        self.assertTrue(any(isnan(neff) for neff in cache.values()))
+
+    def testThreads(self):
+        self.f.setSolvers(Neff=batch.Neff)
+        fiber1 = self.f[0]
+        fiber4 = self.f[0]
+        fiber4._neff.nthreads = 4
+
+        wl = Wavelength(1300e-9)
+        modes = fiber1.solveAll(wl)
+        self.assertEqual(modes, fiber4.solveAll(wl))
+
+
+if __name__ == "__main__":
+    unittest.main()
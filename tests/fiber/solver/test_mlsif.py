@@ -0,0 +1,114 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.fiber.solver.mlsif module."""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode, ModeFamily, Wavelength
+from math import isnan
+import numpy
+
+
+class TestMLSIF(unittest.TestCase):
+
+    """Test suite for multi-layers step-index fibers."""
+
+    def setUp(self):
+        f = FiberFactory()
+        f.addLayer(radius=2e-6, index=1.4444)
+        f.addLayer(radius=5e-6, index=1.4604)
+        f.addLayer(radius=7e-6, index=1.4474)
+        f.addLayer(index=1.4444)
+        self.fiber = f[0]
+
+    def testVectorizedCeq(self):
+        solver = self.fiber._neff
+        wls = [Wavelength(1.3e-6), Wavelength(1.55e-6)]
+        X = numpy.array([numpy.linspace(1.4450, 1.4600, 7)] * 2)
+        for mode, fct in ((Mode('LP', 0, 1), solver._lpceq),
+                          (Mode('LP', 2, 1), solver._lpceq),
+                          (Mode('TE', 0, 1), solver._teceq),
+                          (Mode('TM', 0, 1), solver._tmceq),
+                          (Mode('HE', 1, 1), solver._heceq),
+                          (Mode('EH', 2, 1), solver._heceq)):
+            F = solver._vceq(mode, wls)(X, numpy.arange(2))
+            for i, wl in enumerate(wls):
+                for j, neff in enumerate(X[i]):
+                    self.assertAlmostEqual(
+                        F[i, j] / fct(neff, wl, mode.nu), 1, delta=1e-9)
+
+    def testPreparedCeq(self):
+        solver = self.fiber._neff
+        for wl in (Wavelength(1.3e-6), Wavelength(1.55e-6)):
+            for neff in numpy.linspace(1.4450, 1.4600, 7):
+                for nu, fct, pfct in ((0, solver._lpceq, solver._lpceqp),
+                                      (2, solver._lpceq, solver._lpceqp),
+                                      (0, solver._teceq, solver._teceqp),
+                                      (0, solver._tmceq, solver._tmceqp),
+                                      (1, solver._heceq, solver._heceqp),
+                                      (2, solver._heceq, solver._heceqp)):
+                    self.assertAlmostEqual(
+                        pfct(neff, wl, nu) / fct(neff, wl, nu), 1,
+                        delta=1e-9)
+        self.assertEqual(len(solver._contexts), 2)
+
+    def testNeffs(self):
+        wls = numpy.linspace(1.2e-6, 1.6e-6, 5)
+        for mode in (Mode('HE', 1, 1), Mode('TE', 0, 1), Mode('EH', 1, 1),
+                     Mode('LP', 1, 1)):
+            neffs = self.fiber.neffs(mode, wls)
+            self.assertEqual(neffs.shape, (5,))
+            for wl, neff in zip(wls, neffs):
+                self.fiber.ne_cache.clear()
+                self.assertAlmostEqual(self.fiber.neff(mode, wl), neff)
+
+    def testNeffsCache(self):
+        mode = Mode('HE', 1, 1)
+        wl = Wavelength(1.55e-6)
+        neff = self.fiber.neff(mode, wl)
+        neffs = self.fiber.neffs(mode, [1.55e-6, 1.3e-6])
+        self.assertEqual(neffs[0], neff)
+        self.assertIn(mode, self.fiber.ne_cache[Wavelength(1.3e-6)])
+
+    def testSolveAll(self):
+        wl = Wavelength(1.3e-6)
+        modes = self.fiber.solveAll(wl)
+        self.assertIn(Mode('HE', 1, 1), modes)
+        self.assertIn(Mode('EH', 1, 1), modes)
+        self.assertIn(Mode('TE', 0, 1), modes)
+        self.assertNotIn(Mode('HE', 1, 1), self.fiber.solveAll(
+            wl, (ModeFamily.EH,)))
+
+        # HE and EH modes of the same order are found from a single scan
+        scans = []
+        solveAll = self.fiber._neff.solveAll
+        self.fiber._neff.solveAll = lambda wl, fam, nu, delta: (
+            scans.append((fam, nu)) or solveAll(wl, fam, nu, delta))
+        self.assertEqual(self.fiber.solveAll(wl), modes)
+        del self.fiber._neff.solveAll
+        self.assertNotIn(ModeFamily.EH, [fam for fam, _ in scans])
+        self.assertEqual(len(scans), len(set(scans)))
+
+        self.fiber.ne_cache.clear()
+        for mode, neff in modes.items():
+            self.assertAlmostEqual(self.fiber.neff(mode, wl), neff)
+            nextmode = Mode(mode.family, mode.nu, mode.m + 1)
+            if nextmode not in modes:
+                self.assertTrue(isnan(self.fiber.neff(nextmode, wl)))
+
+
+if __name__ == "__main__":
+    unittest.main()
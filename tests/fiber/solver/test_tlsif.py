@@ -17,8 +17,10 @@
 
 import unittest
 
-from fibermodes import FiberFactory, Mode, Wavelength
+from fibermodes import FiberFactory, Mode, ModeFamily, Wavelength
+from itertools import zip_longest
 from math import sqrt
+import numpy
 
 
 class TestTLSIF(unittest.TestCase):
@@ -527,6 +529,58 @@ class TestTLSIF(unittest.TestCase):
         }
         self._testFiberCutoff(rho, n, cutoffs, 4)
 
+    def testCutoffMap(self):
+        for r_, n_ in zip_longest([4e-6, 6e-6], [1.47, 1.43, 1.44]):
+            self.f.addLayer(radius=r_, index=n_)
+        fiber = self.f[0]
+        cutoffs = fiber.cutoffMap(9.95)
+        self.assertEqual(len(cutoffs), 13)
+        self.assertAlmostEqual(cutoffs[Mode('TE', 0, 1)], 4.034844259728651)
+        self.assertAlmostEqual(cutoffs[Mode('HE', 1, 2)], 6.589429513136826)
+        self.assertAlmostEqual(cutoffs[Mode('EH', 3, 1)], 9.91993372343631)
+        self.assertAlmostEqual(cutoffs[Mode('TE', 0, 2)], 8.922361377477312)
+        self.assertNotIn(Mode('HE', 5, 1), cutoffs)
+
+        other = self.f[0]
+        for mode, co in cutoffs.items():
+            self.assertIn(mode, fiber.co_cache)
+            self.assertAlmostEqual(other.cutoff(mode), co, msg=str(mode))
+
+        cutoffs = fiber.cutoffMap(9.95, families=(ModeFamily.LP,))
+        self.assertAlmostEqual(cutoffs[Mode('LP', 4, 1)], 9.911798124561814)
+        self.assertAlmostEqual(cutoffs[Mode('LP', 1, 2)], 8.922361377477307)
+
+    def testCutoffMapDispersive(self):
+        """Map is not slower than solving modes one by one.
+
+        Below the wavelength table of the fiber, each conversion from
+        V0 to wavelength uses fixed point iterations, and dominates
+        the time needed to find cutoffs.
+
+        """
+        self.f.addLayer(radius=3e-6, material="SiO2GeO2", x=0.1)
+        self.f.addLayer(radius=6e-6, material="SiO2GeO2", x=0.02)
+        self.f.addLayer(material="Silica")
+        fibers = [self.f[0], self.f[0]]
+        fibers[1]._cutoff.cutoffMap = None  # Solve modes one by one
+        cutoffs, slow = [], []
+        for fiber in fibers:
+            vmin = fiber._wlTable()[0][0]
+            V0s = []
+
+            def toWl(V0, *args, toWl=fiber.toWl, V0s=V0s):
+                if numpy.ndim(V0) == 0 and V0 < vmin:
+                    V0s.append(V0)
+                return toWl(V0, *args)
+            fiber.toWl = toWl
+            cutoffs.append(fiber.cutoffMap(6))
+            slow.append(len(V0s))
+
+        self.assertEqual(cutoffs[0].keys(), cutoffs[1].keys())
+        for mode, co in cutoffs[0].items():
+            self.assertAlmostEqual(co, cutoffs[1][mode], msg=str(mode))
+        self.assertLessEqual(slow[0], slow[1])
+
     def testBuresEx334(self):
         self.f.addLayer(material="SiO2GeO2", radius=4.5e-6,
                         index=1.448918, wl=1550e-9)
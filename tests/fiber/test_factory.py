@@ -107,6 +107,26 @@ class TestFiberFactory(unittest.TestCase):
             self.assertEqual(fiber.outerRadius(0), f.layers[0].radius[i])
             self.assertEqual(f[i].outerRadius(0), f.layers[0].radius[i])
 
+    def testFiberSpace(self):
+        f = FiberFactory()
+        f.addLayer(radius=[1e-6, 2e-6, 3e-6], index=1.474)
+        f.addLayer(radius={'start': 4e-6, 'end': 8e-6, 'num': 1000},
+                   index={'start': 1.45, 'end': 1.46, 'num': 1000})
+        f.addLayer(index="return mp[1][0] - 0.005")
+        space = f.space()
+        self.assertEqual(len(space), 3 * 10**6)
+        self.assertEqual(space.indexes(1234567), [1, 0, 234, 567, 0, 0])
+
+        fiber = space[-1]
+        self.assertEqual(fiber.outerRadius(1), 8e-6)
+        self.assertAlmostEqual(fiber.layers[2]._mp[0], 1.455)
+
+        sub = space[10:2000000:100000]
+        self.assertEqual(len(sub), 20)
+        self.assertEqual([fb.outerRadius(1) for fb in sub],
+                         [space[i].outerRadius(1)
+                          for i in range(10, 2000000, 100000)])
+
     def testFactoryLayerSetMaterial(self):
         f = FiberFactory(os.path.join(__dir__, 'smf28.fiber'))
         f.layers[1].material = "Silica"
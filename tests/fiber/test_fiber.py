@@ -19,9 +19,10 @@
 import unittest
 import os.path
 
-from fibermodes import FiberFactory
+from fibermodes import FiberFactory, Mode, ModeFamily, Wavelength
 from fibermodes.fiber.material.material import OutOfRangeWarning
 from math import isinf
+import numpy
 import warnings
 
 __dir__, _ = os.path.split(__file__)
@@ -79,6 +80,117 @@ class TestFiber(unittest.TestCase):
             wl = fiber.toWl(2.4)
             self.assertGreater(wl, 10e-6)
 
+            # Fixed point iterations do not converge from 1.55 µm
+            fiber = FiberFactory(os.path.join(__dir__, 'rcfs.fiber'))[4]
+            for V0 in (4.035, 4.06211418):
+                self.assertAlmostEqual(fiber.V0(fiber.toWl(V0)), V0,
+                                       delta=1e-12)
+
+    def testToWlTable(self):
+        f = FiberFactory()
+        f.addLayer(radius=3e-6, material="SiO2GeO2", x=0.1)
+        f.addLayer(radius=5e-6, material="SiO2GeO2", x=0.02)
+        f.addLayer(material="Silica")
+        fiber = f[0]
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=OutOfRangeWarning)
+            for V0 in (2, 5, 8, 12, 20):
+                self.assertAlmostEqual(fiber.V0(fiber.toWl(V0)), V0,
+                                       delta=1e-12)
+        v0s, wls = fiber._wlTable()
+        self.assertEqual(len(v0s), fiber.WLTABLE)
+        self.assertEqual(wls[0], 1.8e-6)
+        self.assertEqual(wls[-1], 0.6e-6)
+
+        # Secant iterations stop at rounding level
+        for V0 in numpy.linspace(v0s[0], v0s[-1], 500):
+            wl = fiber._toWlTable(V0, (v0s, wls), 1e-15)
+            self.assertAlmostEqual(fiber.V0(wl), V0, delta=1e-12)
+
+        fiber = FiberFactory(os.path.join(__dir__, 'smf28.fiber'))[0]
+        self.assertIsNone(fiber._wlTable())
+
+    def testDispersion(self):
+        f = FiberFactory()
+        f.addLayer(radius=4e-6, material="SiO2GeO2", x=0.25)
+        f.addLayer(radius=10e-6, material="Silica")
+        f.addLayer(material="Air")
+        wl = Wavelength(1550e-9)
+        for ff in (f, FiberFactory(os.path.join(__dir__, 'smf28.fiber'))):
+            for mode in (Mode('HE', 1, 1), Mode('LP', 0, 1)):
+                fiber = ff[0]
+                fdfiber = ff[0]
+                fdfiber._dneff = lambda *args: None  # finite differences
+                self.assertIsNotNone(fiber._dneff(mode, wl))
+                self.assertAlmostEqual(fiber.ng(mode, wl),
+                                       fdfiber.ng(mode, wl), places=6)
+                D = fiber.D(mode, wl)
+                self.assertAlmostEqual(D / fdfiber.D(mode, wl), 1, places=4)
+                S = fiber.S(mode, wl)
+                self.assertAlmostEqual(S / fdfiber.S(mode, wl), 1, places=2)
+
+                dn = fiber._neff._neffDerivatives(wl, mode,
+                                                  fiber.neff(mode, wl),
+                                                  rho=3e-4)
+                self.assertAlmostEqual(dn[2] / fiber._dneff(mode, wl)[2], 1,
+                                       places=4)
+
+    def testSharedStencil(self):
+        f = FiberFactory(os.path.join(__dir__, 'smf28.fiber'))
+        fiber = f[0]
+        fiber._dneff = lambda *args: None  # finite differences
+        solver = fiber._neff
+        calls = []
+
+        def neff(*args):
+            calls.append(args)
+            return solver(*args)
+        fiber._neff = neff
+
+        mode = Mode('HE', 1, 1)
+        wl = Wavelength(1550e-9)
+        ng = fiber.ng(mode, wl)
+        fiber.vg(mode, wl)
+        fiber.D(mode, wl)
+        fiber.S(mode, wl)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(len(fiber.beta_cache), 1)
+        self.assertAlmostEqual(ng, f[0].ng(mode, wl), places=6)
+
+    def testGuidedModes(self):
+        f = FiberFactory()
+        f.addLayer(radius=8e-6, index=1.454)
+        f.addLayer(index=1.444)
+        wl = Wavelength(1000e-9)
+        fiber = f[0]
+        modes = fiber.guidedModes(wl)
+        lpmodes = fiber.guidedModes(wl, (ModeFamily.LP,))
+        self.assertEqual(fiber.ne_cache, {})
+        self.assertEqual(len(modes), 38)
+        self.assertIn(Mode('HE_odd', 4, 2), modes)
+        self.assertEqual(modes, f[0].findVmodes(wl))
+        self.assertEqual(lpmodes, f[0].findLPmodes(wl))
+        self.assertEqual(fiber.guidedModes(wl, numax=1, mmax=2),
+                         {Mode('HE', 1, 1), Mode('HE_odd', 1, 1),
+                          Mode('HE', 1, 2), Mode('HE_odd', 1, 2),
+                          Mode('EH', 1, 1), Mode('EH_odd', 1, 1),
+                          Mode('EH', 1, 2), Mode('EH_odd', 1, 2),
+                          Mode('TE', 0, 1), Mode('TE', 0, 2),
+                          Mode('TM', 0, 1), Mode('TM', 0, 2)})
+        self.assertEqual(fiber.guidedModes(wl, method="neff"), modes)
+        with self.assertRaises(ValueError):
+            fiber.guidedModes(wl, method="bad")
+
+        # Four-layer fibers: no cutoff solver
+        f = FiberFactory()
+        f.addLayer(radius=2e-6, index=1.444)
+        f.addLayer(radius=5e-6, index=1.4604)
+        f.addLayer(radius=7e-6, index=1.4474)
+        f.addLayer(index=1.4444)
+        fiber = f[0]
+        self.assertEqual(fiber.guidedModes(wl, (ModeFamily.LP,), numax=1),
+                         fiber.findLPmodes(wl, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fiber.fieldcache module"""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode, Wavelength, HE11
+import numpy
+
+
+class TestFieldCache(unittest.TestCase):
+
+    """Test suite for FieldCache class"""
+
+    def setUp(self):
+        f = FiberFactory()
+        f.addLayer(radius=4e-6, index=1.4489)
+        f.addLayer(radius=10e-6, index=1.4474)
+        f.addLayer(index=1.4444)
+        self.fiber = f[0]
+        self.wl = Wavelength(1550e-9)
+
+    def testInterpolation(self):
+        r = numpy.linspace(0, 30e-6, 301)
+        for mode in (HE11, Mode('TE', 0, 1), Mode('LP', 0, 1)):
+            E, H = self.fiber._rfield(mode, self.wl, r)
+            Ee, He = self.fiber._solveField(mode, self.wl, r)
+            self.assertTrue(numpy.allclose(E, Ee, atol=1e-9 * abs(Ee).max()))
+            self.assertTrue(numpy.allclose(H, He, atol=1e-9 * abs(He).max()))
+
+    def testHitsMisses(self):
+        cache = self.fiber.field_cache
+        self.fiber._rfield(HE11, self.wl, 1e-6)
+        self.fiber._rfield(HE11, self.wl, numpy.array([2e-6, 3e-6]))
+        self.assertEqual(cache.info(), (1, 1, cache.maxsize, 1))
+        self.assertTrue((HE11, self.wl) in cache)
+
+        # Outside tabulated range: profile is rebuilt
+        self.fiber._rfield(HE11, self.wl, 100e-6)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(len(cache), 1)
+
+    def testEviction(self):
+        cache = self.fiber.field_cache
+        cache.maxsize = 2
+        for wl in (1500e-9, 1550e-9, 1600e-9):
+            self.fiber._rfield(HE11, wl, 1e-6)
+        self.assertEqual(len(cache), 2)
+        self.assertFalse((HE11, 1500e-9) in cache)
+        self.assertTrue((HE11, 1600e-9) in cache)
+
+    def testInvalidate(self):
+        cache = self.fiber.field_cache
+        for wl in (1500e-9, 1550e-9):
+            self.fiber._rfield(HE11, wl, 1e-6)
+            self.fiber._rfield(Mode('LP', 0, 1), wl, 1e-6)
+        cache.invalidate(wl=1500e-9)
+        self.assertEqual(len(cache), 2)
+        cache.invalidate(mode=HE11)
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, cache.maxsize, 0))
+
+    def testNoCache(self):
+        cache = self.fiber.field_cache
+        cache.maxsize = 0
+        E, H = self.fiber._rfield(HE11, self.wl, 1e-6)
+        self.assertEqual(E.shape, (3,))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.fiber.solvercache module."""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode, Simulator, PSimulator
+from fibermodes.fiber.solvercache import SolverCache, fiberKey
+from fibermodes.simulator import AsyncSimulator
+from math import isnan
+import asyncio
+import os.path
+import shutil
+import tempfile
+
+
+class TestSolverCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = SolverCache(os.path.join(self.tmpdir, 'cache.sqlite'))
+        self.f = FiberFactory()
+        self.f.addLayer(radius=[4e-6, 5e-6], index=1.4489)
+        self.f.addLayer(radius=10e-6, index=1.4474)
+        self.f.addLayer(index=1.4444)
+        self.f.setSolverCache(self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _nosolve(self, fiber):
+        def fail(*args, **kwargs):
+            raise AssertionError("Solver should not be called")
+        fiber._neff = fiber._cutoff = fail
+        fiber._key = fiberKey(self.f[0])
+
+    def testKey(self):
+        self.assertEqual(fiberKey(self.f[0]), fiberKey(self.f[0]))
+        self.assertNotEqual(fiberKey(self.f[0]), fiberKey(self.f[1]))
+        self.f.layers[2].index = 1.4443
+        self.assertNotEqual(fiberKey(self.f[0]), fiberKey(self.f[1]))
+
+    def testPersistence(self):
+        modes = (Mode('HE', 1, 1), Mode('TE', 0, 1), Mode('LP', 0, 3))
+        fiber = self.f[0]
+        neffs = [fiber.neff(mode, 1.55e-6) for mode in modes]
+        ng = fiber.ng(modes[0], 1.55e-6)
+        co = fiber.cutoff(modes[1])
+        self.assertTrue(isnan(neffs[2]))
+
+        fiber = self.f[0]
+        self._nosolve(fiber)
+        for mode, neff in zip(modes, neffs):
+            if isnan(neff):
+                self.assertTrue(isnan(fiber.neff(mode, 1.55e-6)))
+            else:
+                self.assertEqual(fiber.neff(mode, 1.55e-6), neff)
+        self.assertEqual(fiber.ng(modes[0], 1.55e-6), ng)
+        self.assertEqual(fiber.cutoff(modes[1]), co)
+
+        fiber = self.f[0]
+        fiber.neff(modes[0], 1.55e-6, delta=1e-5)  # delta is part of key
+        self.cache.clear()
+        fiber = self.f[0]
+        self._nosolve(fiber)
+        with self.assertRaises(AssertionError):
+            fiber.neff(modes[0], 1.55e-6)
+
+    def testPSimulator(self):
+        sim = PSimulator(self.f, [1.5e-6, 1.55e-6, 1.6e-6], processes=2,
+                         vectorial=False, scalar=True)
+        neffs = list(sim.neff())
+        sim.terminate()
+
+        for fnum, fneffs in enumerate(neffs):
+            fiber = self.f[fnum]
+            for wl, modes in zip(sim.wavelengths, fneffs):
+                for mode, neff in modes.items():
+                    self.assertEqual(
+                        self.cache.neff(fiberKey(fiber), wl, mode, 1e-6),
+                        neff)
+
+    def testAsyncSimulator(self):
+        """Solves run on executor threads."""
+        sim = Simulator(self.f, [1.5e-6, 1.55e-6], vectorial=False,
+                        scalar=True)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            records = [record async for record in asim.stream(["neff"])]
+            neff = await asim.value("neff", 1, 1, Mode("LP", 1, 1))
+            return records, neff
+
+        records, neff = asyncio.run(run())
+        self.assertTrue(records)
+        records.append((1, 1, Mode("LP", 1, 1), "neff", neff))
+        for fnum, wlnum, mode, name, value in records:
+            self.assertEqual(
+                self.cache.neff(fiberKey(self.f[fnum]), sim.wavelengths[wlnum],
+                                mode, 1e-6),
+                value)
+
+
+if __name__ == "__main__":
+    unittest.main()
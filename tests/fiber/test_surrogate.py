@@ -0,0 +1,83 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.fiber.surrogate module."""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode
+from fibermodes.fiber.surrogate import NeffSurrogate
+from math import isnan
+import io
+import numpy
+
+
+class TestNeffSurrogate(unittest.TestCase):
+
+    def setUp(self):
+        self.f = FiberFactory()
+        self.f.addLayer(radius=4e-6, index=1.4489)
+        self.f.addLayer(radius=10e-6, index=1.4474)
+        self.f.addLayer(index=1.4444)
+
+    def testAccuracy(self):
+        fiber = self.f[0]
+        ref = self.f[0]
+        mode = Mode('HE', 1, 1)
+        surrogate = fiber.buildSurrogate(mode, 1.3e-6, 1.6e-6)
+        self.assertTrue(surrogate.contains(1.45e-6))
+        self.assertFalse(surrogate.contains(1.65e-6))
+
+        for wl in numpy.linspace(1.31e-6, 1.59e-6, 8):
+            self.assertAlmostEqual(fiber.neff(mode, wl), ref.neff(mode, wl),
+                                   places=9)
+            self.assertAlmostEqual(fiber.ng(mode, wl), ref.ng(mode, wl),
+                                   places=7)
+            self.assertAlmostEqual(fiber.D(mode, wl) / ref.D(mode, wl), 1,
+                                   places=4)
+
+    def testSerialization(self):
+        mode = Mode('TE', 0, 1)
+        surrogate = self.f[0].buildSurrogate(mode, 1.3e-6, 1.6e-6)
+        fp = io.StringIO()
+        surrogate.dump(fp)
+        fp.seek(0)
+
+        fiber = self.f[0]
+        fiber.addSurrogate(NeffSurrogate.load(fp))
+        self.assertEqual(fiber.neff(mode, 1.55e-6), surrogate(1.55e-6))
+        self.assertFalse(isnan(fiber.D(mode, 1.55e-6)))
+        self.assertEqual(fiber.ne_cache, {})
+
+    def testCutoff(self):
+        fiber = self.f[0]
+        ref = self.f[0]
+        mode = Mode('LP', 0, 2)  # cutoff is 1718 nm
+        surrogate = NeffSurrogate.build(fiber, mode, 1.65e-6, 1.75e-6,
+                                        maxdepth=3)
+        fiber.addSurrogate(surrogate)
+        self.assertTrue(isnan(surrogate(1.74e-6)))
+        self.assertFalse(all(surrogate.contains(wl)
+                             for wl in numpy.linspace(1.65e-6, 1.75e-6)))
+        for wl in numpy.linspace(1.65e-6, 1.75e-6, 11):
+            neff = ref.neff(mode, wl)
+            if isnan(neff):
+                self.assertTrue(isnan(fiber.neff(mode, wl)))
+            else:
+                self.assertAlmostEqual(fiber.neff(mode, wl), neff)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.fiber.tracker module."""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode
+from fibermodes.fiber.tracker import NeffTracker
+from math import isnan
+import numpy
+
+
+class TestNeffTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.f = FiberFactory()
+        self.f.addLayer(radius=4e-6, index=1.4489)
+        self.f.addLayer(radius=10e-6, index=1.4474)
+        self.f.addLayer(index=1.4444)
+        self.wls = numpy.linspace(1.3e-6, 1.6e-6, 16)
+
+    def testTracking(self):
+        fiber = self.f[0]
+        ref = self.f[0]
+        for mode in (Mode('LP', 0, 1), Mode('HE', 1, 1), Mode('TE', 0, 1)):
+            tracker = NeffTracker(fiber, mode)
+            for wl in self.wls:
+                self.assertAlmostEqual(tracker(wl), ref.neff(mode, wl))
+            self.assertGreater(tracker.tracked, len(self.wls) // 2)
+
+    def testPredict(self):
+        fiber = self.f[0]
+        mode = Mode('HE', 1, 1)
+        tracker = NeffTracker(fiber, mode)
+        self.assertTrue(isnan(tracker.predict(self.wls[0])))
+        for wl in self.wls[:3]:
+            tracker.add(wl, fiber.neff(mode, wl))
+        self.assertAlmostEqual(tracker.predict(self.wls[3]),
+                               fiber.neff(mode, self.wls[3]), places=6)
+
+    def testCutoff(self):
+        fiber = self.f[0]
+        ref = self.f[0]
+        mode = Mode('LP', 0, 2)
+        tracker = NeffTracker(fiber, mode)
+        wls = numpy.linspace(1.5e-6, 1.8e-6, 16)  # cutoff is 1718 nm
+        neffs = [tracker(wl) for wl in wls]
+        self.assertFalse(isnan(neffs[0]))
+        self.assertTrue(isnan(neffs[-1]))
+        for wl, neff in zip(wls, neffs):
+            if not isnan(neff):
+                self.assertAlmostEqual(neff, ref.neff(mode, wl))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 """Test suite for fibermodes.simulator.psimulator module"""
 
 import unittest
-from fibermodes.simulator import PSimulator
-from tests.simulator.simulator import TestSimulator
+import os.path
+from fibermodes import FiberFactory
+from fibermodes.simulator import PSimulator, Simulator
+from tests.simulator.test_simulator import TestSimulator
+
+__dir__, _ = os.path.split(__file__)
 
 
 class TestPSimulator(TestSimulator):
@@ -13,6 +17,59 @@ class TestPSimulator(TestSimulator):
     def Simulator(self):
         return PSimulator
 
+    def testPersistentWorkers(self):
+        sim = PSimulator(os.path.join(__dir__, '..', 'fiber', 'smf28.fiber'),
+                         [1540e-9, 1550e-9, 1560e-9], processes=2)
+        neff = list(sim.neff())
+        pids = [p.pid for p, _ in sim._workers]
+        self.assertEqual(len(pids), 2)
+        self.assertEqual(len(sim._chunks()), 2)
+        ng = list(sim.ng())
+        self.assertEqual(pids, [p.pid for p, _ in sim._workers])
+
+        ref = Simulator(os.path.join(__dir__, '..', 'fiber', 'smf28.fiber'),
+                        [1540e-9, 1550e-9, 1560e-9])
+        for r1, r2 in zip(neff + ng, list(ref.neff()) + list(ref.ng())):
+            for v1, v2 in zip(r1, r2):
+                self.assertEqual(v1.keys(), v2.keys())
+                for mode in v1:
+                    self.assertAlmostEqual(v1[mode], v2[mode])
+
+        sim.set_wavelengths(1550e-9)
+        self.assertEqual(sim._workers, [])
+        self.assertEqual(len(list(sim.neff())[0]), 1)
+        sim.terminate()
+
+    def testAbandonedRun(self):
+        f = FiberFactory()
+        f.addLayer(radius=[4e-6, 5e-6, 6e-6], index=1.449)
+        f.addLayer(index=1.444)
+        sim = PSimulator(f, [1540e-9, 1550e-9], processes=1)
+        ref = list(Simulator(f, [1540e-9, 1550e-9]).neff())
+
+        g = sim.neff()
+        next(g)
+        self.assertEqual(sim._cancelled.value, -1)
+        g.close()
+        self.assertEqual(sim._cancelled.value, 0)  # First run
+        self.assertEqual(len(sim._workers), 1)
+        for r1, r2 in zip(sim.neff(), ref):
+            for v1, v2 in zip(r1, r2):
+                self.assertEqual(v1.keys(), v2.keys())
+        sim.terminate()
+
+    def testDeadWorker(self):
+        sim = PSimulator(os.path.join(__dir__, '..', 'fiber', 'smf28.fiber'),
+                         [1540e-9, 1550e-9, 1560e-9], processes=1)
+        list(sim.neff())
+        sim._workers[0][0].terminate()
+        sim._workers[0][0].join()
+        with self.assertRaises(RuntimeError):
+            list(sim.neff())
+        self.assertEqual(sim._workers, [])
+        self.assertEqual(len(list(sim.neff())[0]), 3)
+        sim.terminate()
+
     # def assertEqual(self, first, second, msg=None):
     #     try:
     #         first = first.get()
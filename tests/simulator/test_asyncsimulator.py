@@ -0,0 +1,159 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.simulator.asyncsimulator module"""
+
+import unittest
+
+from fibermodes import FiberFactory, HE11
+from fibermodes.simulator import Simulator, PSimulator, AsyncSimulator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+
+
+class TestAsyncSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.f = FiberFactory()
+        self.f.addLayer(radius=[4e-6, 4.5e-6], index=1.4489)
+        self.f.addLayer(index=1.4444)
+        self.wls = [1540e-9, 1550e-9, 1560e-9]
+
+    def testStream(self):
+        sim = Simulator(self.f, self.wls, delta=1e-4)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            return [record async for record in asim.stream(["neff", "ng"])]
+
+        records = asyncio.run(run())
+        values = list(Simulator(self.f, self.wls, delta=1e-4).compute(
+            ["neff", "ng"]))
+        self.assertEqual(len(records),
+                         sum(len(modes) for fvalues in values
+                             for modes in fvalues) * 2)
+        for fnum, wlnum, mode, name, value in records:
+            self.assertAlmostEqual(values[fnum][wlnum][mode][name], value)
+
+    def testStreamBreak(self):
+        sim = Simulator(self.f, self.wls, delta=1e-4)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            records = asim.stream(["neff"])
+            async for record in records:
+                if record[:2] == (0, 0):  # Fibers run concurrently
+                    break
+            await records.aclose()
+            return record, await asim.value("neff", 0, 2, HE11)
+
+        record, neff = asyncio.run(run())
+        self.assertEqual(record[:2], (0, 0))
+        self.assertAlmostEqual(neff, sim.fibers[0].neff(HE11, self.wls[2]))
+
+    def testStreamLazy(self):
+        """Fibers are built only when they are streamed."""
+        f = FiberFactory()
+        f.addLayer(radius=[4e-6 + i * 1e-9 for i in range(1000)],
+                   index=1.4489)
+        f.addLayer(index=1.4444)
+        sim = Simulator(f, self.wls, delta=1e-4)
+        asim = AsyncSimulator(sim, maxqueue=4)
+
+        async def run():
+            records = asim.stream(["neff"])
+            async for record in records:
+                break
+            await records.aclose()
+
+        asyncio.run(run())
+        self.assertLessEqual(len(sim._fsims._items), 4)
+
+    def testStreamTimeout(self):
+        sim = Simulator(self.f, self.wls, delta=1e-4)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            async for record in asim.stream(["neff"], timeout=0):
+                pass
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run())
+
+    def testValue(self):
+        sim = Simulator(self.f, self.wls, delta=1e-4)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            tasks = [asyncio.ensure_future(asim.value("ng", 1, 1, HE11))
+                     for _ in range(3)]
+            await asyncio.sleep(0)
+            pending = len(asim._pending)
+            values = await asyncio.gather(*tasks)
+            return pending, values, len(asim._pending)
+
+        pending, values, after = asyncio.run(run())
+        self.assertEqual(pending, 1)
+        self.assertEqual(after, 0)
+        self.assertEqual(values[0], values[1])
+        self.assertEqual(values[0], values[2])
+        self.assertAlmostEqual(values[0],
+                               sim.fibers[1].ng(HE11, self.wls[1]))
+
+    def testValueTimeout(self):
+        sim = Simulator(self.f, self.wls, delta=1e-4)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            other = asyncio.ensure_future(asim.value("neff", 0, 0, HE11))
+            with self.assertRaises(asyncio.TimeoutError):
+                await asim.value("neff", 0, 0, HE11, timeout=0)
+            return await other
+
+        neff = asyncio.run(run())
+        self.assertAlmostEqual(neff, sim.fibers[0].neff(HE11, self.wls[0]))
+
+    def testExecutor(self):
+        sim = Simulator(self.f, self.wls, delta=1e-4)
+        with ThreadPoolExecutor(2) as executor:
+            asim = AsyncSimulator(sim, executor)
+            neff = asyncio.run(asim.value("neff", 0, 0, HE11))
+        self.assertAlmostEqual(neff, sim.fibers[0].neff(HE11, self.wls[0]))
+
+        with ProcessPoolExecutor(1) as executor:
+            with self.assertRaises(TypeError):
+                AsyncSimulator(sim, executor)
+
+    def testPSimulator(self):
+        sim = PSimulator(self.f, self.wls, delta=1e-4, processes=2)
+        asim = AsyncSimulator(sim)
+
+        async def run():
+            return [record async for record in asim.stream(["neff"])]
+
+        try:
+            records = asyncio.run(run())
+        finally:
+            sim.terminate()
+        values = list(Simulator(self.f, self.wls, delta=1e-4).neff())
+        self.assertEqual(len(records),
+                         sum(len(modes) for fvalues in values
+                             for modes in fvalues))
+        for fnum, wlnum, mode, name, value in records:
+            self.assertAlmostEqual(values[fnum][wlnum][mode], value)
+
+
+if __name__ == "__main__":
+    unittest.main()
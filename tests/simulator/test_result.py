@@ -0,0 +1,68 @@
+# This file is part of FiberModes.
+#
+# FiberModes is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FiberModes is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with FiberModes.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test suite for fibermodes.simulator.result module"""
+
+import unittest
+
+from fibermodes import FiberFactory, Mode, HE11
+from fibermodes.simulator import Simulator, SimulationResult
+from math import isnan
+import numpy
+
+
+class TestSimulationResult(unittest.TestCase):
+
+    def testAdd(self):
+        TE01 = Mode('TE', 0, 1)
+        result = SimulationResult(["neff", "ng"], 2, [1.5e-6, 1.6e-6])
+        result.add(1, [{HE11: {"neff": 1.45, "ng": 1.47},
+                        TE01: {"neff": 1.44, "ng": 1.46}},
+                       {HE11: {"neff": 1.449, "ng": 1.471}}])
+        for i in range(5):
+            result.set(0, 0, Mode('HE', i+2, 1), "neff", i)
+
+        self.assertEqual(result["neff"].shape, (2, 2, 7))
+        self.assertEqual(result.modes[:2], [HE11, TE01])
+        self.assertEqual(result.get("ng", HE11)[1, 1], 1.471)
+        self.assertEqual(result["neff"][0, 0, result.index[Mode('HE', 6, 1)]],
+                         4)
+        self.assertTrue(isnan(result.get("neff", TE01)[1, 1]))
+        self.assertTrue(numpy.isnan(result["ng"][0]).all())
+
+        view = result.get("neff", HE11)
+        result.set(0, 1, HE11, "neff", 1.3)
+        self.assertEqual(view[0, 1], 1.3)
+
+    def testSimulator(self):
+        f = FiberFactory()
+        f.addLayer(radius=[4e-6, 5e-6], index=1.4489)
+        f.addLayer(index=1.4444)
+        sim = Simulator(f, [1.3e-6, 1.5e-6], delta=1e-4)
+        result = sim.result(["neff", "D"])
+        values = list(sim.compute(["neff", "D"]))
+        self.assertEqual(result["neff"].shape[:2], (2, 2))
+        for fnum, fvalues in enumerate(values):
+            for wlnum, modes in enumerate(fvalues):
+                for k, mode in enumerate(result.modes):
+                    v = result["D"][fnum, wlnum, k]
+                    if mode in modes:
+                        self.assertEqual(v, modes[mode]["D"])
+                    else:
+                        self.assertTrue(isnan(v))
+
+
+if __name__ == "__main__":
+    unittest.main()
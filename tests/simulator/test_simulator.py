@@ -19,7 +19,7 @@ import unittest
 import os.path
 
 from fibermodes import FiberFactory, Mode, ModeFamily, HE11
-from fibermodes.simulator import Simulator
+from fibermodes.simulator import Simulator, CancelToken
 
 __dir__, _ = os.path.split(__file__)
 
@@ -107,12 +107,16 @@ class TestSimulator(unittest.TestCase):
 
     def testCutoff(self):
         sim = self.Simulator(
-            os.path.join(__dir__, '..', 'fiber', 'rcfs.fiber'), 1550e-9)
+            os.path.join(__dir__, '..', 'fiber', 'rcfs.fiber'),
+            [1540e-9, 1550e-9])
         co = list(sim.cutoff())
         self.assertEqual(len(co), 5)
         for fco in co:
-            self.assertEqual(len(fco), 1)
+            self.assertEqual(len(fco), 2)
             self.assertEqual(fco[0][Mode('HE', 1, 1)], 0)
+            self.assertEqual(fco[1][Mode('HE', 1, 1)], 0)
+        for fiber in sim.fibers:
+            self.assertEqual(fiber.ne_cache, {})  # No neff solved
 
     def testNeff(self):
         sim = self.Simulator(
@@ -122,5 +126,49 @@ class TestSimulator(unittest.TestCase):
         self.assertEqual(len(neff), 1)
         self.assertAlmostEqual(neff[0][0][Mode('HE', 1, 1)], 1.446386514937099)
 
+    def testCompute(self):
+        sim = self.Simulator(
+            os.path.join(__dir__, '..', 'fiber', 'smf28.fiber'),
+            [1540e-9, 1560e-9], delta=1e-4)
+        names = ["neff", "ng", "D", "beta2", "cutoffWl"]
+        result = list(sim.compute(names))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0]), 2)
+        for name in names:
+            for r1, r2 in zip(result[0], next(getattr(sim, name)())):
+                self.assertEqual(r1.keys(), r2.keys())
+                for mode, value in r2.items():
+                    self.assertAlmostEqual(r1[mode][name], value)
+
+    def testStream(self):
+        sim = self.Simulator(
+            os.path.join(__dir__, '..', 'fiber', 'smf28.fiber'),
+            [1540e-9, 1550e-9, 1560e-9], delta=1e-4)
+        names = ["neff", "ng"]
+        progress = []
+        records = list(sim.stream(names, progress=progress.append))
+        values = list(sim.compute(names))
+        self.assertEqual(len(records),
+                         sum(len(modes) for modes in values[0]) * 2)
+        for fnum, wlnum, mode, name, value in records:
+            self.assertAlmostEqual(values[fnum][wlnum][mode][name], value)
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(progress[-1].done, progress[-1].total)
+        self.assertEqual(progress[-1].values, len(records))
+        self.assertEqual(progress[-1].eta, 0)
+
+    def testStreamCancel(self):
+        sim = self.Simulator(
+            os.path.join(__dir__, '..', 'fiber', 'smf28.fiber'),
+            [1540e-9, 1550e-9, 1560e-9], delta=1e-4)
+        cancel = CancelToken()
+        records = []
+        for record in sim.stream(["neff"], cancel=cancel):
+            records.append(record)
+            cancel.cancel()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(len(list(sim.neff())[0]), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -119,6 +119,27 @@ class TestField(unittest.TestCase):
         hmod = self.field.Hmod()
         self.assertTrue(numpy.all(hmod > 0))
 
+    def testRadialFieldArray(self):
+        fiber = self.field.fiber
+        wl = self.field.wl
+        r = numpy.linspace(0, 10e-6, 11)
+        E, H = fiber._rfield(HE11, wl, r)
+        self.assertEqual(E.shape, (3, 11))
+        self.assertEqual(H.shape, (3, 11))
+        for i, r_ in enumerate(r):
+            e, h = fiber._rfield(HE11, wl, r_)
+            self.assertTrue(numpy.allclose(E[:, i], e))
+            self.assertTrue(numpy.allclose(H[:, i], h))
+
+    def testRadialFieldCache(self):
+        ex0 = self.field.Ex(0)
+        table = self.field._fields
+        self.assertEqual(table.shape, (6, self.field._r.size))
+        ex1 = self.field.Ex(1)
+        self.field.Hmod()
+        self.assertIs(self.field._fields, table)
+        self.assertFalse(numpy.allclose(ex0, ex1))
+
     def testAeff(self):
         # TODO: add test
         aeff = self.field.Aeff()
@@ -19,6 +19,7 @@
 import unittest
 
 from fibermodes import functions
+from scipy.special import jn_zeros
 
 
 class TestFunctions(unittest.TestCase):
@@ -62,5 +63,18 @@ class TestFunctions(unittest.TestCase):
                             msg="x={}, k={}, m={}, j={}".format(x, k, m, j))
                     # print(k, m, j, minerr, maxerr)
 
+    def testBesselZeros(self):
+        for nu in (0, 1, 4):
+            zeros = functions.besselZeros(nu, 3)
+            self.assertEqual(zeros.tolist(), jn_zeros(nu, 3).tolist())
+            zeros = functions.besselZeros(nu, 100)
+            self.assertEqual(zeros.tolist(), jn_zeros(nu, 100).tolist())
+            self.assertIs(functions.besselZeros(nu, 7).base,
+                          functions.besselZeros(nu, 70).base)
+        self.assertEqual(functions.besselZeros(-3, 5).tolist(),
+                         functions.besselZeros(3, 5).tolist())
+        with self.assertRaises(ValueError):
+            functions.besselZeros(0, 2)[0] = 0
+
 if __name__ == "__main__":
     unittest.main()
@@ -18,6 +18,7 @@
 import unittest
 
 from fibermodes.slrc import SLRC
+import numpy
 
 
 class TestSLRC(unittest.TestCase):
@@ -99,6 +100,63 @@ class TestSLRC(unittest.TestCase):
         x = SLRC(testCode)
         self.assertAlmostEqual(x(), 3.141592653589793)
 
+    def testCodeCache(self):
+        x = SLRC("return 2 * r")
+        x.codeParams = ["r"]
+        y = SLRC("return 2 * r")
+        y.codeParams = ["r"]
+        self.assertIs(x.value, y.value)
+        y.codeParams = ["r", "fp"]
+        self.assertIsNot(x.value, y.value)
+        self.assertEqual(y(3, None), 6)
+
+    def testArray(self):
+        x = SLRC({'start': 1, 'end': 2, 'num': 7})
+        self.assertEqual(x.array().tolist(), x.value)
+        self.assertEqual(SLRC([3, 1, 2]).array().tolist(), [1, 2, 3])
+        self.assertEqual(SLRC(5).array().tolist(), [5])
+
+        x = SLRC("return math.sqrt(args[0]) + 1")
+        r = x.array(numpy.array([1., 4., 9.]))
+        self.assertEqual(r.tolist(), [2, 3, 4])
+        self.assertEqual(x(4), 3)
+
+    def testArrayFallback(self):
+        """Code not working on arrays is evaluated element-wise"""
+        r = numpy.array([1., 2., 3.])
+        x = SLRC("return math.factorial(int(r))")
+        x.codeParams = ["r"]
+        self.assertEqual(x.array(r).tolist(), [1, 2, 6])
+
+        x = SLRC("return math.erf(r)")
+        x.codeParams = ["r"]
+        self.assertEqual(x.array(r).tolist(), [x(v) for v in r])
+
+        x = SLRC("return r if r > 1 else 1")
+        x.codeParams = ["r"]
+        self.assertEqual(x.array(r - 1).tolist(), [1, 1, 2])
+
+        x = SLRC("return max(r, 2)")
+        x.codeParams = ["r"]
+        self.assertEqual(x.array(r).tolist(), [2, 2, 3])
+
+        x = SLRC("return 2")
+        x.codeParams = ["r"]
+        self.assertEqual(x.array(r).tolist(), [2, 2, 2])
+
+        x = SLRC("return r * fp")
+        x.codeParams = ["r", "fp"]
+        self.assertEqual(x.array(r, fp=numpy.array([[1.], [2.]])).tolist(),
+                         [[1, 2, 3], [2, 4, 6]])
+
+    def testArrayMath(self):
+        """Only math names are available in vectorized code"""
+        x = SLRC("return math.load")
+        with self.assertRaises(AttributeError):
+            x.array()
+        x = SLRC("return math.remainder(5, 3)")
+        self.assertEqual(x.array().tolist(), -1)
+
     def testBadCode(self):
         """Test execution of not allowed code"""
         testCode = "import os"